@@ -3,6 +3,8 @@ from typing import Tuple
 
 from fastapi import Request
 
+from lifecycle.auth.token_cache import auth_token_cache
+from lifecycle.auth.token_usage import token_usage_buffer
 from lifecycle.database.schema import tables
 from lifecycle.server.cache import LifecycleCache
 from racetrack_client.log.errors import EntityNotFound
@@ -25,7 +27,7 @@ def authenticate_token(request: Request) -> Tuple[AuthTokenPayload, tables.AuthS
         return token_payload, None
 
     try:
-        auth_subject, auth_token = find_auth_subject_by_token(jwt_token)
+        auth_subject, auth_token = auth_token_cache.get(jwt_token, find_auth_subject_by_token)
     except EntityNotFound:
         raise UnauthorizedError('wrong credentials: token is unknown', 'token was not found in the database')
 
@@ -62,13 +64,8 @@ def find_auth_subject_by_token(token: str) -> tuple[tables.AuthSubject, tables.A
 
 
 def _save_token_use(auth_token: tables.AuthToken):
-    """
-    Update date of the last use of the auth token.
-    Keep it in daily granulatiry to avoid too many updates in the database.
-    """
-    if auth_token.last_use_time is None or auth_token.last_use_time.date() != now().date():
-        auth_token.last_use_time = now()
-        LifecycleCache.record_mapper().update(auth_token)
+    """Update date of the last use of the auth token in the background"""
+    token_usage_buffer.record(auth_token)
 
 
 def get_username_from_token(request: Request) -> str:
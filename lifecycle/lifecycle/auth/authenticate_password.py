@@ -3,6 +3,7 @@ from lifecycle.server.cache import LifecycleCache
 from racetrack_client.log.errors import EntityNotFound
 from typing import Optional
 from lifecycle.auth.hasher import get_hasher, make_password
+from lifecycle.auth.login_limiter import login_rate_limiter
 
 UNUSABLE_PASSWORD_SUFFIX_LENGTH = 40
 UNUSABLE_PASSWORD_PREFIX = "!"
@@ -11,10 +12,13 @@ def authenticate(username: str, password: str) -> Optional[User]:
     """
     If the given credentials are valid, return a User object.
     """
+    login_rate_limiter.check_attempt(username)
     try:
         user = authenticate_user(username, password)
     except PermissionDenied:
-        return None
+        user = None
+    if user is None:
+        login_rate_limiter.record_failure(username)
 
     return user
 
@@ -28,6 +32,10 @@ def authenticate_user(username: str, password: str) -> Optional[User]:
             make_password(password)
         else:
             if check_password(password, user.password) and user.is_active:
+                if get_hasher().must_update(user.password):
+                    # upgrade the password hashed with outdated parameters, now that it's known
+                    user.password = make_password(password)
+                    LifecycleCache.record_mapper().update(user)
                 return user
 
 
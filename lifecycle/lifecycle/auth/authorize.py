@@ -1,5 +1,4 @@
-from collections import defaultdict
-
+from lifecycle.auth.permission_index import PermittedResources, permission_index_cache
 from lifecycle.auth.subject import get_description_from_auth_subject
 from lifecycle.database.condition_builder import QueryCondition
 from lifecycle.database.schema import tables
@@ -106,6 +105,20 @@ def has_endpoint_permission(
     endpoint: str,
     scope: str,
 ) -> bool:
+    index = permission_index_cache.get_index()
+    if index is not None:
+        return index.has_endpoint_permission(auth_subject.id, job_name, job_version, endpoint, scope)
+    return query_endpoint_permission(auth_subject, job_name, job_version, endpoint, scope)
+
+
+def query_endpoint_permission(
+    auth_subject: tables.AuthSubject,
+    job_name: str,
+    job_version: str,
+    endpoint: str,
+    scope: str,
+) -> bool:
+    """Check endpoint permission in the database"""
     mapper = LifecycleCache.record_mapper()
     placeholder: str = mapper.placeholder
     table_permission = table_metadata(tables.AuthResourcePermission).table_name
@@ -120,7 +133,10 @@ def has_endpoint_permission(
         QueryCondition(f'{table_permission}.job_family_id is null'),
     )
     job_version_filter = QueryCondition.operator_or(
-        QueryCondition(f'{table_job}.version = {placeholder}', job_version),
+        QueryCondition.operator_and(
+            QueryCondition(f'{table_job}.name = {placeholder}', job_name),
+            QueryCondition(f'{table_job}.version = {placeholder}', job_version),
+        ),
         QueryCondition(f'{table_permission}.job_id is null'),
     )
     endpoint_filter = QueryCondition.operator_or(
@@ -152,6 +168,19 @@ def has_resource_permission(
     job_version: str,
     scope: str,
 ) -> bool:
+    index = permission_index_cache.get_index()
+    if index is not None:
+        return index.has_resource_permission(auth_subject.id, job_name, job_version, scope)
+    return query_resource_permission(auth_subject, job_name, job_version, scope)
+
+
+def query_resource_permission(
+    auth_subject: tables.AuthSubject,
+    job_name: str,
+    job_version: str,
+    scope: str,
+) -> bool:
+    """Check resource permission in the database"""
     mapper = LifecycleCache.record_mapper()
     placeholder: str = mapper.placeholder
     table_permission = table_metadata(tables.AuthResourcePermission).table_name
@@ -166,7 +195,10 @@ def has_resource_permission(
         QueryCondition(f'{table_permission}.job_family_id is null'),
     )
     job_version_filter = QueryCondition.operator_or(
-        QueryCondition(f'{table_job}.version = {placeholder}', job_version),
+        QueryCondition.operator_and(
+            QueryCondition(f'{table_job}.name = {placeholder}', job_name),
+            QueryCondition(f'{table_job}.version = {placeholder}', job_version),
+        ),
         QueryCondition(f'{table_permission}.job_id is null'),
     )
     scope_filter = QueryCondition.operator_or(
@@ -191,6 +223,17 @@ def has_scope_permission(
     auth_subject: tables.AuthSubject,
     scope: str,
 ) -> bool:
+    index = permission_index_cache.get_index()
+    if index is not None:
+        return index.has_scope_permission(auth_subject.id, scope)
+    return query_scope_permission(auth_subject, scope)
+
+
+def query_scope_permission(
+    auth_subject: tables.AuthSubject,
+    scope: str,
+) -> bool:
+    """Check scope permission in the database"""
     mapper = LifecycleCache.record_mapper()
     placeholder: str = mapper.placeholder
     table_permission = table_metadata(tables.AuthResourcePermission).table_name
@@ -210,20 +253,18 @@ def has_scope_permission(
     )
 
 
-def list_permitted_jobs(
+def list_permitted_resources(
     auth_subject: tables.AuthSubject,
     scope: str,
-    all_jobs: list[JobDto],
-) -> list[JobDto]:
+) -> PermittedResources:
     """
-    List jobs that auth subject has permissions to access.
-    Expand permissions for all resources and whole job families,
-    map them to list of individual jobs from a database.
-    :param auth_subject: Auth subject model (either User, ESC or Job family)
-    :param scope: name of allowed operation type (see AuthScope)
-    :param all_jobs: list of Jobs to check against permission rules
-    :return: List of jobs that auth subject has permissions to access (with no duplicates)
+    Find all resources (jobs, job families) that auth subject has permissions to access within the scope at once,
+    instead of checking them one by one
     """
+    index = permission_index_cache.get_index()
+    if index is not None:
+        return index.permitted_resources(auth_subject.id, scope)
+
     mapper = LifecycleCache.record_mapper()
     placeholder: str = mapper.placeholder
     subject_filter = QueryCondition(f'auth_subject_id = {placeholder}', auth_subject.id)
@@ -235,25 +276,42 @@ def list_permitted_jobs(
         subject_filter,
         scope_filter,
     )
-    permissions = mapper.filter(tables.AuthResourcePermission, condition=filter_condition)
+    permissions = mapper.filter(tables.AuthResourcePermission, condition=filter_condition, read_only=True)
 
-    id_to_job: dict[str, JobDto] = {job.id or '': job for job in all_jobs}
-    family_to_job_ids = defaultdict(list)
-    for job in all_jobs:
-        family_to_job_ids[job.name].append(job.id)
-
-    job_ids = set()
-    for permission in permissions: 
+    resources = PermittedResources()
+    for permission in permissions:
         if permission.job_family_id is None and permission.job_id is None:
-            return all_jobs
-
+            resources.all_jobs = True
         if permission.job_id is not None:
-            job_ids.add(permission.job_id)
-
+            resources.job_ids.add(permission.job_id)
         if permission.job_family_id is not None:
-            job_ids.update(family_to_job_ids[permission.job_family_id])
+            resources.family_ids.add(permission.job_family_id)
+    if resources.family_ids and not resources.all_jobs:
+        placeholders = ', '.join([placeholder] * len(resources.family_ids))
+        family_condition = QueryCondition(f'id in ({placeholders})', *resources.family_ids)
+        families = mapper.filter(tables.JobFamily, condition=family_condition, read_only=True)
+        resources.family_names = {family.name for family in families}
+    return resources
+
 
-    jobs: list[JobDto] = [id_to_job[fid] for fid in job_ids]
+def list_permitted_jobs(
+    auth_subject: tables.AuthSubject,
+    scope: str,
+    all_jobs: list[JobDto],
+) -> list[JobDto]:
+    """
+    List jobs that auth subject has permissions to access.
+    Expand permissions for all resources and whole job families,
+    map them to list of individual jobs.
+    :param auth_subject: Auth subject model (either User, ESC or Job family)
+    :param scope: name of allowed operation type (see AuthScope)
+    :param all_jobs: list of Jobs to check against permission rules
+    :return: List of jobs that auth subject has permissions to access (with no duplicates)
+    """
+    resources = list_permitted_resources(auth_subject, scope)
+    if resources.all_jobs:
+        return all_jobs
+    jobs: list[JobDto] = [job for job in all_jobs if resources.permits_job(job)]
     return sorted(jobs, key=lambda job: (job.name, job.version))
 
 
@@ -269,29 +327,10 @@ def list_permitted_families(
     :param all_families: list of Job families to check against permission rules
     :return: List of job families that auth subject has permissions to access (without duplicates)
     """
-    mapper = LifecycleCache.record_mapper()
-    placeholder: str = mapper.placeholder
-    subject_filter = QueryCondition(f'auth_subject_id = {placeholder}', auth_subject.id)
-    scope_filter = QueryCondition.operator_or(
-        QueryCondition(f'scope = {placeholder}', scope),
-        QueryCondition(f'scope = {placeholder}', AuthScope.FULL_ACCESS.value),
-    )
-    filter_condition = QueryCondition.operator_and(
-        subject_filter,
-        scope_filter,
-    )
-    permissions = mapper.filter(tables.AuthResourcePermission, condition=filter_condition)
-
-    id_to_family: dict[str, JobFamilyDto] = {f.id or '': f for f in all_families}
-    family_ids = set()
-    for permission in permissions:
-        if permission.job_family_id is None and permission.job_id is None:
-            return all_families
-
-        if permission.job_family_id is not None:
-            family_ids.add(permission.job_family_id)
-
-    families: list[JobFamilyDto] = [id_to_family[id] for id in family_ids]
+    resources = list_permitted_resources(auth_subject, scope)
+    if resources.all_jobs:
+        return all_families
+    families: list[JobFamilyDto] = [family for family in all_families if resources.permits_family(family)]
     return sorted(families, key=lambda family: family.name)
 
 
@@ -308,48 +347,58 @@ def grant_permission(
     :param job_version: Exact job version or an alias ("latest" or wildcard)
     :param scope: name of allowed operation type (see AuthScope)
     """
-    if permission_exists(auth_subject, job_name, job_version, scope):
-        subject_info = get_description_from_auth_subject(auth_subject)
-        logger.warning(f'Permission for {subject_info} to {job_name} {job_version} (scope {scope}) is already granted')
+    grant_permissions(auth_subject, job_name, job_version, [scope])
+
+
+def grant_permissions(
+    auth_subject: tables.AuthSubject,
+    job_name: str | None,
+    job_version: str | None,
+    scopes: list[str],
+):
+    """
+    Grant permissions to access the resource (job, job family) within multiple scopes at once
+    :param auth_subject: Auth subject model (either User, ESC or Job family) to give access to
+    :param job_name: Name of the job family
+    :param job_version: Exact job version or an alias ("latest" or wildcard)
+    :param scopes: names of allowed operation types (see AuthScope)
+    """
+    subject_info = get_description_from_auth_subject(auth_subject)
+    new_scopes: list[str] = []
+    for scope in scopes:
+        if permission_exists(auth_subject, job_name, job_version, scope):
+            logger.warning(f'Permission for {subject_info} to {job_name} {job_version} (scope {scope}) is already granted')
+        else:
+            new_scopes.append(scope)
+    if not new_scopes:
         return
 
     mapper = LifecycleCache.record_mapper()
+    job_family_id: str | None = None
+    job_id: str | None = None
     if job_name and job_version:
-        job_model = mapper.find_one(tables.Job, name=job_name, version=job_version)
-        permission = tables.AuthResourcePermission(
-            id=None,
-            auth_subject_id=auth_subject.id,
-            scope=scope,
-            job_family_id=None,
-            job_id=job_model.id,
-            endpoint=None,
-        )
+        job_id = mapper.find_one(tables.Job, name=job_name, version=job_version).id
         resource_description = f'job "{job_name} v{job_version}"'
     elif job_name:
-        job_family_model = mapper.find_one(tables.JobFamily, name=job_name)
-        permission = tables.AuthResourcePermission(
-            id=None,
-            auth_subject_id=auth_subject.id,
-            scope=scope,
-            job_family_id=job_family_model.id,
-            job_id=None,
-            endpoint=None,
-        )
+        job_family_id = mapper.find_one(tables.JobFamily, name=job_name).id
         resource_description = f'job family "{job_name}"'
     else:
-        permission = tables.AuthResourcePermission(
+        resource_description = 'all jobs'
+
+    permissions = [
+        tables.AuthResourcePermission(
             id=None,
             auth_subject_id=auth_subject.id,
             scope=scope,
-            job_family_id=None,
-            job_id=None,
+            job_family_id=job_family_id,
+            job_id=job_id,
             endpoint=None,
         )
-        resource_description = 'all jobs'
-
-    mapper.create(permission)
-    subject_info = get_description_from_auth_subject(auth_subject)
-    logger.info(f'"{subject_info}" has been granted permission to {resource_description} within {scope} scope')
+        for scope in new_scopes
+    ]
+    mapper.create_many(permissions)
+    for scope in new_scopes:
+        logger.info(f'"{subject_info}" has been granted permission to {resource_description} within {scope} scope')
 
 
 def permission_exists(
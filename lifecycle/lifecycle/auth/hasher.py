@@ -1,10 +1,18 @@
 import base64
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import functools
 import hashlib
 import math
-from typing import Optional
+import multiprocessing
+import threading
+from typing import Any, Callable, Optional
 import secrets
 
+from lifecycle.server.cache import LifecycleCache
+from lifecycle.server.metrics import metric_password_hashing_queue_depth
+from racetrack_client.log.errors import TooManyRequests
+
 RANDOM_STRING_CHARS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
 
 
@@ -49,6 +57,10 @@ class PBKDF2PasswordHasher:
         encoded_2 = self.encode(password, decoded["salt"], decoded["iterations"])
         return constant_time_compare(encoded, encoded_2)
 
+    def must_update(self, encoded: str) -> bool:
+        """Check whether the password was hashed with different parameters than the current ones"""
+        return self.decode(encoded)["iterations"] != self.iterations
+
     def salt(self) -> str:
         """
         Generate a cryptographically secure nonce salt in ASCII with an entropy
@@ -81,7 +93,7 @@ def pbkdf2(password: str, salt: str, iterations: int, dklen: int=0, digest: Opti
     dklen = dklen or None
     password = password.encode("utf-8", "strict")
     salt = salt.encode("utf-8", "strict")
-    return hashlib.pbkdf2_hmac(digest().name, password, salt, iterations, dklen)
+    return password_hashing_pool.run(hashlib.pbkdf2_hmac, digest().name, password, salt, iterations, dklen)
 
 
 def constant_time_compare(val1, val2):
@@ -89,6 +101,55 @@ def constant_time_compare(val1, val2):
     return secrets.compare_digest(val1.encode("utf-8", "strict"), val2.encode("utf-8", "strict"))
 
 
+class PasswordHashingPool:
+    """
+    Bounded pool of processes computing the password hashes.
+    The request thread still waits for the result, and hashing releases the GIL anyway,
+    so the pool doesn't add any concurrency. It caps the CPU spent on hashing at the number of workers
+    and bounds the queue of the passwords waiting to be hashed, rejecting the logins above it.
+    """
+    def __init__(self):
+        self._executor: ProcessPoolExecutor | None = None
+        self._queue_depth: int = 0
+        self._lock = threading.Lock()
+
+    def run(self, func: Callable[..., Any], *args) -> Any:
+        """Call the function in a worker process. It has to be picklable, e.g. defined at the module level"""
+        config = LifecycleCache.config
+        if config.password_hashing_workers <= 0:
+            return func(*args)
+        with self._lock:
+            if self._queue_depth >= config.password_hashing_max_queue:
+                raise TooManyRequests('too many passwords are being verified at the moment, try again later')
+            if self._executor is None:
+                # spawned workers don't inherit the state of the threads running in the server
+                self._executor = ProcessPoolExecutor(max_workers=config.password_hashing_workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            executor = self._executor
+            self._queue_depth += 1
+            metric_password_hashing_queue_depth.set(self._queue_depth)
+        try:
+            return executor.submit(func, *args).result()
+        except BrokenProcessPool:
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            raise
+        finally:
+            with self._lock:
+                self._queue_depth -= 1
+                metric_password_hashing_queue_depth.set(self._queue_depth)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hashing_pool = PasswordHashingPool()
+
+
 @functools.lru_cache
 def get_hasher() -> PBKDF2PasswordHasher:
     return PBKDF2PasswordHasher()
@@ -0,0 +1,51 @@
+from collections import OrderedDict
+import threading
+import time
+
+from lifecycle.server.cache import LifecycleCache
+from lifecycle.server.metrics import metric_login_attempts_rejected
+from racetrack_client.log.errors import TooManyRequests
+
+
+class LoginRateLimiter:
+    """
+    Limits the number of failed login attempts per username within a fixed time window,
+    so that password guessing can't overload the server with hashing.
+    Successful logins are not counted. The limit is kept in memory of a single Lifecycle process.
+    """
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries: int = max_entries
+        # username -> (window start time, number of failed attempts)
+        self._windows: OrderedDict[str, tuple[float, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check_attempt(self, username: str):
+        """Raise TooManyRequests if the limit of failed attempts is exceeded"""
+        config = LifecycleCache.config
+        if config.login_rate_limit <= 0:
+            return
+        with self._lock:
+            _, failures = self._current_window(username, time.monotonic())
+            if failures >= config.login_rate_limit:
+                metric_login_attempts_rejected.inc()
+                raise TooManyRequests(f'too many login attempts for user {username}, try again later')
+
+    def record_failure(self, username: str):
+        """Count the failed login attempt"""
+        if LifecycleCache.config.login_rate_limit <= 0:
+            return
+        with self._lock:
+            window_start, failures = self._current_window(username, time.monotonic())
+            self._windows[username] = (window_start, failures + 1)
+            self._windows.move_to_end(username)
+            while len(self._windows) > self.max_entries:
+                self._windows.popitem(last=False)
+
+    def _current_window(self, username: str, current_time: float) -> tuple[float, int]:
+        window_start, failures = self._windows.get(username, (current_time, 0))
+        if current_time - window_start >= LifecycleCache.config.login_rate_limit_period:
+            return current_time, 0
+        return window_start, failures
+
+
+login_rate_limiter = LoginRateLimiter()
@@ -0,0 +1,163 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+import threading
+from typing import Iterable
+
+from lifecycle.database.schema import tables
+from lifecycle.database.table_model import table_metadata
+from lifecycle.server.cache import LifecycleCache
+from racetrack_commons.auth.scope import AuthScope
+from racetrack_commons.entities.dto import JobDto, JobFamilyDto
+
+# Granted endpoints of a resource, None stands for any endpoint
+EndpointSet = set[str | None]
+# Resources granted within a scope: job name (None - any job) -> job version (None - any version) -> endpoints
+ResourceTrie = dict[str | None, dict[str | None, EndpointSet]]
+
+
+@dataclass
+class PermittedResources:
+    """Set of resources that auth subject has permissions to access within a scope, regardless of the endpoints"""
+    all_jobs: bool = False
+    family_ids: set[str] = field(default_factory=set)
+    family_names: set[str] = field(default_factory=set)
+    job_ids: set[str] = field(default_factory=set)
+
+    def permits_job(self, job: JobDto) -> bool:
+        return self.all_jobs or job.id in self.job_ids or job.name in self.family_names
+
+    def permits_family(self, family: JobFamilyDto) -> bool:
+        return self.all_jobs or family.id in self.family_ids
+
+    def update(self, other: 'PermittedResources'):
+        self.all_jobs = self.all_jobs or other.all_jobs
+        self.family_ids.update(other.family_ids)
+        self.family_names.update(other.family_names)
+        self.job_ids.update(other.job_ids)
+
+
+class PermissionIndex:
+    """
+    Permissions of all auth subjects compiled to nested lookups: subject -> scope -> job name -> version -> endpoints,
+    so that authorization checks are evaluated in memory, consistently with the SQL queries in "authorize" module
+    """
+    def __init__(self, permissions: Iterable[dict], family_names: dict[str, str], job_names: dict[str, tuple[str, str]]):
+        """
+        :param permissions: rows of AuthResourcePermission table
+        :param family_names: names of job families by their IDs
+        :param job_names: pairs of job name and version by job IDs
+        """
+        self._subjects: dict[str, dict[str, ResourceTrie]] = defaultdict(dict)
+        self._permitted: dict[str, dict[str, PermittedResources]] = defaultdict(dict)
+        for permission in permissions:
+            self._add_permitted_resource(permission, family_names)
+            scopes = self._subjects[permission['auth_subject_id']]
+            trie = scopes.setdefault(permission['scope'], {})
+            job_name: str | None = None
+            job_version: str | None = None
+            if permission['job_family_id'] is not None:
+                job_name = family_names.get(permission['job_family_id'])
+                if job_name is None:
+                    continue
+            if permission['job_id'] is not None:
+                if permission['job_id'] not in job_names:
+                    continue
+                permitted_name, job_version = job_names[permission['job_id']]
+                if job_name is not None and job_name != permitted_name:
+                    continue  # contradictory permission, never matches
+                job_name = permitted_name
+            trie.setdefault(job_name, {}).setdefault(job_version, set()).add(permission['endpoint'])
+
+    def _add_permitted_resource(self, permission: dict, family_names: dict[str, str]):
+        resources = self._permitted[permission['auth_subject_id']].setdefault(permission['scope'], PermittedResources())
+        if permission['job_family_id'] is None and permission['job_id'] is None:
+            resources.all_jobs = True
+        if permission['job_id'] is not None:
+            resources.job_ids.add(permission['job_id'])
+        if permission['job_family_id'] is not None:
+            resources.family_ids.add(permission['job_family_id'])
+            if permission['job_family_id'] in family_names:
+                resources.family_names.add(family_names[permission['job_family_id']])
+
+    def permitted_resources(self, auth_subject_id: str, scope: str) -> PermittedResources:
+        resources = PermittedResources()
+        scopes = self._permitted.get(auth_subject_id, {})
+        for scope_key in (scope, AuthScope.FULL_ACCESS.value):
+            if scope_key in scopes:
+                resources.update(scopes[scope_key])
+        return resources
+
+    def has_scope_permission(self, auth_subject_id: str, scope: str) -> bool:
+        scopes = self._subjects.get(auth_subject_id, {})
+        return scope in scopes or AuthScope.FULL_ACCESS.value in scopes
+
+    def has_resource_permission(self, auth_subject_id: str, job_name: str, job_version: str, scope: str) -> bool:
+        """Check access to the job, regardless of the endpoints"""
+        return any(True for _ in self._matching_endpoint_sets(auth_subject_id, job_name, job_version, scope))
+
+    def has_endpoint_permission(self, auth_subject_id: str, job_name: str, job_version: str, endpoint: str, scope: str) -> bool:
+        return any(
+            endpoint in endpoints or None in endpoints
+            for endpoints in self._matching_endpoint_sets(auth_subject_id, job_name, job_version, scope)
+        )
+
+    def _matching_endpoint_sets(self, auth_subject_id: str, job_name: str, job_version: str, scope: str) -> Iterable[EndpointSet]:
+        scopes = self._subjects.get(auth_subject_id)
+        if not scopes:
+            return
+        for scope_key in (scope, AuthScope.FULL_ACCESS.value):
+            trie = scopes.get(scope_key)
+            if trie is None:
+                continue
+            for name_key in (job_name, None):
+                versions = trie.get(name_key)
+                if versions is None:
+                    continue
+                for version_key in (job_version, None):
+                    endpoints = versions.get(version_key)
+                    if endpoints is not None:
+                        yield endpoints
+
+
+class PermissionIndexCache:
+    """
+    Process-local permission index, rebuilt whenever permissions or job families have been written,
+    by this or any other Lifecycle instance
+    """
+    def __init__(self):
+        self._index: PermissionIndex | None = None
+        self._generation: int = -1
+        self._lock = threading.Lock()
+
+    def get_index(self) -> PermissionIndex | None:
+        """Return up-to-date permission index or None if it can't be trusted at the moment"""
+        mapper = LifecycleCache.record_mapper()
+        notifier = mapper.change_notifier
+        table_names = [
+            table_metadata(tables.AuthResourcePermission).table_name,
+            table_metadata(tables.JobFamily).table_name,
+        ]
+        notifier.watch_tables(table_names, LifecycleCache.config.database_changes_poll_interval)
+        generation = sum(notifier.generation(table) for table in table_names)
+        if not notifier.is_synchronized():
+            return None
+        with self._lock:
+            if self._index is not None and self._generation == generation:
+                return self._index
+
+        permissions = mapper.filter_dicts(tables.AuthResourcePermission,
+                                          columns=['auth_subject_id', 'scope', 'job_family_id', 'job_id', 'endpoint'])
+        family_names = {row['id']: row['name'] for row in mapper.filter_dicts(tables.JobFamily, columns=['id', 'name'])}
+        # name and version of the job never change, so the index doesn't depend on the updates of the jobs
+        job_names = {
+            row['id']: (row['name'], row['version'])
+            for row in mapper.filter_dicts(tables.Job, columns=['id', 'name', 'version'])
+        }
+        index = PermissionIndex(permissions, family_names, job_names)
+        with self._lock:
+            self._index = index
+            self._generation = generation
+        return index
+
+
+permission_index_cache = PermissionIndexCache()
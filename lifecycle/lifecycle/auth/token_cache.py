@@ -0,0 +1,72 @@
+from collections import OrderedDict
+import copy
+import threading
+import time
+from typing import Callable
+
+from lifecycle.database.schema import tables
+from lifecycle.database.table_model import TableModel, table_metadata, track_changes
+from lifecycle.server.cache import LifecycleCache
+from lifecycle.server.metrics import metric_auth_token_cache_hits, metric_auth_token_cache_misses
+
+AuthTokenEntry = tuple[tables.AuthSubject, tables.AuthToken]
+
+
+class AuthTokenCache:
+    """
+    Bounded cache of the auth tokens and their subjects, resolved by the token string.
+    Entries expire after a TTL and all of them are dropped as soon as any token or subject is written,
+    by this or any other Lifecycle instance, so that revoked tokens are not accepted anymore.
+    """
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries: int = max_entries
+        self._entries: OrderedDict[str, tuple[float, AuthTokenEntry]] = OrderedDict()
+        self._generation: int = -1
+        self._lock = threading.Lock()
+
+    def get(self, token: str, loader: Callable[[str], AuthTokenEntry]) -> AuthTokenEntry:
+        """Return copies of the cached auth subject and token, so they can be modified by the caller"""
+        config = LifecycleCache.config
+        if config.auth_token_cache_ttl <= 0:
+            return loader(token)
+        notifier = LifecycleCache.record_mapper().change_notifier
+        table_names = [table_metadata(tables.AuthToken).table_name, table_metadata(tables.AuthSubject).table_name]
+        notifier.watch_tables(table_names, config.database_changes_poll_interval)
+        # generation is read before loading, so the changes made in the meantime invalidate the result
+        generation = sum(notifier.generation(table) for table in table_names)
+        if not notifier.is_synchronized():
+            return loader(token)
+
+        with self._lock:
+            if self._generation != generation:
+                self._entries.clear()
+                self._generation = generation
+            cached = self._entries.get(token)
+            if cached is not None and cached[0] > time.monotonic():
+                self._entries.move_to_end(token)
+                metric_auth_token_cache_hits.inc()
+                return _copy_entry(cached[1])
+
+        metric_auth_token_cache_misses.inc()
+        entry = loader(token)
+        with self._lock:
+            if self._generation == generation:
+                self._entries[token] = (time.monotonic() + config.auth_token_cache_ttl, entry)
+                self._entries.move_to_end(token)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return _copy_entry(entry)
+
+
+def _copy_entry(entry: AuthTokenEntry) -> AuthTokenEntry:
+    auth_subject, auth_token = entry
+    return _copy_record(auth_subject), _copy_record(auth_token)
+
+
+def _copy_record(record: TableModel) -> TableModel:
+    copied = copy.copy(record)
+    track_changes(copied)  # don't share the set of changed fields with the cached record
+    return copied
+
+
+auth_token_cache = AuthTokenCache()
@@ -0,0 +1,90 @@
+from datetime import date, datetime
+import threading
+import time
+
+from lifecycle.database.schema import tables
+from lifecycle.server.cache import LifecycleCache
+from lifecycle.server.metrics import metric_token_usage_buffer_size, metric_token_usage_flush_duration
+from racetrack_client.log.context_error import ContextError
+from racetrack_client.log.exception import log_exception
+from racetrack_client.log.logs import get_logger
+from racetrack_client.utils.time import now
+
+logger = get_logger(__name__)
+
+
+class TokenUsageBuffer:
+    """
+    Write-behind buffer of the last use times of the auth tokens.
+    Uses of the same token are coalesced in memory and saved periodically with a single batch of updates,
+    keeping the database writes out of the request path.
+    """
+    def __init__(self):
+        self._last_uses: dict[str, datetime] = {}
+        # tokens already recorded today, as the cached tokens may not know about their saved use
+        self._recorded_today: set[str] = set()
+        self._recorded_day: date | None = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher_thread: threading.Thread | None = None
+
+    def record(self, auth_token: tables.AuthToken):
+        """
+        Remember the use of the auth token.
+        Keep it in daily granularity to avoid too many updates in the database.
+        """
+        current_time = now()
+        if auth_token.last_use_time is not None and auth_token.last_use_time.date() == current_time.date():
+            return
+        with self._lock:
+            if self._recorded_day != current_time.date():
+                self._recorded_today.clear()
+                self._recorded_day = current_time.date()
+            if auth_token.id in self._recorded_today:
+                return
+            self._recorded_today.add(auth_token.id)
+            self._last_uses[auth_token.id] = current_time
+            metric_token_usage_buffer_size.set(len(self._last_uses))
+            if self._flusher_thread is None:
+                self._flusher_thread = threading.Thread(
+                    target=self._flush_periodically, args=(LifecycleCache.config.auth_token_usage_flush_interval,),
+                    name='token_usage_flusher', daemon=True,
+                )
+                self._flusher_thread.start()
+
+    def flush(self):
+        """Save all buffered last use times in a database"""
+        with self._flush_lock:
+            with self._lock:
+                last_uses, self._last_uses = self._last_uses, {}
+                metric_token_usage_buffer_size.set(0)
+            if not last_uses:
+                return
+
+            start_time = time.monotonic()
+            try:
+                # last use time doesn't matter for authentication, so don't drop the cached tokens everywhere
+                LifecycleCache.record_mapper().update_many_from_dict(tables.AuthToken, {
+                    token_id: {'last_use_time': last_use_time}
+                    for token_id, last_use_time in last_uses.items()
+                }, notify_change=False)
+            except BaseException:
+                with self._lock:  # retry next time, unless the token has been used again in the meantime
+                    for token_id, last_use_time in last_uses.items():
+                        self._last_uses.setdefault(token_id, last_use_time)
+                    metric_token_usage_buffer_size.set(len(self._last_uses))
+                raise
+            finally:
+                metric_token_usage_flush_duration.observe(time.monotonic() - start_time)
+            logger.debug(f'saved last use time of {len(last_uses)} auth tokens')
+
+    def _flush_periodically(self, flush_interval: float):
+        while True:
+            time.sleep(flush_interval)
+            try:
+                self.flush()
+            except BaseException as e:
+                log_exception(ContextError('Saving last use time of auth tokens failed', e))
+
+
+token_usage_buffer = TokenUsageBuffer()
@@ -60,10 +60,12 @@ def register_user_account(username: str, password: str) -> tables.User:
 
     auth_subject = create_auth_subject_for_user(user_record)
     # grant default user permisssions
-    grant_permission(auth_subject, AuthScope.READ_JOB.value)
-    grant_permission(auth_subject, AuthScope.CALL_JOB.value)
-    grant_permission(auth_subject, AuthScope.DEPLOY_NEW_FAMILY.value)
-    grant_permission(auth_subject, AuthScope.DEPLOY_JOB.value)
+    grant_permissions(auth_subject, [
+        AuthScope.READ_JOB.value,
+        AuthScope.CALL_JOB.value,
+        AuthScope.DEPLOY_NEW_FAMILY.value,
+        AuthScope.DEPLOY_JOB.value,
+    ])
 
     logger.info(f'User account created: {username}')
     return user
@@ -96,21 +98,26 @@ def create_auth_subject_for_user(user_model: tables.User) -> tables.AuthSubject:
     return auth_subject
 
 
-def grant_permission(
+def grant_permissions(
     auth_subject: tables.AuthSubject,
-    scope: str,
+    scopes: list[str],
 ):
-    permission = tables.AuthResourcePermission(
-        id=None,
-        auth_subject_id=auth_subject.id,
-        scope=scope,
-        job_family_id=None,
-        job_id=None,
-        endpoint=None,
-    )
-    LifecycleCache.record_mapper().create(permission)
+    """Grant permissions to all jobs within multiple scopes at once"""
+    permissions = [
+        tables.AuthResourcePermission(
+            id=None,
+            auth_subject_id=auth_subject.id,
+            scope=scope,
+            job_family_id=None,
+            job_id=None,
+            endpoint=None,
+        )
+        for scope in scopes
+    ]
+    LifecycleCache.record_mapper().create_many(permissions)
     subject_info = get_description_from_auth_subject(auth_subject)
-    logger.info(f'"{subject_info}" has been granted permission to all jobs within {scope} scope')
+    for scope in scopes:
+        logger.info(f'"{subject_info}" has been granted permission to all jobs within {scope} scope')
 
 
 def find_user_record_by_id(user_id: int) -> tables.User:
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Literal, Optional
 from pydantic import BaseModel, ConfigDict, field_validator
 
 from racetrack_client.utils.quantity import Quantity
@@ -56,8 +56,24 @@ class Config(BaseModel):
     # Default back-end platform where to deploy the services
     infrastructure_target: Optional[str] = None
 
-    # How often (in seconds) to check for changes made to jobs in a database and notify live clients
-    job_watcher_interval: float = 3
+    # How often (in seconds) to double-check the jobs in a database for changes, in case a change notification was missed.
+    # Live clients are notified about the changes as soon as they're committed.
+    job_watcher_interval: float = 60
+    # Number of the recent job changes kept in memory, so that the reconnecting Event Stream clients can catch up.
+    # Clients falling further behind receive a snapshot of all job IDs.
+    event_stream_replay_log_size: int = 1000
+    # Maximum number of events waiting to be sent to a single Event Stream client
+    event_stream_client_queue_size: int = 100
+    # What to do with the Event Stream clients that can't keep up with the events:
+    # "disconnect" them (they may resume the stream later) or "drop" the events
+    event_stream_slow_client_policy: Literal['disconnect', 'drop'] = 'disconnect'
+    # Maximum number of runtime log lines sent to the Socket.IO clients in a single batch
+    logs_stream_batch_max_lines: int = 100
+    # Maximum time (in seconds) the runtime log lines are held back to be sent in a batch
+    logs_stream_batch_max_delay: float = 0.05
+    # Maximum number of seconds to wait for the list of jobs from each infrastructure target when synchronizing the registry.
+    # Jobs of the infrastructures that didn't respond in time are left intact until the next synchronization.
+    infrastructure_listing_timeout: float = 30
 
     # How often (in seconds) to check if there is vital connection to database. 0 value disables this check.
     database_status_refresh_interval: float = 60
@@ -65,6 +81,34 @@ class Config(BaseModel):
     database_connection_pool: int = 20
     # Whether to print logs about every executed SQL query
     database_log_queries: bool = False
+    # Whether to prepare the most frequently executed queries as server-side prepared statements (PostgreSQL only).
+    # Don't enable it when connecting through a pooler in transaction mode (e.g. PgBouncer)
+    database_prepared_statements: bool = False
+    # Minimal duration (in seconds) of SQL query to be logged as slow. 0 value disables the slow-query log
+    database_slow_query_threshold: float = 0.5
+    # Whether to use SQLite database in Write-Ahead Logging mode with one writer connection
+    # and a pool of reader connections (of "database_connection_pool" size), so that reads don't wait for writes
+    database_sqlite_wal_mode: bool = False
+    # Maximum number of seconds to wait for a lock of SQLite database held by another connection
+    database_sqlite_busy_timeout: float = 5
+    # How often (in seconds) to poll SQLite database for changes made by other processes, invalidating in-memory caches.
+    # PostgreSQL notifies about the changes immediately, it's only the retry interval when the connection is lost.
+    database_changes_poll_interval: float = 1
+    # How long (in seconds) to keep the authenticated tokens in memory. 0 value disables the cache.
+    # Cached tokens are dropped immediately once any token is changed or revoked.
+    auth_token_cache_ttl: float = 60
+    # How often (in seconds) to save the last use time of the auth tokens, buffered in memory
+    auth_token_usage_flush_interval: float = 10
+    # Number of processes hashing the passwords, which caps the CPU spent on it. Request thread waits for the result anyway.
+    # 0 value hashes them in the thread handling the request, without bounding the queue.
+    password_hashing_workers: int = 2
+    # Maximum number of passwords waiting to be hashed, further login attempts are rejected until the queue is drained
+    password_hashing_max_queue: int = 100
+    # Maximum number of failed login attempts per username within the rate limit period. 0 value disables the limit.
+    # Attempts are counted by each Lifecycle process separately, the limit is not global.
+    login_rate_limit: int = 10
+    # Period (in seconds) in which the login attempts are counted
+    login_rate_limit_period: float = 60
 
     # Whether to allow overwriting existing jobs by deploying the same version once again
     allow_job_overwrite: bool = False
@@ -84,6 +128,12 @@ class Config(BaseModel):
     # Whether reconciliation loop is enabled or not.
     # Reconciliation loop is an automated, periodic process that restores missing jobs by re-provisioning them
     reconciliation_loop: bool = False
+    # Maximum number of lost jobs being re-provisioned at the same time by the reconciliation, per infrastructure target
+    reconciliation_concurrency: int = 4
+    # Delay (in seconds) before retrying the reconciliation of a job that failed to be re-provisioned, doubled with every failure
+    reconciliation_retry_delay: float = 10 * 60
+    # Maximum delay (in seconds) between the reconciliation attempts of a failing job
+    reconciliation_max_retry_delay: float = 24 * 3600
 
     @field_validator(
         'max_job_memory_limit',
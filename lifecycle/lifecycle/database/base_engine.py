@@ -1,8 +1,11 @@
+from contextlib import AbstractContextManager
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Callable, Iterator
 from abc import ABC, abstractmethod
+import uuid
 
 from lifecycle.database.base_query_builder import BaseQueryBuilder
+from lifecycle.database.query_stats import QueryStats
 from racetrack_client.log.logs import get_logger
 
 logger = get_logger(__name__)
@@ -31,7 +34,12 @@ class DbEngine(ABC):
     - SQLite implementation: file://./sqlite/engine.py
     """
     query_builder: BaseQueryBuilder
-    
+    query_stats: QueryStats
+
+    def __init__(self):
+        # identifies this Lifecycle instance as the author of the changes made to the database
+        self.instance_id: str = str(uuid.uuid4())
+
     def check_connection(self) -> None:
         pass
 
@@ -51,6 +59,16 @@ class DbEngine(ABC):
     ) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    def execute_many(
+        self,
+        query,
+        params_list: list[list],
+        expected_affected_rows: int = -1,
+    ) -> None:
+        """Execute the same statement for each set of parameters in a batch"""
+        raise NotImplementedError
+
     @abstractmethod
     def execute_sql_fetch_one(
         self,
@@ -67,6 +85,61 @@ class DbEngine(ABC):
     ) -> list[dict]:
         raise NotImplementedError
 
+    @abstractmethod
+    def execute_sql_stream(
+        self,
+        query,
+        params: list | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[dict]:
+        """Iterate over the resulting rows, fetching them from a database in batches to keep memory bounded"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def transaction(self) -> AbstractContextManager[None]:
+        """
+        Unit of work: run all statements issued within the context (in the current thread)
+        on a single connection and commit them atomically at the end.
+        Changes are rolled back if an exception is raised.
+        Nested transactions are merged into the outermost one.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def in_transaction(self) -> bool:
+        """Whether the current thread runs an ongoing transaction"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Run the callback once the ongoing transaction of the current thread is committed
+        (never if it's rolled back), or immediately if there is no transaction
+        """
+        raise NotImplementedError
+
+    def publish_change(self, channel: str, payload: str) -> None:
+        """
+        Let other Lifecycle instances know about a change made to the database.
+        It's delivered once the ongoing transaction is committed.
+        """
+        pass
+
+    @abstractmethod
+    def watch_changes(
+        self,
+        channel: str,
+        on_listening: Callable[[], None],
+        on_change: Callable[[str | None], None],
+        poll_interval: float,
+    ) -> None:
+        """
+        Block and call on_change with the payload of every change published by the other instances,
+        or with None when the database has been modified in an unknown way.
+        Returns or raises an exception when the watching gets interrupted.
+        """
+        raise NotImplementedError
+
     def last_query(self) -> str | None:
         return None
 
@@ -16,6 +16,11 @@ class BaseQueryBuilder(ABC):
         """Placeholder for query parameters"""
         return '?'
 
+    def compile(self, query: str | Composed) -> str | bytes:
+        """Render query to the final SQL text, so it can be cached and reused"""
+        assert isinstance(query, str), f'unexpected query type: {type(query)}'
+        return query
+
     @abstractmethod
     def select(
         self,
@@ -45,6 +50,28 @@ class BaseQueryBuilder(ABC):
     ) -> QueryWithParams:
         raise NotImplementedError
 
+    @abstractmethod
+    def insert_many(
+        self,
+        table: str,
+        fields: list[str],
+        rows: list[list[Any]],
+        primary_key_columns: list[str],
+    ) -> QueryWithParams:
+        """Insert multiple rows in a single statement, returning their primary keys"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def upsert_many(
+        self,
+        table: str,
+        fields: list[str],
+        rows: list[list[Any]],
+        primary_key_column: str,
+    ) -> QueryWithParams:
+        """Insert multiple rows in a single statement, updating the ones that already exist"""
+        raise NotImplementedError
+
     @abstractmethod
     def update(
         self,
@@ -0,0 +1,128 @@
+from collections import defaultdict
+import threading
+import time
+from typing import Callable
+
+from racetrack_client.log.context_error import ContextError
+from racetrack_client.log.exception import log_exception
+from racetrack_client.log.logs import get_logger
+from lifecycle.database.base_engine import DbEngine
+
+logger = get_logger(__name__)
+
+CHANGES_CHANNEL = 'lifecycle_changes'
+# tables which changes are published by the PostgreSQL triggers, no matter who made them
+TRIGGER_PUBLISHED_TABLES = {'registry_job'}
+# tables cached in memory by Lifecycle instances.
+# Writes to them are always published, no matter if the writing process uses the caches itself.
+PUBLISHED_TABLES = {
+    'registry_authtoken',
+    'registry_authsubject',
+    'registry_authresourcepermission',
+    'registry_jobfamily',
+}
+
+
+class ChangeNotifier:
+    """
+    Keeps track of changes made to the database tables with generation counters,
+    monotonically increasing with every write, so that in-memory caches can tell whether they are still fresh.
+    Changes made by other Lifecycle instances are received from the database
+    (PostgreSQL LISTEN/NOTIFY or polling SQLite for the data version) once the watching is started.
+    PostgreSQL triggers notify about the writes to some tables made by any process,
+    telling the author instance by the "lifecycle.instance_id" session setting.
+    """
+    def __init__(self, engine: DbEngine):
+        self.engine: DbEngine = engine
+        self.instance_id: str = engine.instance_id
+        self._generations: dict[str, int] = defaultdict(int)
+        self._global_generation: int = 0  # bumped when any table might have changed
+        self._listening: bool = False
+        self._watcher_thread: threading.Thread | None = None
+        self._subscribers: list[Callable[[str | None], None]] = []
+        self._lock = threading.Lock()
+
+    def generation(self, table: str) -> int:
+        """Number changing whenever the table is modified. Read it before loading the data to be cached"""
+        return self._generations[table] + self._global_generation
+
+    def is_synchronized(self) -> bool:
+        """
+        Whether the generations can be trusted by the current thread: changes made by other instances are being received
+        and there is no ongoing transaction, which changes are not reflected until it's committed
+        """
+        return self._listening and not self.engine.in_transaction()
+
+    def watch_tables(self, tables: list[str], poll_interval: float) -> None:
+        """Start receiving the changes of the cached tables made by other instances in the background"""
+        unpublished_tables = set(tables) - PUBLISHED_TABLES - TRIGGER_PUBLISHED_TABLES
+        assert not unpublished_tables, f'changes of the tables {unpublished_tables} are not published to other instances'
+        with self._lock:
+            if self._watcher_thread is None:
+                self._watcher_thread = threading.Thread(
+                    target=self._watch_changes, args=(poll_interval,), daemon=True,
+                )
+                self._watcher_thread.start()
+
+    def subscribe(self, callback: Callable[[str | None], None]) -> None:
+        """
+        Call back whenever a change of a table has been committed, by this or any other instance.
+        None is passed instead of a table name when any table might have changed.
+        Callback is invoked by the writing or watching thread, so it should return quickly.
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[str | None], None]) -> None:
+        with self._lock:
+            self._subscribers.remove(callback)
+
+    def table_changed(self, table: str) -> None:
+        """Record a write made to the table by this instance, taking effect once it's committed"""
+        if table in PUBLISHED_TABLES:
+            self.engine.publish_change(CHANGES_CHANNEL, f'{self.instance_id}:{table}')
+        self.engine.after_commit(lambda: self._bump_table(table))
+
+    def _watch_changes(self, poll_interval: float):
+        while True:
+            try:
+                self.engine.watch_changes(CHANGES_CHANNEL, self._on_listening, self._on_change, poll_interval)
+            except BaseException as e:
+                log_exception(ContextError('Watching database changes failed', e))
+            # changes might be missed until reconnected
+            self._listening = False
+            self._bump_all()
+            time.sleep(poll_interval)
+
+    def _on_listening(self):
+        logger.debug('Watching changes of the database made by other instances')
+        self._bump_all()
+        self._listening = True
+
+    def _on_change(self, payload: str | None):
+        if payload is None:
+            self._bump_all()
+            return
+        instance_id, _, table = payload.partition(':')
+        if instance_id != self.instance_id:
+            self._bump_table(table)
+
+    def _bump_table(self, table: str):
+        with self._lock:
+            self._generations[table] += 1
+            subscribers = self._subscribers.copy()
+        self._notify_subscribers(subscribers, table)
+
+    def _bump_all(self):
+        with self._lock:
+            self._global_generation += 1
+            subscribers = self._subscribers.copy()
+        self._notify_subscribers(subscribers, None)
+
+    @staticmethod
+    def _notify_subscribers(subscribers: list[Callable[[str | None], None]], table: str | None):
+        for callback in subscribers:
+            try:
+                callback(table)
+            except BaseException as e:
+                log_exception(ContextError('Change subscriber failed', e))
@@ -9,10 +9,20 @@ from lifecycle.database.sqlite.engine import SQLiteEngine
 def create_db_engine(config: Config) -> DbEngine:
     db_type = os.environ.get('DB_TYPE', 'postgres')
     if db_type == 'postgres':
-        return PostgresEngine(max_pool_size=config.database_connection_pool, log_queries=config.database_log_queries)
-    elif db_type == 'sqlite':
-        return SQLiteEngine(log_queries=config.database_log_queries)
-    elif db_type == 'sqlite-memory':
-        return SQLiteEngine(copy=True, log_queries=config.database_log_queries)
+        return PostgresEngine(
+            max_pool_size=config.database_connection_pool,
+            log_queries=config.database_log_queries,
+            prepared_statements=config.database_prepared_statements,
+            slow_query_threshold=config.database_slow_query_threshold,
+        )
+    elif db_type in {'sqlite', 'sqlite-memory'}:
+        return SQLiteEngine(
+            copy=db_type == 'sqlite-memory',
+            log_queries=config.database_log_queries,
+            slow_query_threshold=config.database_slow_query_threshold,
+            wal_mode=config.database_sqlite_wal_mode,
+            reader_pool_size=config.database_connection_pool,
+            busy_timeout=config.database_sqlite_busy_timeout,
+        )
     else:
         raise ValueError(f'Unknown database type: {db_type}')
@@ -1,33 +1,52 @@
+import itertools
 import os
-from typing import Any
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
 
 from psycopg.types.json import set_json_loads, set_json_dumps
 from psycopg_pool import ConnectionPool, PoolTimeout
 from psycopg import Connection, Cursor, DatabaseError, IntegrityError, InterfaceError
-from psycopg.sql import SQL, Literal, Composable, Composed
+from psycopg.sql import SQL, Identifier, Literal, Composable, Composed
 
 from lifecycle.server.metrics import metric_database_connection_failed, metric_database_connection_opened, \
-    metric_database_connection_closed, metric_database_queries_executed
+    metric_database_connection_closed, metric_database_queries_executed, metric_database_pool_wait_duration
 from racetrack_client.log.context_error import ContextError
 from racetrack_client.log.errors import AlreadyExists
 from racetrack_client.log.exception import log_exception
 from racetrack_client.log.logs import get_logger
 from lifecycle.database.base_engine import DbEngine, check_affected_rows, DatabaseStatus
 from lifecycle.database.postgres.query_builder import QueryBuilder
+from lifecycle.database.query_stats import QueryStats
 from racetrack_client.utils.shell import shell, CommandError
 
 logger = get_logger(__name__)
 
 
 class PostgresEngine(DbEngine):
-    def __init__(self, max_pool_size: int, log_queries: bool):
+    def __init__(
+        self,
+        max_pool_size: int,
+        log_queries: bool,
+        prepared_statements: bool = False,
+        slow_query_threshold: float = 0,
+    ):
         super().__init__()
         conn_params = get_connection_params()
         self.connection_status: bool | None = None
         self.schema: str | None = _get_schema_name()
         self.log_queries: bool = log_queries
+        self.query_stats: QueryStats = QueryStats(slow_query_threshold)
+        # None lets psycopg prepare a query server-side once it's executed more than prepare_threshold times.
+        # Combined with cached query text, the hottest query shapes (e.g. find by primary key) get prepared.
+        self._prepare: bool | None = None if prepared_statements else False
         self.query_builder: QueryBuilder = QueryBuilder()
         self._database_status: DatabaseStatus = DatabaseStatus()
+        # connection pinned to the current thread by an ongoing transaction
+        self._local = threading.local()
+        # unique names of the server-side cursors
+        self._stream_ids = itertools.count()
         # https://www.psycopg.org/psycopg3/docs/api/pool.html#psycopg_pool.ConnectionPool
         self.connection_pool: ConnectionPool = ConnectionPool(
             connection_class=PgConnection,
@@ -62,11 +81,14 @@ class PostgresEngine(DbEngine):
         set_json_dumps(json_dumps)
 
     def _on_configure_connection(self, connection: Connection) -> None:
-        if self.schema:
-            with connection.cursor() as cursor:
+        with connection.cursor() as cursor:
+            if self.schema:
                 query = SQL('SET search_path TO {schema}').format(schema=Literal(self.schema))
                 cursor.execute(query, prepare=False)
-            connection.commit()
+            # let the triggers tell which instance made the change
+            query = SQL('SET lifecycle.instance_id TO {instance_id}').format(instance_id=Literal(self.instance_id))
+            cursor.execute(query, prepare=False)
+        connection.commit()
         metric_database_connection_opened.inc()
         self.connection_status = True
 
@@ -128,17 +150,19 @@ class PostgresEngine(DbEngine):
 
     def execute_sql(
         self,
-        query: str | Composed,
+        query: str | bytes | Composed,
         params: list | None = None,
         expected_affected_rows: int = -1,
     ) -> None:
         try:
-            with self.connection_pool.connection() as conn:
+            with self._connection() as conn:
                 cursor: Cursor
                 with conn.cursor() as cursor:
                     sql = self._get_query_bytes(query, conn)
                     self._log_query(sql)
-                    cursor.execute(sql, params=params, prepare=False)
+                    start_time = time.perf_counter()
+                    cursor.execute(sql, params=params, prepare=self._prepare)
+                    self.query_stats.observe(sql, params, time.perf_counter() - start_time)
                     metric_database_queries_executed.inc()
                     check_affected_rows(expected_affected_rows, cursor.rowcount)
         except IntegrityError as e:
@@ -151,18 +175,48 @@ class PostgresEngine(DbEngine):
         except InterfaceError as e:
             raise ContextError(f'Database interface error: {type(e).__name__}') from e
 
+    def execute_many(
+        self,
+        query: str | bytes | Composed,
+        params_list: list[list],
+        expected_affected_rows: int = -1,
+    ) -> None:
+        try:
+            with self._connection() as conn:
+                cursor: Cursor
+                with conn.cursor() as cursor:
+                    sql = self._get_query_bytes(query, conn)
+                    self._log_query(sql)
+                    # psycopg sends the batch in pipeline mode, without waiting for each statement's result
+                    start_time = time.perf_counter()
+                    cursor.executemany(sql, params_list)
+                    self.query_stats.observe(sql, params_list[0] if params_list else None, time.perf_counter() - start_time)
+                    metric_database_queries_executed.inc(len(params_list))
+                    check_affected_rows(expected_affected_rows, cursor.rowcount)
+        except IntegrityError as e:
+            raise AlreadyExists(str(e)) from e
+        except PoolTimeout as e:
+            metric_database_connection_failed.inc()
+            raise ContextError(f'Database connection pool error: {type(e).__name__}') from e
+        except DatabaseError as e:
+            raise ContextError(f'Database error: {type(e).__name__}') from e
+        except InterfaceError as e:
+            raise ContextError(f'Database interface error: {type(e).__name__}') from e
+
     def execute_sql_fetch_one(
         self,
-        query: str | Composed,
+        query: str | bytes | Composed,
         params: list | None = None,
     ) -> dict[str, Any] | None:
         try:
-            with self.connection_pool.connection() as conn:
+            with self._connection() as conn:
                 cursor: Cursor
                 with conn.cursor() as cursor:
                     sql = self._get_query_bytes(query, conn)
                     self._log_query(sql)
-                    cursor.execute(sql, params=params, prepare=False)
+                    start_time = time.perf_counter()
+                    cursor.execute(sql, params=params, prepare=self._prepare)
+                    self.query_stats.observe(sql, params, time.perf_counter() - start_time)
                     metric_database_queries_executed.inc()
                     row = cursor.fetchone()
                     if row is None:
@@ -181,15 +235,17 @@ class PostgresEngine(DbEngine):
             raise ContextError(f'Database interface error: {type(e).__name__}') from e
 
     def execute_sql_fetch_all(
-        self, query: str | Composed, params: list | None = None
+        self, query: str | bytes | Composed, params: list | None = None
     ) -> list[dict]:
         try:
-            with self.connection_pool.connection() as conn:
+            with self._connection() as conn:
                 cursor: Cursor
                 with conn.cursor() as cursor:
                     sql = self._get_query_bytes(query, conn)
                     self._log_query(sql)
-                    cursor.execute(sql, params=params, prepare=False)
+                    start_time = time.perf_counter()
+                    cursor.execute(sql, params=params, prepare=self._prepare)
+                    self.query_stats.observe(sql, params, time.perf_counter() - start_time)
                     metric_database_queries_executed.inc()
                     rows: list = cursor.fetchall()
                     assert cursor.description, 'no column names in the result'
@@ -205,7 +261,115 @@ class PostgresEngine(DbEngine):
         except InterfaceError as e:
             raise ContextError(f'Database interface error: {type(e).__name__}') from e
 
-    def _get_query_bytes(self, query: str | Composed, connection: Connection) -> bytes:
+    def execute_sql_stream(
+        self, query: str | bytes | Composed, params: list | None = None, batch_size: int = 1000,
+    ) -> Iterator[dict]:
+        try:
+            with self._connection() as conn:
+                # named cursor keeps the result on the server side, fetching it in batches
+                cursor: Cursor
+                with conn.cursor(name=f'lifecycle_stream_{next(self._stream_ids)}') as cursor:
+                    sql = self._get_query_bytes(query, conn)
+                    self._log_query(sql)
+                    start_time = time.perf_counter()
+                    cursor.execute(sql, params=params)
+                    self.query_stats.observe(sql, params, time.perf_counter() - start_time)
+                    metric_database_queries_executed.inc()
+                    col_names: list[str] | None = None
+                    while True:
+                        rows: list = cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        if col_names is None:
+                            assert cursor.description, 'no column names in the result'
+                            col_names = [desc[0] for desc in cursor.description]
+                        for row in rows:
+                            yield dict(zip(col_names, row))
+        except PoolTimeout as e:
+            metric_database_connection_failed.inc()
+            raise ContextError(f'Database connection pool error: {type(e).__name__}') from e
+        except DatabaseError as e:
+            raise ContextError(f'Database error: {type(e).__name__}') from e
+        except InterfaceError as e:
+            raise ContextError(f'Database interface error: {type(e).__name__}') from e
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        if getattr(self._local, 'connection', None) is not None:
+            yield  # join the outer transaction
+            return
+        after_commit_callbacks: list[Callable[[], None]] = []
+        try:
+            with self._pooled_connection() as conn:
+                with conn.transaction():
+                    self._local.connection = conn
+                    self._local.after_commit_callbacks = after_commit_callbacks
+                    try:
+                        yield
+                    finally:
+                        self._local.connection = None
+                        self._local.after_commit_callbacks = None
+        except IntegrityError as e:
+            raise AlreadyExists(str(e)) from e
+        except PoolTimeout as e:
+            metric_database_connection_failed.inc()
+            raise ContextError(f'Database connection pool error: {type(e).__name__}') from e
+        except DatabaseError as e:
+            raise ContextError(f'Database error: {type(e).__name__}') from e
+        for callback in after_commit_callbacks:
+            callback()
+
+    def in_transaction(self) -> bool:
+        return getattr(self._local, 'connection', None) is not None
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        callbacks: list[Callable[[], None]] | None = getattr(self._local, 'after_commit_callbacks', None)
+        if callbacks is not None:
+            callbacks.append(callback)
+        else:
+            callback()
+
+    def publish_change(self, channel: str, payload: str) -> None:
+        # notification is queued until the transaction commits, identical ones are sent only once
+        self.execute_sql('select pg_notify(%s, %s)', [channel, payload])
+
+    def watch_changes(
+        self,
+        channel: str,
+        on_listening: Callable[[], None],
+        on_change: Callable[[str | None], None],
+        poll_interval: float,
+    ) -> None:
+        # listening occupies a dedicated connection, kept outside the pool
+        with PgConnection.connect(**get_connection_params(), autocommit=True) as conn:
+            conn.execute(SQL('LISTEN {channel}').format(channel=Identifier(channel)))
+            on_listening()
+            while True:
+                for notify in conn.notifies(timeout=poll_interval):
+                    on_change(notify.payload)
+                conn.execute('select 1')  # detect broken connection
+
+    @contextmanager
+    def _connection(self) -> Iterator[Connection]:
+        """Use the connection pinned by an ongoing transaction or check out one from the pool"""
+        pinned_connection: Connection | None = getattr(self._local, 'connection', None)
+        if pinned_connection is not None:
+            yield pinned_connection
+        else:
+            with self._pooled_connection() as conn:
+                yield conn
+
+    @contextmanager
+    def _pooled_connection(self) -> Iterator[Connection]:
+        """Check out a connection from the pool, measuring the time spent waiting for it"""
+        start_time = time.perf_counter()
+        with self.connection_pool.connection() as conn:
+            metric_database_pool_wait_duration.observe(time.perf_counter() - start_time)
+            yield conn
+
+    def _get_query_bytes(self, query: str | bytes | Composed, connection: Connection) -> bytes:
+        if isinstance(query, bytes):
+            return query
         if isinstance(query, Composable):
             return query.as_bytes(connection)
         if isinstance(query, str):
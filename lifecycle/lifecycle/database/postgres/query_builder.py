@@ -13,6 +13,11 @@ class QueryBuilder(BaseQueryBuilder):
     def placeholder(self) -> str:
         return '%s'
 
+    def compile(self, query: str | Composable) -> str | bytes:
+        if isinstance(query, Composable):
+            return query.as_bytes(None)
+        return query
+
     def select(
         self,
         table: str,
@@ -74,6 +79,47 @@ class QueryBuilder(BaseQueryBuilder):
         params = list(data.values())
         return query, params
 
+    def insert_many(
+        self,
+        table: str,
+        fields: list[str],
+        rows: list[list[Any]],
+        primary_key_columns: list[str],
+    ) -> QueryWithParams:
+        row_values = SQL('({})').format(SQL(', ').join(Placeholder() * len(fields)))
+        query = SQL('insert into {table} ({fields}) values {values} returning {returning_fields}').format(
+            table=Identifier(table),
+            fields=SQL(', ').join(map(Identifier, fields)),
+            values=SQL(', ').join([row_values] * len(rows)),
+            returning_fields=SQL(', ').join(map(Identifier, primary_key_columns)),
+        )
+        params = [value for row in rows for value in row]
+        return query, params
+
+    def upsert_many(
+        self,
+        table: str,
+        fields: list[str],
+        rows: list[list[Any]],
+        primary_key_column: str,
+    ) -> QueryWithParams:
+        row_values = SQL('({})').format(SQL(', ').join(Placeholder() * len(fields)))
+        query = SQL('insert into {table} ({fields}) values {values} on conflict ({primary_key})').format(
+            table=Identifier(table),
+            fields=SQL(', ').join(map(Identifier, fields)),
+            values=SQL(', ').join([row_values] * len(rows)),
+            primary_key=Identifier(primary_key_column),
+        )
+        updated_fields = [field for field in fields if field != primary_key_column]
+        if updated_fields:
+            query += SQL(' do update set {}').format(SQL(', ').join(
+                [SQL('{} = excluded.{}').format(Identifier(field), Identifier(field)) for field in updated_fields]
+            ))
+        else:
+            query += SQL(' do nothing')
+        params = [value for row in rows for value in row]
+        return query, params
+
     def update(
         self,
         table: str,
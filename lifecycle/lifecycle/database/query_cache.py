@@ -0,0 +1,38 @@
+from collections import OrderedDict
+import threading
+from typing import Callable, Hashable
+
+from lifecycle.server.metrics import metric_database_query_cache_hits, metric_database_query_cache_misses
+
+# SQL query compiled to the final text, ready to be sent to a database
+CompiledQuery = str | bytes
+
+
+class QueryCache:
+    """
+    Bounded LRU cache of compiled SQL queries keyed by the query shape,
+    e.g. (operation, table, filtered columns), so the query is composed only once.
+    """
+    def __init__(self, max_size: int = 1000):
+        self.max_size: int = max_size
+        self._queries: OrderedDict[Hashable, CompiledQuery] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compile(self, key: Hashable, compile_query: Callable[[], CompiledQuery]) -> CompiledQuery:
+        with self._lock:
+            query = self._queries.get(key)
+            if query is not None:
+                self._queries.move_to_end(key)
+                metric_database_query_cache_hits.inc()
+                return query
+
+        metric_database_query_cache_misses.inc()
+        query = compile_query()
+        with self._lock:
+            self._queries[key] = query
+            if len(self._queries) > self.max_size:
+                self._queries.popitem(last=False)
+        return query
+
+    def __len__(self) -> int:
+        return len(self._queries)
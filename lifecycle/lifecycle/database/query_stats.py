@@ -0,0 +1,124 @@
+from dataclasses import dataclass
+from functools import lru_cache
+import os
+import re
+import threading
+import traceback
+
+from pydantic import BaseModel
+
+from lifecycle.server.metrics import metric_database_query_duration
+from racetrack_client.log.logs import get_logger
+
+logger = get_logger(__name__)
+
+_DATABASE_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class SlowQueryShape(BaseModel):
+    """Aggregated statistics of slow executions of the same normalized SQL query"""
+    query: str
+    table: str
+    operation: str
+    count: int = 0
+    total_duration: float = 0
+    max_duration: float = 0
+    params_shape: str = ''  # types of parameters of the slowest execution
+    caller: str = ''  # stack frame of the slowest execution, calling the database layer
+
+
+@dataclass
+class _QueryShape:
+    normalized: str
+    table: str
+    operation: str
+
+
+class QueryStats:
+    """
+    Measures latency of the executed SQL queries, labelled by table and operation,
+    and keeps track of the slowest query shapes.
+    """
+    def __init__(self, slow_query_threshold: float = 0, max_shapes: int = 1000):
+        """
+        :param slow_query_threshold: minimal duration (in seconds) of a query to be logged as slow. 0 disables the log
+        :param max_shapes: maximum number of slow query shapes to keep
+        """
+        self.slow_query_threshold: float = slow_query_threshold
+        self.max_shapes: int = max_shapes
+        self._slow_queries: dict[str, SlowQueryShape] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, query: str | bytes, params: list | None, duration: float) -> None:
+        shape = _parse_query_shape(query)
+        metric_database_query_duration.labels(table=shape.table, operation=shape.operation).observe(duration)
+        if self.slow_query_threshold and duration >= self.slow_query_threshold:
+            self._record_slow_query(shape, params, duration)
+
+    def slowest_queries(self, limit: int = 10) -> list[SlowQueryShape]:
+        """Return the query shapes with the longest executions"""
+        with self._lock:
+            shapes = sorted(self._slow_queries.values(), key=lambda s: s.max_duration, reverse=True)
+            return [shape.model_copy() for shape in shapes[:limit]]
+
+    def _record_slow_query(self, shape: _QueryShape, params: list | None, duration: float) -> None:
+        params_shape = _describe_params_shape(params)
+        caller = _find_caller_frame()
+        logger.warning(f'Slow SQL query ({duration * 1000:.0f} ms) from {caller}: {shape.normalized}, params: {params_shape}')
+        with self._lock:
+            slow_query = self._slow_queries.get(shape.normalized)
+            if slow_query is None:
+                if len(self._slow_queries) >= self.max_shapes:
+                    fastest = min(self._slow_queries.values(), key=lambda s: s.max_duration)
+                    del self._slow_queries[fastest.query]
+                slow_query = SlowQueryShape(query=shape.normalized, table=shape.table, operation=shape.operation)
+                self._slow_queries[shape.normalized] = slow_query
+            slow_query.count += 1
+            slow_query.total_duration += duration
+            if duration >= slow_query.max_duration:
+                slow_query.max_duration = duration
+                slow_query.params_shape = params_shape
+                slow_query.caller = caller
+
+
+_OPERATION_TABLE_PATTERNS: list[tuple[str, re.Pattern]] = [
+    ('select', re.compile(r'^select\b.*?\bfrom\s+"?(\w+)"?', re.IGNORECASE | re.DOTALL)),
+    ('insert', re.compile(r'^insert\s+into\s+"?(\w+)"?', re.IGNORECASE)),
+    ('update', re.compile(r'^update\s+"?(\w+)"?', re.IGNORECASE)),
+    ('delete', re.compile(r'^delete\s+from\s+"?(\w+)"?', re.IGNORECASE)),
+]
+_REPEATED_VALUES_PATTERN = re.compile(r'(\([^()]*\))(?:,\s*\1)+')
+_PLACEHOLDERS_LIST_PATTERN = re.compile(r'\((?:\?|%s)(?:,\s*(?:\?|%s))+\)')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=2048)
+def _parse_query_shape(query: str | bytes) -> _QueryShape:
+    """Normalize SQL query (collapse lists of placeholders and multi-row values) and find its table and operation"""
+    sql = query.decode() if isinstance(query, bytes) else query
+    normalized = _WHITESPACE_PATTERN.sub(' ', sql).strip()
+    normalized = _REPEATED_VALUES_PATTERN.sub(r'\1, ...', normalized)
+    normalized = _PLACEHOLDERS_LIST_PATTERN.sub('(...)', normalized)
+    for operation, pattern in _OPERATION_TABLE_PATTERNS:
+        match = pattern.match(normalized)
+        if match:
+            return _QueryShape(normalized=normalized, table=match.group(1), operation=operation)
+    operation = normalized.split(' ', 1)[0].lower() if normalized else 'unknown'
+    return _QueryShape(normalized=normalized, table='', operation=operation)
+
+
+def _describe_params_shape(params: list | None) -> str:
+    if not params:
+        return '[]'
+    type_names = [type(param).__name__ for param in params[:20]]
+    if len(params) > 20:
+        type_names.append(f'... ({len(params)} params)')
+    return '[' + ', '.join(type_names) + ']'
+
+
+def _find_caller_frame() -> str:
+    """Find the closest stack frame calling the database layer"""
+    for frame in reversed(traceback.extract_stack()):
+        if not frame.filename.startswith(_DATABASE_PACKAGE_DIR) and 'contextlib' not in frame.filename:
+            return f'{frame.filename}:{frame.lineno} in {frame.name}'
+    return 'unknown'
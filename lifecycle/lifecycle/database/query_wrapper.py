@@ -1,12 +1,17 @@
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 from lifecycle.database.base_query_builder import BaseQueryBuilder
+from lifecycle.database.change_notifier import ChangeNotifier
+from lifecycle.database.query_cache import QueryCache, CompiledQuery
 
 from racetrack_client.log.logs import get_logger
 from lifecycle.database.base_engine import DbEngine
 
 logger = get_logger(__name__)
 
+# max number of parameters in a single bulk statement, staying below the limits of SQLite (32766) and PostgreSQL (65535)
+BULK_MAX_PARAMS = 30000
+
 
 class QueryWrapper:
     """
@@ -15,6 +20,8 @@ class QueryWrapper:
     def __init__(self, engine: DbEngine):
         self.engine: DbEngine = engine
         self.query_builder: BaseQueryBuilder = engine.query_builder
+        self.query_cache: QueryCache = QueryCache()
+        self.change_notifier: ChangeNotifier = ChangeNotifier(engine)
 
     def select_many(
         self,
@@ -27,17 +34,20 @@ class QueryWrapper:
         limit: int | None = None,
         offset: int | None = None,
     ) -> list[dict]:
-        query, params = self.query_builder.select(
-            table=table,
-            fields=fields,
-            join_expression=join_expression,
-            filter_conditions=filter_conditions,
-            filter_params=filter_params,
-            order_by=order_by,
-            limit=limit,
-            offset=offset,
-        )
-        return self.engine.execute_sql_fetch_all(query, params)
+        query = self._compile_select(table, fields, filter_conditions, join_expression, order_by, limit, offset)
+        return self.engine.execute_sql_fetch_all(query, _where_params(filter_conditions, filter_params))
+
+    def select_stream(
+        self,
+        table: str,
+        fields: list[str],
+        filter_conditions: list[str] | None = None,
+        filter_params: list[Any] | None = None,
+        order_by: list[str] | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[dict]:
+        query = self._compile_select(table, fields, filter_conditions, order_by=order_by)
+        return self.engine.execute_sql_stream(query, _where_params(filter_conditions, filter_params), batch_size)
 
     def select_one(
         self,
@@ -46,14 +56,8 @@ class QueryWrapper:
         filter_conditions: list[str],
         filter_params: list[Any],
     ) -> dict[str, Any] | None:
-        query, params = self.query_builder.select(
-            table=table,
-            fields=fields,
-            filter_conditions=filter_conditions,
-            filter_params=filter_params,
-            limit=1,
-        )
-        return self.engine.execute_sql_fetch_one(query, params)
+        query = self._compile_select(table, fields, filter_conditions, limit=1)
+        return self.engine.execute_sql_fetch_one(query, _where_params(filter_conditions, filter_params))
 
     def insert_one(
         self,
@@ -61,23 +65,67 @@ class QueryWrapper:
         data: dict[str, Any],
         primary_key_columns: list[str],
     ) -> dict[str, Any]:
-        query, params = self.query_builder.insert_one(
-            table=table, data=data, primary_key_columns=primary_key_columns
-        )
+        cache_key = ('insert_one', table, tuple(data.keys()), tuple(primary_key_columns))
+        query = self.query_cache.get_or_compile(cache_key, lambda: self.query_builder.compile(
+            self.query_builder.insert_one(table=table, data=data, primary_key_columns=primary_key_columns)[0]
+        ))
+        params = list(data.values())
         returning_row = self.engine.execute_sql_fetch_one(query, params)
         assert returning_row is not None, 'returning row is empty'
+        self.change_notifier.table_changed(table)
         return returning_row
 
+    def insert_many(
+        self,
+        table: str,
+        fields: list[str],
+        rows: list[list[Any]],
+        primary_key_columns: list[str],
+    ) -> list[dict[str, Any]]:
+        """Insert rows with multi-row statements, return primary keys of the inserted rows"""
+        returning_rows: list[dict[str, Any]] = []
+        for chunk in _chunk_rows(rows, len(fields)):
+            cache_key = ('insert_many', table, tuple(fields), tuple(primary_key_columns), len(chunk))
+            query = self.query_cache.get_or_compile(cache_key, lambda: self.query_builder.compile(
+                self.query_builder.insert_many(
+                    table=table, fields=fields, rows=chunk, primary_key_columns=primary_key_columns,
+                )[0]
+            ))
+            params = [value for row in chunk for value in row]
+            returning_rows.extend(self.engine.execute_sql_fetch_all(query, params))
+        self.change_notifier.table_changed(table)
+        return returning_rows
+
+    def upsert_many(
+        self,
+        table: str,
+        fields: list[str],
+        rows: list[list[Any]],
+        primary_key_column: str,
+    ) -> None:
+        """Insert rows with multi-row statements, updating the rows with conflicting primary key"""
+        for chunk in _chunk_rows(rows, len(fields)):
+            cache_key = ('upsert_many', table, tuple(fields), primary_key_column, len(chunk))
+            query = self.query_cache.get_or_compile(cache_key, lambda: self.query_builder.compile(
+                self.query_builder.upsert_many(
+                    table=table, fields=fields, rows=chunk, primary_key_column=primary_key_column,
+                )[0]
+            ))
+            params = [value for row in chunk for value in row]
+            self.engine.execute_sql(query, params)
+        self.change_notifier.table_changed(table)
+
     def count(
         self,
         table: str,
         filter_conditions: list[str] | None = None,
         filter_params: list[Any] | None = None,
     ) -> int:
-        query, params = self.query_builder.count(
-            table=table, filter_conditions=filter_conditions, filter_params=filter_params
-        )
-        row = self.engine.execute_sql_fetch_one(query, params)
+        cache_key = ('count', table, tuple(filter_conditions or []))
+        query = self.query_cache.get_or_compile(cache_key, lambda: self.query_builder.compile(
+            self.query_builder.count(table=table, filter_conditions=filter_conditions, filter_params=filter_params)[0]
+        ))
+        row = self.engine.execute_sql_fetch_one(query, _where_params(filter_conditions, filter_params))
         assert row is not None
         return row['count']
 
@@ -88,13 +136,9 @@ class QueryWrapper:
         filter_params: list[Any],
         new_data: dict[str, Any],
     ) -> None:
-        query, params = self.query_builder.update(
-            table=table,
-            filter_conditions=filter_conditions,
-            filter_params=filter_params,
-            new_data=new_data,
-        )
+        query, params = self._compile_update(table, filter_conditions, filter_params, new_data)
         self.engine.execute_sql(query, params, expected_affected_rows=1)
+        self.change_notifier.table_changed(table)
 
     def update_many(
         self,
@@ -103,13 +147,30 @@ class QueryWrapper:
         filter_params: list[Any],
         new_data: dict[str, Any],
     ) -> None:
-        query, params = self.query_builder.update(
-            table=table,
-            filter_conditions=filter_conditions,
-            filter_params=filter_params,
-            new_data=new_data,
-        )
+        query, params = self._compile_update(table, filter_conditions, filter_params, new_data)
         self.engine.execute_sql(query, params)
+        self.change_notifier.table_changed(table)
+
+    def update_batch(
+        self,
+        table: str,
+        filter_conditions: list[str],
+        fields: list[str],
+        params_list: list[list[Any]],
+        skip_missing: bool = False,
+        notify_change: bool = True,
+    ) -> None:
+        """
+        Update rows one by one with the same statement, sent to the database in a single batch
+        :param params_list: parameters of each update: values of the updated fields followed by filter parameters
+        :param skip_missing: don't require every update to affect a row
+        :param notify_change: invalidate the caches of the table. Skip it for bookkeeping columns no cache relies on
+        """
+        query, _ = self._compile_update(table, filter_conditions, [], dict.fromkeys(fields))
+        expected_affected_rows = -1 if skip_missing else len(params_list)
+        self.engine.execute_many(query, params_list, expected_affected_rows=expected_affected_rows)
+        if notify_change:
+            self.change_notifier.table_changed(table)
 
     def delete_one(
         self,
@@ -117,7 +178,75 @@ class QueryWrapper:
         filter_conditions: list[str] | None = None,
         filter_params: list[Any] | None = None,
     ) -> None:
-        query, params = self.query_builder.delete(
-            table=table, filter_conditions=filter_conditions, filter_params=filter_params
-        )
-        self.engine.execute_sql(query, params, expected_affected_rows=1)
+        cache_key = ('delete', table, tuple(filter_conditions or []))
+        query = self.query_cache.get_or_compile(cache_key, lambda: self.query_builder.compile(
+            self.query_builder.delete(table=table, filter_conditions=filter_conditions, filter_params=filter_params)[0]
+        ))
+        self.engine.execute_sql(query, _where_params(filter_conditions, filter_params), expected_affected_rows=1)
+        self.change_notifier.table_changed(table)
+
+    def delete_many(
+        self,
+        table: str,
+        filter_conditions: list[str],
+        filter_params: list[Any],
+    ) -> None:
+        cache_key = ('delete', table, tuple(filter_conditions))
+        query = self.query_cache.get_or_compile(cache_key, lambda: self.query_builder.compile(
+            self.query_builder.delete(table=table, filter_conditions=filter_conditions, filter_params=filter_params)[0]
+        ))
+        self.engine.execute_sql(query, _where_params(filter_conditions, filter_params))
+        self.change_notifier.table_changed(table)
+
+    def _compile_select(
+        self,
+        table: str,
+        fields: list[str],
+        filter_conditions: list[str] | None = None,
+        join_expression: str | None = None,
+        order_by: list[str] | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> CompiledQuery:
+        cache_key = ('select', table, tuple(fields), tuple(filter_conditions or []),
+                     join_expression, tuple(order_by or []), limit, offset)
+        return self.query_cache.get_or_compile(cache_key, lambda: self.query_builder.compile(
+            self.query_builder.select(
+                table=table,
+                fields=fields,
+                join_expression=join_expression,
+                filter_conditions=filter_conditions,
+                order_by=order_by,
+                limit=limit,
+                offset=offset,
+            )[0]
+        ))
+
+    def _compile_update(
+        self,
+        table: str,
+        filter_conditions: list[str],
+        filter_params: list[Any],
+        new_data: dict[str, Any],
+    ) -> tuple[CompiledQuery, list[Any]]:
+        cache_key = ('update', table, tuple(new_data.keys()), tuple(filter_conditions or []))
+        query = self.query_cache.get_or_compile(cache_key, lambda: self.query_builder.compile(
+            self.query_builder.update(
+                table=table, filter_conditions=filter_conditions, filter_params=filter_params, new_data=new_data,
+            )[0]
+        ))
+        params = list(new_data.values()) + _where_params(filter_conditions, filter_params)
+        return query, params
+
+
+def _where_params(filter_conditions: list[str] | None, filter_params: list[Any] | None) -> list[Any]:
+    """Query parameters placed in where clause, consistent with query builders"""
+    if not filter_conditions:
+        return []
+    return filter_params or []
+
+
+def _chunk_rows(rows: list[list[Any]], fields_num: int) -> Iterable[list[list[Any]]]:
+    chunk_size = max(1, BULK_MAX_PARAMS // max(1, fields_num))
+    for index in range(0, len(rows), chunk_size):
+        yield rows[index:index + chunk_size]
@@ -1,25 +1,34 @@
 from collections import defaultdict
-from typing import Any, Type, TypeVar
+from contextlib import AbstractContextManager
+from typing import Any, Iterator, Sequence, Type, TypeVar, get_args
+import base64
+import json
+import types
 
 from lifecycle.database.base_engine import DbEngine
+from lifecycle.database.change_notifier import ChangeNotifier
 from lifecycle.database.condition_builder import QueryCondition
-from lifecycle.database.query_wrapper import QueryWrapper
+from lifecycle.database.query_wrapper import QueryWrapper, BULK_MAX_PARAMS
 from racetrack_client.log.errors import EntityNotFound
 from racetrack_client.log.logs import get_logger
 from lifecycle.database.table_model import TableModel, table_type_name, \
-    get_primary_key_value, record_to_dict, table_metadata, create_empty_field
+    get_primary_key_value, table_metadata, create_empty_field, track_changes, get_changed_fields
 from lifecycle.database.schema.tables import all_tables
-from lifecycle.database.type_parser import parse_typed_object
+from lifecycle.database.type_parser import compile_dataclass_decoder
 
 
 logger = get_logger(__name__)
 
 T = TypeVar('T', bound=TableModel)
 
+# marks the list of origin primary keys in the planned cascade delete conditions
+ORIGIN_KEYS_PLACEHOLDER = '<origin_keys>'
+
 
 class RecordMapper:
     def __init__(self, engine: DbEngine):
         self.query_wrapper: QueryWrapper = QueryWrapper(engine)
+        self.change_notifier: ChangeNotifier = self.query_wrapper.change_notifier
         self.placeholder: str = engine.query_builder.placeholder()
         self._tables_metadata: dict[Type[TableModel], TableModel.Metadata] = {cls: table_metadata(cls) for cls in all_tables}
         self._table_name_to_class: dict[str, Type[TableModel]] = {
@@ -28,6 +37,16 @@ class RecordMapper:
         # cache to keep reverse dependencies for cascade delete: Origin table -> (dependant table, dependant column)
         self._delete_cascade_dependants: dict[Type[TableModel], list[tuple[Type[TableModel], str]]] = defaultdict(list)
         self._populate_delete_cascade_dependants()
+        # cache of planned cascade deletions: Origin table -> (dependant table, delete condition, origin key occurrences)
+        self._delete_cascade_plans: dict[Type[TableModel], list[tuple[Type[TableModel], str, int]]] = {}
+
+    def transaction(self) -> AbstractContextManager[None]:
+        """
+        Unit of work: run all operations issued within the context on a single connection
+        and commit them atomically. Changes are rolled back if an exception is raised.
+        Usage: `with mapper.transaction(): ...`
+        """
+        return self.query_wrapper.engine.transaction()
 
     def find_one(
         self,
@@ -61,12 +80,14 @@ class RecordMapper:
         self,
         table_type: Type[T],
         order_by: list[str] | None = None,
+        read_only: bool = False,
         **filter_kwargs: Any,
     ) -> list[T]:
         """
         Find multiple records based on the given filter criteria (exact match only)
         :param table_type: table model class
         :param order_by: list of columns to order by, for descending order prepend column name with '-'
+        :param read_only: skip tracking changes of the records, if they're not going to be updated
         :param filter_kwargs: key-value pairs of exact filter criteria
         :return: list of record objects
         """
@@ -80,7 +101,7 @@ class RecordMapper:
             filter_params=filter_params,
             order_by=order_by,
         )
-        return [self._convert_row_to_record_model(row, table_type) for row in rows]
+        return [self._convert_row_to_record_model(row, table_type, read_only) for row in rows]
     
     def filter(
         self,
@@ -89,6 +110,7 @@ class RecordMapper:
         join_expression: str | None = None,
         order_by: list[str] | None = None,
         limit: int | None = None,
+        read_only: bool = False,
     ) -> list[T]:
         """
         Filter by more sophisticated SQL condition (OR, AND, IS NULL, <, >= operators, etc.)
@@ -97,6 +119,7 @@ class RecordMapper:
         :param join_expression: SQL expression to append to FROM clause
         :param order_by: list of columns to order by, for descending order prepend column name with '-'
         :param limit: maximum number of records to return. None is no limit
+        :param read_only: skip tracking changes of the records, if they're not going to be updated
         :return: list of matching record objects
         """
         metadata = self._tables_metadata[table_type]
@@ -109,7 +132,102 @@ class RecordMapper:
             order_by=order_by,
             limit=limit,
         )
-        return [self._convert_row_to_record_model(row, table_type) for row in rows]
+        return [self._convert_row_to_record_model(row, table_type, read_only) for row in rows]
+
+    def stream(
+        self,
+        table_type: Type[T],
+        condition: QueryCondition | None = None,
+        order_by: list[str] | None = None,
+        batch_size: int = 1000,
+        read_only: bool = False,
+    ) -> Iterator[T]:
+        """
+        Iterate over the matching records, fetching them from a database in batches to keep memory bounded
+        :param table_type: table model class
+        :param condition: query condition containing SQL where clause text with query parameters. None to iterate over all records
+        :param order_by: list of columns to order by, for descending order prepend column name with '-'
+        :param batch_size: number of rows fetched from a database at once
+        :param read_only: skip tracking changes of the records, if they're not going to be updated
+        :return: iterator of record objects
+        """
+        metadata = self._tables_metadata[table_type]
+        condition = condition or QueryCondition.empty()
+        rows = self.query_wrapper.select_stream(
+            table=metadata.table_name,
+            fields=metadata.fields,
+            filter_conditions=condition.filter_conditions,
+            filter_params=condition.filter_params,
+            order_by=order_by,
+            batch_size=batch_size,
+        )
+        for row in rows:
+            yield self._convert_row_to_record_model(row, table_type, read_only)
+
+    def filter_dicts_page(
+        self,
+        table_type: Type[T],
+        limit: int,
+        cursor: str | None = None,
+        order_by: str | None = None,
+        columns: list[str] | None = None,
+        filters: dict[str, Any] | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """
+        Fetch a page of records using keyset pagination: seek the rows following the last one on the previous page.
+        Unlike offset, it doesn't scan all preceding rows, so the farther pages are as fast as the first one.
+        :param table_type: table model class
+        :param limit: maximum number of records on a page
+        :param cursor: opaque cursor pointing to the end of the previous page. None to fetch the first page
+        :param order_by: non-nullable (preferably indexed) column to order by, primary key by default.
+        For descending order prepend column name with '-'
+        :param columns: selective list of columns to retrieve. If None, all columns are returned
+        :param filters: key-value pairs of exact filter criteria
+        :return: list of records as column-value dictionaries and the cursor to the next page (None if it's the last page)
+        """
+        metadata = self._tables_metadata[table_type]
+        primary_key_column = metadata.primary_key_column
+        order_by = order_by or primary_key_column
+        descending = order_by.startswith('-')
+        order_column = order_by.removeprefix('-')
+        assert order_column in metadata.fields, f'ordered column {order_column} is not valid for the table {table_type}'
+        if types.NoneType in get_args(table_type.__annotations__[order_column]):
+            # keyset comparisons never match NULLs, so the pages would end prematurely
+            raise ValueError(f'can\'t paginate by nullable column {order_column}')
+        fields = columns or metadata.fields
+        assert not (set(fields) - set(metadata.fields)), f'columns {columns} are not valid for the table {table_type}'
+        query_fields = fields + [field for field in dict.fromkeys([order_column, primary_key_column]) if field not in fields]
+
+        filter_conditions, filter_params = self._build_filter_conditions(table_type, filters or {})
+        order_by_columns = [order_by]
+        if order_column != primary_key_column:
+            order_by_columns.append(('-' if descending else '') + primary_key_column)  # tie-breaker
+        if cursor:
+            last_order_value, last_primary_key = _decode_page_cursor(cursor)
+            operator = '<' if descending else '>'
+            if order_column == primary_key_column:
+                filter_conditions.append(f'{primary_key_column} {operator} {self.placeholder}')
+                filter_params.append(last_primary_key)
+            else:
+                filter_conditions.append(
+                    f'({order_column} {operator} {self.placeholder} or '
+                    f'({order_column} = {self.placeholder} and {primary_key_column} {operator} {self.placeholder}))'
+                )
+                filter_params.extend([last_order_value, last_order_value, last_primary_key])
+
+        rows = self.query_wrapper.select_many(
+            table=metadata.table_name,
+            fields=query_fields,
+            filter_conditions=filter_conditions,
+            filter_params=filter_params,
+            order_by=order_by_columns,
+            limit=limit + 1,  # peek if there is a next page
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_page_cursor(rows[-1][order_column], rows[-1][primary_key_column])
+        return [{field: row[field] for field in fields} for row in rows], next_cursor
 
     def filter_dicts(
         self,
@@ -150,12 +268,14 @@ class RecordMapper:
         table_type: Type[T],
         order_by: list[str] | None = None,
         limit: int | None = None,
+        read_only: bool = False,
     ) -> list[T]:
         """
         List all objects from a table
         :param table_type: table model class
         :param order_by: list of columns to order by, for descending order prepend column name with '-'
         :param limit: maximum number of records to return. None is no limit
+        :param read_only: skip tracking changes of the records, if they're not going to be updated
         :return: list of record objects
         """
         metadata = self._tables_metadata[table_type]
@@ -165,7 +285,7 @@ class RecordMapper:
             order_by=order_by,
             limit=limit,
         )
-        return [self._convert_row_to_record_model(row, table_type) for row in rows]
+        return [self._convert_row_to_record_model(row, table_type, read_only) for row in rows]
 
     def count(
         self,
@@ -263,6 +383,7 @@ class RecordMapper:
         )
         for primary_key, primary_value in returning_row.items():
             setattr(record_object, primary_key, primary_value)
+        track_changes(record_object)
 
     def create_from_dict(
         self,
@@ -307,7 +428,6 @@ class RecordMapper:
             update_data = self._extract_changed_data(record_object)
             if not update_data:
                 return
-            setattr(record_object, '_original_fields', record_to_dict(record_object))
         else:
             update_data = self._extract_record_data(record_object)
         self.query_wrapper.update_one(
@@ -316,6 +436,7 @@ class RecordMapper:
             filter_params=filter_params,
             new_data=update_data,
         )
+        track_changes(record_object)
 
     def update_from_dict(
         self,
@@ -336,6 +457,39 @@ class RecordMapper:
             new_data=update_data,
         )
 
+    def update_many_from_dict(
+        self,
+        table_type: Type[T],
+        updates: dict[Any, dict[str, Any]],
+        notify_change: bool = True,
+    ) -> None:
+        """
+        Update fields of multiple records by their primary keys, sending the statements in a single batch.
+        Records that no longer exist are skipped.
+        :param table_type: table model class
+        :param updates: mapping of primary key values to the new data of the records
+        :param notify_change: invalidate the caches of the table, e.g. on other Lifecycle instances
+        """
+        if not updates:
+            return
+        metadata = self._tables_metadata[table_type]
+        params_by_fields: dict[tuple[str, ...], list[list[Any]]] = defaultdict(list)
+        for primary_key_val, update_data in updates.items():
+            _validate_fields(update_data, metadata)
+            update_data = {field: value for field, value in update_data.items() if field != metadata.primary_key_column}
+            params_by_fields[tuple(update_data.keys())].append(list(update_data.values()) + [primary_key_val])
+
+        with self.transaction():
+            for fields, params_list in params_by_fields.items():
+                self.query_wrapper.update_batch(
+                    table=metadata.table_name,
+                    filter_conditions=[f'{metadata.primary_key_column} = {self.placeholder}'],
+                    fields=list(fields),
+                    params_list=params_list,
+                    skip_missing=True,
+                    notify_change=notify_change,
+                )
+
     def create_or_update(
         self,
         record_object: TableModel,
@@ -348,6 +502,109 @@ class RecordMapper:
         else:
             self.create(record_object)
 
+    def create_many(
+        self,
+        record_objects: Sequence[TableModel],
+    ) -> None:
+        """
+        Create multiple records of the same table with multi-row insert statements
+        :param record_objects: record objects to create, primary keys are assigned to them
+        """
+        if not record_objects:
+            return
+        metadata = self._tables_metadata[_common_table_type(record_objects)]
+        primary_key_column = metadata.primary_key_column
+        records_by_fields: dict[tuple[str, ...], list[tuple[TableModel, dict[str, Any]]]] = defaultdict(list)
+        for record_object in record_objects:
+            record_data = _supplement_primary_key(self._extract_record_data(record_object), metadata)
+            records_by_fields[tuple(record_data.keys())].append((record_object, record_data))
+
+        with self.transaction():
+            for fields, records in records_by_fields.items():
+                returning_rows = self.query_wrapper.insert_many(
+                    table=metadata.table_name,
+                    fields=list(fields),
+                    rows=[list(record_data.values()) for _, record_data in records],
+                    primary_key_columns=[primary_key_column],
+                )
+                if primary_key_column in fields:
+                    primary_keys = [record_data[primary_key_column] for _, record_data in records]
+                else:
+                    # keys generated by the database ascend in the order of inserted rows
+                    primary_keys = sorted(row[primary_key_column] for row in returning_rows)
+                for (record_object, _), primary_value in zip(records, primary_keys):
+                    setattr(record_object, primary_key_column, primary_value)
+        for record_object in record_objects:
+            track_changes(record_object)
+
+    def update_many(
+        self,
+        record_objects: Sequence[TableModel],
+        only_changed: bool = True,
+    ) -> None:
+        """
+        Update multiple records of the same table by their primary keys, sending the statements in a single batch
+        :param record_objects: record objects to update
+        :param only_changed: update only the fields that has been modified
+        """
+        if not record_objects:
+            return
+        metadata = self._tables_metadata[_common_table_type(record_objects)]
+        params_by_fields: dict[tuple[str, ...], list[list[Any]]] = defaultdict(list)
+        for record_object in record_objects:
+            if only_changed:
+                update_data = self._extract_changed_data(record_object)
+            else:
+                update_data = self._extract_record_data(record_object)
+            if update_data:
+                params = list(update_data.values()) + [get_primary_key_value(record_object)]
+                params_by_fields[tuple(update_data.keys())].append(params)
+
+        with self.transaction():
+            for fields, params_list in params_by_fields.items():
+                self.query_wrapper.update_batch(
+                    table=metadata.table_name,
+                    filter_conditions=[f'{metadata.primary_key_column} = {self.placeholder}'],
+                    fields=list(fields),
+                    params_list=params_list,
+                )
+        for record_object in record_objects:
+            track_changes(record_object)
+
+    def upsert_many(
+        self,
+        record_objects: Sequence[TableModel],
+    ) -> None:
+        """
+        Create multiple records of the same table or update the ones that already exist (by primary key)
+        :param record_objects: record objects to create or update
+        """
+        if not record_objects:
+            return
+        metadata = self._tables_metadata[_common_table_type(record_objects)]
+        upserted_rows: list[list[Any]] = []
+        new_records: list[TableModel] = []
+        fields: list[str] = metadata.fields
+        for record_object in record_objects:
+            record_data = _supplement_primary_key(self._extract_record_data(record_object), metadata)
+            if metadata.primary_key_column in record_data:
+                setattr(record_object, metadata.primary_key_column, record_data[metadata.primary_key_column])
+                upserted_rows.append([record_data[field] for field in fields])
+            else:
+                new_records.append(record_object)  # primary key is yet to be generated by the database
+
+        with self.transaction():
+            if upserted_rows:
+                self.query_wrapper.upsert_many(
+                    table=metadata.table_name,
+                    fields=fields,
+                    rows=upserted_rows,
+                    primary_key_column=metadata.primary_key_column,
+                )
+            self.create_many(new_records)
+        for record_object in record_objects:
+            track_changes(record_object)
+
     def delete(
         self,
         table_type: Type[T],
@@ -370,13 +627,40 @@ class RecordMapper:
         metadata = self._tables_metadata[type(record_object)]
         filter_kwargs = {metadata.primary_key_column: get_primary_key_value(record_object)}
         filter_conditions, filter_params = self._build_filter_conditions(type(record_object), filter_kwargs)
-        if cascade:
-            self._delete_cascade_dependencies(record_object)
-        self.query_wrapper.delete_one(
-            table=metadata.table_name,
-            filter_conditions=filter_conditions,
-            filter_params=filter_params,
-        )
+        with self.transaction():
+            if cascade:
+                self._delete_cascade_dependencies(type(record_object), [get_primary_key_value(record_object)])
+            self.query_wrapper.delete_one(
+                table=metadata.table_name,
+                filter_conditions=filter_conditions,
+                filter_params=filter_params,
+            )
+
+    def delete_many(
+        self,
+        table_type: Type[T],
+        primary_keys: Sequence[Any],
+        cascade: bool = True,
+    ) -> None:
+        """
+        Delete multiple records by their primary keys
+        :param table_type: table model class
+        :param primary_keys: primary key values of the records to delete
+        :param cascade: delete the records depending on the deleted ones
+        """
+        metadata = self._tables_metadata[table_type]
+        chunk_size = BULK_MAX_PARAMS
+        with self.transaction():
+            if cascade:
+                self._delete_cascade_dependencies(table_type, primary_keys)
+            for index in range(0, len(primary_keys), chunk_size):
+                chunk = list(primary_keys[index:index + chunk_size])
+                placeholders = ', '.join([self.placeholder] * len(chunk))
+                self.query_wrapper.delete_many(
+                    table=metadata.table_name,
+                    filter_conditions=[f'{metadata.primary_key_column} in ({placeholders})'],
+                    filter_params=chunk,
+                )
 
     def _build_filter_conditions(
         self,
@@ -393,18 +677,70 @@ class RecordMapper:
 
     def _delete_cascade_dependencies(
         self,
-        record_object: TableModel,
+        origin_table: Type[TableModel],
+        origin_primary_keys: Sequence[Any],
     ) -> None:
-        origin_primary_key = get_primary_key_value(record_object)
-        dependants: list[tuple[Type[TableModel], str]] = self._delete_cascade_dependants[type(record_object)]
-        for dep_table, dep_column in dependants:
-            filter_kwargs = {dep_column: origin_primary_key}
-            dep_records = self.find_many(dep_table, **filter_kwargs)
-            for dep_record in dep_records:
-                self.delete_record(dep_record, cascade=True)
-                dep_metadata = self._tables_metadata[type(dep_record)]
-                dep_record_info = f'{dep_metadata.primary_key_column} = {get_primary_key_value(dep_record)}'
-                logger.debug(f'Cascade delete on record {table_type_name(dep_record)} {dep_record_info}')
+        for dep_table, condition, key_occurrences in self._plan_delete_cascade(origin_table):
+            # every occurrence of the origin condition takes the whole chunk of keys
+            chunk_size = max(1, BULK_MAX_PARAMS // key_occurrences)
+            for index in range(0, len(origin_primary_keys), chunk_size):
+                chunk = list(origin_primary_keys[index:index + chunk_size])
+                placeholders = ', '.join([self.placeholder] * len(chunk))
+                self.query_wrapper.delete_many(
+                    table=self._tables_metadata[dep_table].table_name,
+                    filter_conditions=[condition.replace(ORIGIN_KEYS_PLACEHOLDER, placeholders)],
+                    filter_params=chunk * key_occurrences,
+                )
+            logger.debug(f'Cascade delete on {table_type_name(dep_table)} records depending on '
+                         f'{len(origin_primary_keys)} {table_type_name(origin_table)} records')
+
+    def _plan_delete_cascade(
+        self,
+        origin_table: Type[TableModel],
+    ) -> list[tuple[Type[TableModel], str, int]]:
+        """
+        Walk the foreign-key graph once and plan a single DELETE statement per each dependant table.
+        Dependants are matched with nested subqueries leading to the origin records,
+        and they're ordered so that they're deleted before the records they depend on.
+        :return: list of (dependant table, delete condition, number of origin key lists in a condition).
+        ORIGIN_KEYS_PLACEHOLDER in a condition has to be replaced with the placeholders of the origin keys.
+        """
+        if origin_table in self._delete_cascade_plans:
+            return self._delete_cascade_plans[origin_table]
+
+        dependants_first: list[Type[TableModel]] = []
+        visited: set[Type[TableModel]] = set()
+
+        def visit(table_type: Type[TableModel]):
+            if table_type in visited:
+                return
+            visited.add(table_type)
+            for dep_table, _ in self._delete_cascade_dependants[table_type]:
+                visit(dep_table)
+            dependants_first.append(table_type)
+
+        visit(origin_table)
+
+        origin_metadata = self._tables_metadata[origin_table]
+        conditions: dict[Type[TableModel], tuple[str, int]] = {
+            origin_table: (f'{origin_metadata.primary_key_column} in ({ORIGIN_KEYS_PLACEHOLDER})', 1),
+        }
+        for dep_table in reversed(dependants_first[:-1]):
+            dep_conditions: list[str] = []
+            key_occurrences = 0
+            for dep_column, parent_table in self._tables_metadata[dep_table].on_delete_cascade.items():
+                if parent_table not in conditions:
+                    continue
+                parent_metadata = self._tables_metadata[parent_table]
+                parent_condition, parent_occurrences = conditions[parent_table]
+                dep_conditions.append(f'{dep_column} in (select {parent_metadata.primary_key_column} '
+                                      f'from {parent_metadata.table_name} where {parent_condition})')
+                key_occurrences += parent_occurrences
+            conditions[dep_table] = ('(' + ' or '.join(dep_conditions) + ')', key_occurrences)
+
+        plan = [(dep_table, *conditions[dep_table]) for dep_table in dependants_first[:-1]]
+        self._delete_cascade_plans[origin_table] = plan
+        return plan
 
     def _populate_delete_cascade_dependants(self):
         if self._delete_cascade_dependants:
@@ -442,15 +778,11 @@ class RecordMapper:
         self,
         row: dict[str, Any],
         table_type: Type[T],
+        read_only: bool = False,
     ) -> T:
-        valid_fields = self._tables_metadata[table_type].fields
-        for column in row.keys():
-            assert column in valid_fields, \
-                f'retrieved column "{column}" is not a valid field for the model {table_type_name(table_type)}'
-        record_model = parse_typed_object(row, table_type)
-
-        # remember original values to keep track of changed fields
-        setattr(record_model, '_original_fields', record_to_dict(record_model))
+        record_model = compile_dataclass_decoder(table_type)(row)
+        if not read_only:
+            track_changes(record_model)
         return record_model
 
     def _extract_record_data(self, record_model: TableModel) -> dict[str, Any]:
@@ -464,18 +796,14 @@ class RecordMapper:
         return data
 
     def _extract_changed_data(self, record_model: TableModel) -> dict[str, Any]:
-        """Compare with original data and return only the fields that has been modified"""
-        originals: dict[str, Any] = getattr(record_model, '_original_fields', {})
-        new_data = self._extract_record_data(record_model)
-        if not originals:
-            logger.warning(f'could not read original fields from record {table_type_name(record_model)}')
-            return new_data
-
-        changed_data = {}
-        for field, new_value in new_data.items():
-            if field not in originals or new_value != originals.get(field):
-                changed_data[field] = new_value
-        return changed_data
+        """Return only the fields that has been modified since the record was loaded"""
+        changed_fields: set[str] | None = get_changed_fields(record_model)
+        if changed_fields is None:
+            logger.warning(f'changes are not tracked on record {table_type_name(record_model)}')
+            return self._extract_record_data(record_model)
+
+        fields: list[str] = self._tables_metadata[type(record_model)].fields
+        return {field: getattr(record_model, field) for field in fields if field in changed_fields}
 
     def _create_mock_record_model(self, table_type: Type[T], row_fields: dict[str, Any]) -> TableModel:
         missing_fields = set(self._tables_metadata[table_type].fields) - set(row_fields.keys())
@@ -497,6 +825,25 @@ def _supplement_primary_key(record_data: dict[str, Any], metadata: TableModel.Me
     return record_data
 
 
+def _encode_page_cursor(last_order_value: Any, last_primary_key: Any) -> str:
+    cursor_json = json.dumps([last_order_value, last_primary_key], default=str)
+    return base64.urlsafe_b64encode(cursor_json.encode()).decode()
+
+
+def _decode_page_cursor(cursor: str) -> tuple[Any, Any]:
+    try:
+        last_order_value, last_primary_key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f'invalid page cursor: {cursor}') from e
+    return last_order_value, last_primary_key
+
+
+def _common_table_type(record_objects: Sequence[TableModel]) -> Type[TableModel]:
+    table_types = {type(record_object) for record_object in record_objects}
+    assert len(table_types) == 1, f'records should belong to a single table, got {len(table_types)} tables'
+    return table_types.pop()
+
+
 def _validate_fields(record_data: dict[str, Any], metadata: TableModel.Metadata):
     invalid_fields = record_data.keys() - set(metadata.fields)
     assert not invalid_fields, f'fields {sorted(invalid_fields)} are not valid columns'
@@ -1,9 +1,11 @@
 from datetime import datetime
+from functools import lru_cache
 
 from lifecycle.database.type_parser import parse_json_column
 from lifecycle.server.cache import LifecycleCache
 from racetrack_client.manifest.load import parse_manifest_or_empty
 from racetrack_client.utils.time import datetime_to_timestamp
+from racetrack_client.manifest.manifest import Manifest
 from racetrack_commons.entities.dto import JobDto, JobFamilyDto, DeploymentDto, AuditLogEventDto, PublicEndpointRequestDto, EscDto, AsyncJobCallDto
 from lifecycle.config import Config
 from lifecycle.job.pub import get_job_pub_url
@@ -25,7 +27,7 @@ def job_record_to_dto(model: tables.Job, config: Config) -> JobDto:
         status=model.status,
         create_time=datetime_to_timestamp(model.create_time),
         update_time=datetime_to_timestamp(model.update_time),
-        manifest=parse_manifest_or_empty(model.manifest),
+        manifest=parse_cached_manifest(model.manifest),
         manifest_yaml=model.manifest,
         internal_name=model.internal_name,
         pub_url=get_job_pub_url(model.name, model.version, config),
@@ -41,6 +43,15 @@ def job_record_to_dto(model: tables.Job, config: Config) -> JobDto:
     )
 
 
+@lru_cache(maxsize=4096)
+def parse_cached_manifest(manifest_yaml: str | None) -> Manifest | None:
+    """
+    Parse YAML string as Manifest, memoized by the content, since manifests of the jobs rarely change.
+    Returned object is shared, don't modify it.
+    """
+    return parse_manifest_or_empty(manifest_yaml)
+
+
 def deployment_record_to_dto(model: tables.Deployment) -> DeploymentDto:
     return DeploymentDto(
         id=model.id,
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Callable
 
-from lifecycle.database.table_model import TableModel, new_uuid
+from lifecycle.database.table_model import TableModel, new_uuid, register_table_models
 
 
 @dataclass
@@ -359,3 +359,5 @@ all_tables: list[type[TableModel]] = [
     Setting,
     AsyncJobCall,
 ]
+
+register_table_models(all_tables)
@@ -1,43 +1,107 @@
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable, Iterator
+import itertools
+import queue
 import sqlite3
+import threading
+import time
 import os
 
 from racetrack_client.log.errors import AlreadyExists
 from racetrack_client.log.logs import get_logger
 from lifecycle.database.base_engine import DbEngine, check_affected_rows, DatabaseStatus
 from lifecycle.database.sqlite.query_builder import QueryBuilder
+from lifecycle.database.query_stats import QueryStats
+from lifecycle.server.metrics import metric_database_pool_wait_duration
 
 logger = get_logger(__name__)
 
 DB_PATH: str = os.environ.get('DB_PATH', 'lifecycle/django/db.sqlite3')
 
+_memory_database_ids = itertools.count()
+
 
 class SQLiteEngine(DbEngine):
 
-    def __init__(self, copy: bool = True, log_queries: bool = True) -> None:
+    def __init__(
+        self,
+        copy: bool = True,
+        log_queries: bool = True,
+        slow_query_threshold: float = 0,
+        wal_mode: bool = False,
+        reader_pool_size: int = 4,
+        busy_timeout: float = 5,
+    ) -> None:
+        """
+        :param copy: whether to work on the in-memory copy of the local database instead of the file
+        :param wal_mode: whether to use one writer connection and a pool of reader connections,
+            so reads don't wait for the writes. The database file is switched to Write-Ahead Logging journal.
+            In-memory copy is shared between the connections by the shared cache.
+        :param reader_pool_size: number of reader connections in WAL mode
+        :param busy_timeout: maximum number of seconds to wait for a lock held by another connection
+        """
         super().__init__()
         if copy:
             logger.info(f'Using in-memory copy of local SQLite database: {DB_PATH}')
         else:
             logger.info(f'Using local SQLite database: {DB_PATH}')
 
-        self.connection: sqlite3.Connection
+        self.busy_timeout: float = busy_timeout
+        # In-memory database is private to its connection, unless it's named and opened in shared-cache mode.
+        # Shared cache locks tables instead of keeping snapshots, and these locks don't respect busy timeout
+        self._shared_cache: bool = copy and wal_mode
+        self._database_uri: str
+        if not copy:
+            self._database_uri = DB_PATH
+        elif wal_mode:
+            self._database_uri = f'file:lifecycle_memory_{next(_memory_database_ids)}?mode=memory&cache=shared'
+        else:
+            self._database_uri = ':memory:'
+
+        # writer connection, it keeps the shared in-memory database alive as long as it's open
+        self.connection: sqlite3.Connection = self._connect()
         if copy:
             src_database: sqlite3.Connection = sqlite3.connect(DB_PATH)
-            self.connection = sqlite3.connect(':memory:', check_same_thread=False)
             src_query = ''.join(line for line in src_database.iterdump())
             self.connection.executescript(src_query)
             src_database.close()
-        else:
-            self.connection = sqlite3.connect(DB_PATH, check_same_thread=False)
+        elif wal_mode:
+            self.connection.execute('pragma journal_mode = wal')
+            # in WAL mode, syncing on every commit is not needed to keep the database consistent
+            self.connection.execute('pragma synchronous = normal')
+
+        self._readers: queue.Queue[sqlite3.Connection] | None = None
+        if wal_mode:
+            self._readers = queue.Queue()
+            for _ in range(reader_pool_size):
+                reader = self._connect()
+                reader.execute('pragma query_only = 1')
+                self._readers.put(reader)
+
         self.query_builder: QueryBuilder = QueryBuilder()
         self.log_queries: bool = log_queries
-        self._database_status: DatabaseStatus = DatabaseStatus(connected=True, pool_size=1)
+        self.query_stats: QueryStats = QueryStats(slow_query_threshold)
+        pool_size = 1 + reader_pool_size if wal_mode else 1
+        self._database_status: DatabaseStatus = DatabaseStatus(connected=True, pool_size=pool_size)
         self._last_query: str | None = None
+        # writer connection is shared between threads, transaction holds the lock until it's finished
+        self._lock = threading.RLock()
+        self._transaction_depth: int = 0
+        self._transaction_thread: int | None = None
+        self._after_commit_callbacks: list[Callable[[], None]] = []
 
         sqlite3.register_adapter(datetime, _adapt_datetime)
 
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(
+            self._database_uri,
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=self.busy_timeout,
+            uri=self._database_uri.startswith('file:'),
+        )
+
     def check_connection(self) -> None:
         try:
             self.connection.execute('select 1')
@@ -48,39 +112,223 @@ class SQLiteEngine(DbEngine):
             self._database_status.connected = True
 
     def close(self):
+        if self._readers is not None:
+            while not self._readers.empty():
+                self._readers.get_nowait().close()
         self.connection.close()
         self._database_status.connected = False
 
     def database_status(self) -> DatabaseStatus:
+        if self._readers is not None:
+            self._database_status.pool_available = self._readers.qsize()
         return self._database_status
 
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        with self._lock:
+            if self._transaction_depth > 0:
+                self._transaction_depth += 1
+                try:
+                    yield  # join the outer transaction
+                finally:
+                    self._transaction_depth -= 1
+                return
+
+            self.connection.execute('begin')
+            self._transaction_depth = 1
+            self._transaction_thread = threading.get_ident()
+            self._after_commit_callbacks = []
+            try:
+                yield
+            except BaseException:
+                self.connection.rollback()
+                raise
+            else:
+                try:
+                    self.connection.commit()
+                except sqlite3.IntegrityError as e:
+                    raise AlreadyExists(str(e)) from e
+            finally:
+                self._transaction_depth = 0
+                self._transaction_thread = None
+                callbacks, self._after_commit_callbacks = self._after_commit_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def in_transaction(self) -> bool:
+        return self._owns_transaction()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        if self._owns_transaction():
+            self._after_commit_callbacks.append(callback)
+        else:
+            callback()
+
+    def watch_changes(
+        self,
+        channel: str,
+        on_listening: Callable[[], None],
+        on_change: Callable[[str | None], None],
+        poll_interval: float,
+    ) -> None:
+        # data version of the writer connection changes only when other connections commit to the database file
+        last_version = self.execute_sql_fetch_one('pragma data_version')['data_version']
+        on_listening()
+        while True:
+            time.sleep(poll_interval)
+            version = self.execute_sql_fetch_one('pragma data_version')['data_version']
+            if version != last_version:
+                on_change(None)
+                last_version = version
+
     def execute_sql(
         self,
         query: str,
         params: list | None = None,
         expected_affected_rows: int = -1,
     ) -> None:
-        cursor: sqlite3.Cursor = self.connection.cursor()
+        with self._lock:
+            self._execute_sql(self.connection, query, params, expected_affected_rows)
+
+    def execute_many(
+        self,
+        query: str,
+        params_list: list[list],
+        expected_affected_rows: int = -1,
+    ) -> None:
+        with self._lock:
+            cursor: sqlite3.Cursor = self.connection.cursor()
+            try:
+                try:
+                    self._execute_cursor(cursor, query, params_list, many=True)
+                except sqlite3.IntegrityError as e:
+                    raise AlreadyExists(str(e)) from e
+                check_affected_rows(expected_affected_rows, cursor.rowcount)
+            finally:
+                cursor.close()
+
+    def execute_sql_fetch_one(
+        self,
+        query: str,
+        params: list | None = None,
+    ) -> dict[str, Any] | None:
+        with self._query_connection(query) as connection:
+            return self._execute_sql_fetch_one(connection, query, params)
+
+    def execute_sql_fetch_all(self, query: str, params: list | None = None) -> list[dict]:
+        with self._query_connection(query) as connection:
+            return self._execute_sql_fetch_all(connection, query, params)
+
+    def execute_sql_stream(self, query: str, params: list | None = None, batch_size: int = 1000) -> Iterator[dict]:
+        if self._readers is not None and not self._shared_cache and not self._owns_transaction() \
+                and _is_read_only(query):
+            # reader connection keeps a consistent snapshot of WAL database until the stream is finished
+            with self._reader_connection() as connection:
+                cursor: sqlite3.Cursor = connection.cursor()
+                try:
+                    self._execute_cursor(cursor, query, params)
+                    assert cursor.description, 'no column names in the result'
+                    col_names = [desc[0] for desc in cursor.description]
+                    while rows := cursor.fetchmany(batch_size):
+                        for row in rows:
+                            yield dict(zip(col_names, row))
+                finally:
+                    cursor.close()
+            return
+
+        # the lock is released between batches, so the stream doesn't block other queries
+        with self._lock:
+            cursor = self.connection.cursor()
+            self._execute_cursor(cursor, query, params)
+            assert cursor.description, 'no column names in the result'
+            col_names = [desc[0] for desc in cursor.description]
+        try:
+            while True:
+                with self._lock:
+                    rows: list = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(zip(col_names, row))
+        finally:
+            cursor.close()
+
+    @contextmanager
+    def _query_connection(self, query: str) -> Iterator[sqlite3.Connection]:
+        """
+        Lend a connection for the query: one of the reader connections for read-only queries in WAL mode,
+        or the writer connection for modifying queries (e.g. insert with returning clause)
+        and to see the changes made by the ongoing transaction of the current thread
+        """
+        if self._readers is None or not _is_read_only(query) or self._owns_transaction():
+            with self._lock:
+                yield self.connection
+        else:
+            with self._reader_connection() as connection:
+                yield connection
+
+    @contextmanager
+    def _reader_connection(self) -> Iterator[sqlite3.Connection]:
+        assert self._readers is not None
+        start_time = time.perf_counter()
+        connection = self._readers.get()
+        metric_database_pool_wait_duration.observe(time.perf_counter() - start_time)
+        try:
+            yield connection
+        finally:
+            self._readers.put(connection)
+
+    def _owns_transaction(self) -> bool:
+        return self._transaction_thread == threading.get_ident()
+
+    def _execute_cursor(self, cursor: sqlite3.Cursor, query: str, params: list | None, many: bool = False) -> None:
+        self._log_query(query)
+        start_time = time.perf_counter()
+        delay = 0.001
+        while True:
+            try:
+                if many:
+                    cursor.executemany(query, params or [])
+                else:
+                    cursor.execute(query, params or [])
+                break
+            except sqlite3.OperationalError as e:
+                # busy timeout doesn't apply to table locks of shared cache, wait for them the same way
+                if not self._shared_cache or not _is_table_locked(e) \
+                        or time.perf_counter() - start_time + delay > self.busy_timeout:
+                    raise
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+        stats_params = (params[0] if params else None) if many else params
+        self.query_stats.observe(query, stats_params, time.perf_counter() - start_time)
+
+    def _execute_sql(
+        self,
+        connection: sqlite3.Connection,
+        query: str,
+        params: list | None = None,
+        expected_affected_rows: int = -1,
+    ) -> None:
+        cursor: sqlite3.Cursor = connection.cursor()
         try:
-            self._log_query(query)
             try:
-                cursor.execute(query, params or [])
+                self._execute_cursor(cursor, query, params)
             except sqlite3.IntegrityError as e:
                 raise AlreadyExists(str(e)) from e
             check_affected_rows(expected_affected_rows, cursor.rowcount)
         finally:
             cursor.close()
 
-    def execute_sql_fetch_one(
+    def _execute_sql_fetch_one(
         self,
+        connection: sqlite3.Connection,
         query: str,
         params: list | None = None,
     ) -> dict[str, Any] | None:
-        cursor: sqlite3.Cursor = self.connection.cursor()
+        cursor: sqlite3.Cursor = connection.cursor()
         try:
-            self._log_query(query)
             try:
-                cursor.execute(query, params or [])
+                self._execute_cursor(cursor, query, params)
             except sqlite3.IntegrityError as e:
                 raise AlreadyExists(str(e)) from e
             row = cursor.fetchone()
@@ -92,11 +340,13 @@ class SQLiteEngine(DbEngine):
         finally:
             cursor.close()
 
-    def execute_sql_fetch_all(self, query: str, params: list | None = None) -> list[dict]:
-        cursor: sqlite3.Cursor = self.connection.cursor()
+    def _execute_sql_fetch_all(self, connection: sqlite3.Connection, query: str, params: list | None = None) -> list[dict]:
+        cursor: sqlite3.Cursor = connection.cursor()
         try:
-            self._log_query(query)
-            cursor.execute(query, params or [])
+            try:
+                self._execute_cursor(cursor, query, params)
+            except sqlite3.IntegrityError as e:
+                raise AlreadyExists(str(e)) from e
             rows: list = cursor.fetchall()
             assert cursor.description, 'no column names in the result'
             col_names = [desc[0] for desc in cursor.description]
@@ -115,5 +365,13 @@ class SQLiteEngine(DbEngine):
             logger.debug(f'SQL query: {query}')
 
 
+def _is_read_only(query: str) -> bool:
+    return query.lstrip()[:6].lower() == 'select'
+
+
+def _is_table_locked(e: sqlite3.OperationalError) -> bool:
+    return str(e).startswith(('database table is locked', 'database schema is locked'))
+
+
 def _adapt_datetime(dt):
     return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
@@ -67,6 +67,40 @@ class QueryBuilder(BaseQueryBuilder):
         params = list(data.values())
         return query, params
 
+    def insert_many(
+        self,
+        table: str,
+        fields: list[str],
+        rows: list[list[Any]],
+        primary_key_columns: list[str],
+    ) -> QueryWithParams:
+        fields_joined = ', '.join(fields)
+        row_values = '(' + ', '.join('?' * len(fields)) + ')'
+        values_joined = ', '.join([row_values] * len(rows))
+        returning_fields = ', '.join(primary_key_columns)
+        query = f'insert into {table} ({fields_joined}) values {values_joined} returning {returning_fields}'
+        params = [value for row in rows for value in row]
+        return query, params
+
+    def upsert_many(
+        self,
+        table: str,
+        fields: list[str],
+        rows: list[list[Any]],
+        primary_key_column: str,
+    ) -> QueryWithParams:
+        fields_joined = ', '.join(fields)
+        row_values = '(' + ', '.join('?' * len(fields)) + ')'
+        values_joined = ', '.join([row_values] * len(rows))
+        query = f'insert into {table} ({fields_joined}) values {values_joined} on conflict ({primary_key_column})'
+        updated_fields = [field for field in fields if field != primary_key_column]
+        if updated_fields:
+            query += ' do update set ' + ', '.join([f'{field} = excluded.{field}' for field in updated_fields])
+        else:
+            query += ' do nothing'
+        params = [value for row in rows for value in row]
+        return query, params
+
     def update(
         self,
         table: str,
@@ -2,6 +2,7 @@ from abc import ABC
 from dataclasses import asdict, is_dataclass
 from datetime import datetime
 from enum import Enum
+from operator import attrgetter
 from typing import Any, Type, Callable
 import uuid
 
@@ -42,6 +43,15 @@ class TableModel(ABC):
         # Attributes evaluated at runtime:
         fields: list[str]
         column_types: dict[str, ColumnType]
+        primary_key_getter: Callable[['TableModel'], Any]
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # keep track of modified fields (if enabled) to update only the changed columns
+        changed_fields: set[str] | None = self.__dict__.get('_changed_fields')
+        if changed_fields is not None and name not in changed_fields:
+            if name not in self.__dict__ or self.__dict__[name] != value:
+                changed_fields.add(name)
+        object.__setattr__(self, name, value)
 
 
 def table_type_name(cls: Type[TableModel] | TableModel) -> str:
@@ -50,9 +60,26 @@ def table_type_name(cls: Type[TableModel] | TableModel) -> str:
     return cls.__name__
 
 
+# metadata of the table classes, evaluated once per class
+_metadata_registry: dict[Type[TableModel], TableModel.Metadata] = {}
+
+
 def table_metadata(cls: Type[TableModel] | TableModel) -> TableModel.Metadata:
     if isinstance(cls, TableModel):
         cls = type(cls)
+    metadata = _metadata_registry.get(cls)
+    if metadata is None:
+        metadata = _metadata_registry[cls] = _build_table_metadata(cls)
+    return metadata
+
+
+def register_table_models(table_types: list[Type[TableModel]]) -> None:
+    """Evaluate metadata of the table classes up front"""
+    for table_type in table_types:
+        table_metadata(table_type)
+
+
+def _build_table_metadata(cls: Type[TableModel]) -> TableModel.Metadata:
     metadata: TableModel.Metadata = getattr(cls, 'Metadata', None)
     assert metadata is not None, f'Metadata class not specified in {cls}'
 
@@ -73,16 +100,27 @@ def table_metadata(cls: Type[TableModel] | TableModel) -> TableModel.Metadata:
     metadata.main_columns = getattr(metadata, 'main_columns', [])
     metadata.name_columns = getattr(metadata, 'name_columns', [])
     metadata.primary_key_generator = getattr(metadata, 'primary_key_generator', None)
+    metadata.primary_key_getter = attrgetter(primary_key_column)
     return metadata
 
 
 def get_primary_key_value(self: TableModel) -> Any:
     """Return the value of the primary key field"""
     metadata = table_metadata(self)
-    column = metadata.primary_key_column
-    if not hasattr(self, column):
-        raise ValueError(f'record has no primary key field {column}')
-    return getattr(self, column, None)
+    try:
+        return metadata.primary_key_getter(self)
+    except AttributeError:
+        raise ValueError(f'record has no primary key field {metadata.primary_key_column}')
+
+
+def track_changes(self: TableModel) -> None:
+    """Start tracking modified fields of the record, forgetting the previous changes"""
+    object.__setattr__(self, '_changed_fields', set())
+
+
+def get_changed_fields(self: TableModel) -> set[str] | None:
+    """Return names of the fields modified since the tracking has started or None if changes are not tracked"""
+    return self.__dict__.get('_changed_fields')
 
 
 def record_to_dict(self: TableModel) -> dict[str, Any]:
@@ -1,8 +1,9 @@
 import dataclasses
+import functools
 import json
 from datetime import datetime, timezone
 from dateutil import parser as dt_parser
-from typing import Type, TypeVar, Union, Any, get_origin, get_args
+from typing import Callable, Type, TypeVar, Union, Any, get_origin, get_args
 import types
 
 from racetrack_client.log.context_error import ContextError
@@ -61,6 +62,65 @@ def parse_typed_object(obj: Any, clazz: Type[T]) -> T:
             raise ValueError(f'failed to parse "{obj}" ({type(obj)}) to type {clazz}: {e}')
 
 
+@functools.cache
+def compile_dataclass_decoder(clazz: Type[T]) -> Callable[[dict[str, Any]], T]:
+    """
+    Build a decoder function specialized for a dataclass, turning a dictionary (e.g. database row) into its object.
+    Field types are resolved once, at first use, so the decoding doesn't inspect them for every object.
+    The result is equivalent to `parse_typed_object(obj, clazz)`.
+    """
+    assert dataclasses.is_dataclass(clazz), f'expected dataclass type to compile a decoder, got {clazz}'
+    field_parsers: dict[str, Callable[[Any], Any]] = {
+        field.name: _compile_type_parser(field.type) for field in dataclasses.fields(clazz)
+    }
+
+    def decode(obj: dict[str, Any]) -> T:
+        dataclass_kwargs = dict()
+        for key, value in obj.items():
+            field_parser = field_parsers.get(key)
+            if field_parser is None:
+                raise KeyError(f'unexpected field "{key}" provided to type {clazz}')
+            dataclass_kwargs[key] = field_parser(value)
+        return clazz(**dataclass_kwargs)
+
+    return decode
+
+
+def _compile_type_parser(clazz: Any) -> Callable[[Any], Any]:
+    """Resolve a function casting a value to the expected type, falling back to generic parser for complex types"""
+    if get_origin(clazz) in {Union, types.UnionType}:
+        union_types = get_args(clazz)
+        left_types = [t for t in union_types if t is not types.NoneType]
+        if len(left_types) == 1 and not dataclasses.is_dataclass(left_types[0]):
+            return _compile_type_parser(left_types[0])  # Optional type, None is handled by every parser
+
+    elif clazz is datetime:
+        return _parse_datetime
+
+    elif isinstance(clazz, type) and get_origin(clazz) is None and not dataclasses.is_dataclass(clazz):
+        def parse_simple_type(obj: Any) -> Any:
+            if obj is None or isinstance(obj, clazz):
+                return obj
+            try:
+                return clazz(obj)
+            except BaseException as e:
+                raise ValueError(f'failed to parse "{obj}" ({type(obj)}) to type {clazz}: {e}')
+        return parse_simple_type
+
+    return lambda obj: parse_typed_object(obj, clazz)
+
+
+def _parse_datetime(obj: Any) -> datetime | None:
+    if type(obj) is str:
+        try:
+            return datetime.fromisoformat(obj).replace(tzinfo=timezone.utc)
+        except ValueError:
+            return dt_parser.parse(obj).replace(tzinfo=timezone.utc)
+    if obj is None or isinstance(obj, datetime):
+        return obj
+    return parse_typed_object(obj, datetime)
+
+
 def parse_dict_typed_values(data: dict[str, Any], clazz: Type[T]) -> dict[str, Any]:
     """
     Cast dictionary values to the expected types, matching the field annotations from a dataclass
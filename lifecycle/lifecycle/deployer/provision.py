@@ -1,4 +1,4 @@
-from lifecycle.auth.authorize import grant_permission
+from lifecycle.auth.authorize import grant_permissions
 from lifecycle.config import Config
 from lifecycle.config.maintenance import ensure_no_maintenance
 from lifecycle.database.schema import tables
@@ -10,6 +10,7 @@ from lifecycle.job.deployment import save_deployment_phase
 from lifecycle.job.models_registry import create_job_family_if_not_exist, save_job_model, update_job, delete_job_model
 from lifecycle.job.public_endpoints import create_job_public_endpoint_if_not_exist
 from lifecycle.monitor.monitors import check_job_condition
+from lifecycle.server.cache import LifecycleCache
 from lifecycle.server.metrics import metric_deployed_job
 from racetrack_client.client.env import merge_env_vars
 from racetrack_client.log.context_error import wrap_context
@@ -142,12 +143,25 @@ def post_job_deploy(
     """Supplementary actions invoked after job is deployed"""
     plugin_engine.invoke_plugin_hook(PluginCore.post_job_deploy, manifest, job, image_name, deployer_username=deployment.deployed_by)
 
+    with LifecycleCache.record_mapper().transaction():
+        _save_post_deploy_records(manifest, job, deployment, auth_subject, previous_job)
+
+
+def _save_post_deploy_records(
+    manifest: Manifest,
+    job: JobDto,
+    deployment: DeploymentDto,
+    auth_subject: tables.AuthSubject | None,
+    previous_job: JobDto | None,
+):
     if auth_subject is not None and previous_job is None:
         with wrap_context('granting permissions'):
-            grant_permission(auth_subject, job.name, job.version, AuthScope.READ_JOB.value)
-            grant_permission(auth_subject, job.name, job.version, AuthScope.CALL_JOB.value)
-            grant_permission(auth_subject, job.name, job.version, AuthScope.DEPLOY_JOB.value)
-            grant_permission(auth_subject, job.name, job.version, AuthScope.DELETE_JOB.value)
+            grant_permissions(auth_subject, job.name, job.version, [
+                AuthScope.READ_JOB.value,
+                AuthScope.CALL_JOB.value,
+                AuthScope.DEPLOY_JOB.value,
+                AuthScope.DELETE_JOB.value,
+            ])
 
     with wrap_context('registering public endpoint requests'):
         if manifest.public_endpoints:
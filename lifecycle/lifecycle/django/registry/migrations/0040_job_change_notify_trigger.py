@@ -0,0 +1,46 @@
+from django.db import migrations
+
+# Notifies Lifecycle instances about the writes to the jobs table made by any process,
+# on the same channel as the change notifications sent by Lifecycle itself.
+# Payload contains the ID of the Lifecycle instance that made the change (taken from its session setting),
+# so that it's ignored by the author only. Writes of other processes come with an empty ID.
+CREATE_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION lifecycle_notify_table_change() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('lifecycle_changes',
+        coalesce(current_setting('lifecycle.instance_id', true), '') || ':' || TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS registry_job_notify_change ON registry_job;
+CREATE TRIGGER registry_job_notify_change
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON registry_job
+    FOR EACH STATEMENT EXECUTE PROCEDURE lifecycle_notify_table_change();
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS registry_job_notify_change ON registry_job;
+DROP FUNCTION IF EXISTS lifecycle_notify_table_change();
+"""
+
+
+def create_notify_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_TRIGGER_SQL)
+
+
+def drop_notify_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_TRIGGER_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("registry", "0039_move_auth_tokens"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_notify_trigger, drop_notify_trigger),
+    ]
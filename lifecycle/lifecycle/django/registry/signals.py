@@ -1,6 +1,10 @@
 import os
 
+from django.db import connections
 from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+
+from lifecycle.database.change_notifier import CHANGES_CHANNEL, TRIGGER_PUBLISHED_TABLES
 
 
 def set_search_path(sender, **kwargs):
@@ -25,3 +29,15 @@ def set_search_path(sender, **kwargs):
 
 
 connection_created.connect(set_search_path)
+
+
+def notify_table_changed(sender, using: str, **kwargs):
+    """Let Lifecycle instances invalidate their in-memory caches after a record is modified in Django admin"""
+    connection = connections[using]
+    if connection.vendor == 'postgresql' and sender._meta.db_table not in TRIGGER_PUBLISHED_TABLES:
+        with connection.cursor() as cursor:
+            cursor.execute('select pg_notify(%s, %s)', [CHANGES_CHANNEL, f'django:{sender._meta.db_table}'])
+
+
+post_save.connect(notify_table_changed)
+post_delete.connect(notify_table_changed)
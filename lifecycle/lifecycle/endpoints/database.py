@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Request
+
+from lifecycle.auth.check import check_staff_user
+from lifecycle.database.query_stats import SlowQueryShape
+from lifecycle.server.cache import LifecycleCache
+
+
+def setup_database_endpoints(api: APIRouter):
+
+    @api.get('/database/slow_queries')
+    def _list_slow_queries_endpoint(request: Request, limit: int = 10) -> list[SlowQueryShape]:
+        """List the slowest SQL query shapes with their execution stats"""
+        check_staff_user(request)
+        return LifecycleCache.db_engine().query_stats.slowest_queries(limit)
@@ -24,6 +24,7 @@ from lifecycle.job.public_endpoints import read_active_job_public_endpoints
 from lifecycle.job.logs import read_build_logs, read_runtime_logs
 from lifecycle.auth.authenticate import get_username_from_token
 from racetrack_client.utils.time import days_ago
+from racetrack_commons.api.response import etag_json_response
 from racetrack_commons.entities.dto import JobDto, JobFamilyDto, AsyncJobCallDto
 from racetrack_commons.plugin.engine import PluginEngine
 from racetrack_commons.auth.scope import AuthScope
@@ -41,13 +42,13 @@ def setup_job_endpoints(api: APIRouter, config: Config, plugin_engine: PluginEng
     def _list_all_jobs(request: Request) -> List[JobDto]:
         """Get list of deployed Jobs"""
         auth_subject = check_auth(request, scope=AuthScope.READ_JOB)
-        return list_job_registry(config, auth_subject)
+        return etag_json_response(request, list_job_registry(config, auth_subject))
 
     @api.get('/job_family')
     def _get_job_family(request: Request) -> List[JobFamilyDto]:
         """Get list of deployed Job Families (names regardless version)"""
         auth_subject = check_auth(request, scope=AuthScope.READ_JOB)
-        return list_job_families(auth_subject)
+        return etag_json_response(request, list_job_families(auth_subject))
 
     @api.get('/job/graph')
     def _get_job_graph(request: Request):
@@ -70,7 +71,7 @@ def setup_job_endpoints(api: APIRouter, config: Config, plugin_engine: PluginEng
     def _get_job(job_name: str, job_version: str, request: Request) -> JobDto:
         """Get details of particular Job"""
         check_auth(request, job_name=job_name, job_version=job_version, scope=AuthScope.READ_JOB)
-        return read_versioned_job(job_name, job_version, config)
+        return etag_json_response(request, read_versioned_job(job_name, job_version, config))
 
     @api.delete('/job/{job_name}/{job_version}')
     def _delete_job(job_name: str, job_version: str, request: Request):
@@ -14,6 +14,9 @@ from racetrack_client.log.logs import get_logger
 
 logger = get_logger(__name__)
 
+# maximum number of records fetched on a single page
+MAX_PAGE_LIMIT = 1000
+
 
 class TableMetadataPayload(BaseModel):
     class_name: str
@@ -44,6 +47,13 @@ class FetchManyRecordsResponse(BaseModel):
     records: list[RecordFieldsPayload]
 
 
+class FetchRecordsPageResponse(BaseModel):
+    columns: list[str]
+    primary_key_column: str
+    records: list[RecordFieldsPayload]
+    next_cursor: str | None  # cursor to fetch the next page, None if it's the last page
+
+
 class CountRecordsRequest(BaseModel):
     filters: dict[str, Any] | None = None
 
@@ -89,6 +99,14 @@ def setup_records_endpoints(api: APIRouter):
         check_staff_user(request)
         return list_table_records(mapper, payload, table)
 
+    @api.get('/records/table/{table}/page')
+    def _list_table_records_page_endpoint(
+        table: str, request: Request, limit: int = 100, cursor: str | None = None, order_by: str | None = None,
+    ) -> FetchRecordsPageResponse:
+        """Fetch a page of records from a table, following the cursor returned with the previous page"""
+        check_staff_user(request)
+        return list_table_records_page(mapper, table, limit, cursor, order_by)
+
     @api.post('/records/table/{table}/names')
     def _enrich_record_names(payload: ManyRecordsRequest, table: str, request: Request) -> FetchManyNamesResponse:
         """Enrich record IDs with their names"""
@@ -180,6 +198,27 @@ def list_table_records(mapper: RecordMapper, payload: FetchManyRecordsRequest, t
     )
 
 
+def list_table_records_page(
+    mapper: RecordMapper, table: str, limit: int, cursor: str | None, order_by: str | None,
+) -> FetchRecordsPageResponse:
+    table_type = mapper.table_name_to_class(table)
+    metadata = table_metadata(table_type)
+    if limit <= 0:
+        raise ValueError('limit should be a positive number')
+    limit = min(limit, MAX_PAGE_LIMIT)
+    records, next_cursor = mapper.filter_dicts_page(table_type, limit=limit, cursor=cursor, order_by=order_by)
+    record_payloads: list[RecordFieldsPayload] = [
+        RecordFieldsPayload(fields=convert_to_json_serializable(record))
+        for record in records
+    ]
+    return FetchRecordsPageResponse(
+        columns=metadata.fields,
+        primary_key_column=metadata.primary_key_column,
+        records=record_payloads,
+        next_cursor=next_cursor,
+    )
+
+
 def enrich_record_names(mapper: RecordMapper, payload: ManyRecordsRequest, table: str) -> FetchManyNamesResponse:
     table_type = mapper.table_name_to_class(table)
     id_to_name: dict[str, str] = {}
@@ -0,0 +1,137 @@
+import asyncio
+from typing import Any, Callable, Protocol
+
+from lifecycle.server.metrics import (
+    metric_event_stream_dropped_events,
+    metric_event_stream_queue_depth,
+    metric_event_stream_slow_clients_disconnected,
+)
+from racetrack_client.log.logs import get_logger
+
+logger = get_logger(__name__)
+
+SLOW_CLIENT_DROP = 'drop'
+SLOW_CLIENT_DISCONNECT = 'disconnect'
+# WebSocket close code: Try Again Later
+CLOSE_CODE_TRY_AGAIN_LATER = 1013
+
+
+class WebSocket(Protocol):
+    """Sending side of a websocket connection, e.g. falcon.asgi.WebSocket"""
+    async def send_media(self, media: Any) -> None:
+        ...
+
+    async def close(self, code: int = 1000) -> None:
+        ...
+
+
+class Subscriber:
+    """WebSocket client with its own queue of outgoing events, drained by a dedicated task"""
+    def __init__(self, ws: WebSocket, queue_size: int):
+        self.ws: WebSocket = ws
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=queue_size)
+        self.task: asyncio.Task | None = None
+        self.closed: bool = False
+        # some events have been dropped, so the client has to be brought up to date once its queue is drained
+        self.missed_events: bool = False
+
+
+class Broadcaster:
+    """
+    Fans out the events to the websocket clients on the event loop serving them.
+    Every client is sent its events by a separate task from a bounded queue, so a slow consumer doesn't delay the others.
+    Once the queue of a client is full, the client is disconnected (it may resume the stream later)
+    or the event is dropped, depending on the policy.
+    Client that missed some events is sent a resync event (e.g. a snapshot) as soon as its queue gets drained.
+    """
+    def __init__(
+        self,
+        queue_size: int,
+        slow_client_policy: str = SLOW_CLIENT_DISCONNECT,
+        resync_event: Callable[[], dict[str, Any] | None] | None = None,
+    ):
+        """
+        :param resync_event: builds an event bringing the client up to date after it missed some events
+        (None if there's nothing to catch up with). It's called on the event loop, so it should return quickly.
+        """
+        assert slow_client_policy in {SLOW_CLIENT_DROP, SLOW_CLIENT_DISCONNECT}, \
+            f'invalid slow client policy: {slow_client_policy}'
+        self.queue_size: int = queue_size
+        self.slow_client_policy: str = slow_client_policy
+        self.resync_event: Callable[[], dict[str, Any] | None] | None = resync_event
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def subscribe(self, ws: WebSocket, initial_events: list[dict[str, Any]] | None = None) -> Subscriber:
+        """Start sending events to the client. It has to be called on the event loop serving the websocket"""
+        self._loop = asyncio.get_running_loop()
+        subscriber = Subscriber(ws, max(1, self.queue_size))
+        for event in initial_events or []:
+            subscriber.queue.put_nowait(event)
+            metric_event_stream_queue_depth.inc()
+        subscriber.task = self._loop.create_task(self._send_events(subscriber))
+        return subscriber
+
+    async def unsubscribe(self, subscriber: Subscriber):
+        subscriber.closed = True
+        if subscriber.task is not None:
+            subscriber.task.cancel()
+            try:
+                await subscriber.task
+            except asyncio.CancelledError:
+                pass
+        metric_event_stream_queue_depth.dec(subscriber.queue.qsize())
+
+    def publish(self, event: dict[str, Any], subscribers: list[Subscriber]):
+        """Queue the event for the subscribers. It's safe to be called from any thread"""
+        if self._loop is None or not subscribers:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self.publish_nowait, event, subscribers)
+        except RuntimeError:  # event loop has been closed
+            pass
+
+    def publish_nowait(self, event: dict[str, Any], subscribers: list[Subscriber]):
+        """Queue the event for the subscribers. It has to be called on the event loop"""
+        for subscriber in subscribers:
+            if subscriber.closed:
+                continue
+            try:
+                subscriber.queue.put_nowait(event)
+                metric_event_stream_queue_depth.inc()
+            except asyncio.QueueFull:
+                if self.slow_client_policy == SLOW_CLIENT_DROP:
+                    metric_event_stream_dropped_events.inc()
+                    subscriber.missed_events = True
+                else:
+                    self._disconnect_slow_client(subscriber)
+
+    def _disconnect_slow_client(self, subscriber: Subscriber):
+        logger.warning('Event Stream client is too slow to keep up with the events, disconnecting it')
+        metric_event_stream_slow_clients_disconnected.inc()
+        metric_event_stream_dropped_events.inc(subscriber.queue.qsize() + 1)
+        subscriber.closed = True
+        if subscriber.task is not None:
+            subscriber.task.cancel()
+        self._loop.create_task(self._close(subscriber))
+
+    async def _close(self, subscriber: Subscriber):
+        try:
+            await subscriber.ws.close(code=CLOSE_CODE_TRY_AGAIN_LATER)
+        except BaseException as e:
+            logger.debug(f'Failed to close Event Stream client: {e}')
+
+    async def _send_events(self, subscriber: Subscriber):
+        while True:
+            event = await subscriber.queue.get()
+            metric_event_stream_queue_depth.dec()
+            try:
+                await subscriber.ws.send_media(event)
+                if subscriber.missed_events and subscriber.queue.empty() and self.resync_event is not None:
+                    subscriber.missed_events = False
+                    resync_event = self.resync_event()
+                    if resync_event is not None:
+                        await subscriber.ws.send_media(resync_event)
+            except BaseException as e:
+                logger.debug(f'Failed to send event to Event Stream client: {e}')
+                subscriber.closed = True
+                return
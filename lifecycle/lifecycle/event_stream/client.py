@@ -16,27 +16,65 @@ class EventStreamClient:
         self,
         url: str,
         on_event: Callable[[dict], None],
+        since: int | None = None,
+        epoch: str | None = None,
     ):
+        """
+        :param since: sequence number of the last change already known to the client.
+        Missed changes are replayed on connection, reconnecting the same client resumes from the last received event.
+        :param epoch: epoch of the stream the sequence number comes from.
+        Server sends a snapshot of all jobs if it doesn't match the current one.
+        """
         self.url = url
         self.on_event = on_event
         self.should_exit = False
         self.websocket: ClientConnection | None = None
+        self.last_seq: int | None = since
+        self.epoch: str | None = epoch
 
     @contextlib.contextmanager
     def connect_async(self):
-        with connect(self.url) as websocket:
-            self.websocket = websocket
+        self.websocket = connect(self._stream_url())
+        try:
             threading.Thread(
                 target=lambda: self.receive_loop(),
                 daemon=True,
             ).start()
             yield
+        finally:
+            self.websocket.close()
 
     def receive_loop(self):
         while not self.should_exit:
             try:
                 raw_message: str = self.websocket.recv()
                 message = json.loads(raw_message)
+                if message.get('event') == 'job_models_changed' and self.last_seq is not None \
+                        and message.get('epoch') == self.epoch:
+                    # skip the changes already included in the snapshot
+                    message['changes'] = [change for change in message['changes'] if change['seq'] > self.last_seq]
+                    if not message['changes']:
+                        continue
+                    if message['changes'][0]['seq'] != self.last_seq + 1:
+                        logger.warning('Event Stream missed some job changes, resubscribing')
+                        self._resubscribe()
+                        continue
+                if 'seq' in message:
+                    self.last_seq = message['seq']
+                    self.epoch = message.get('epoch')
                 self.on_event(message)
             except ConnectionClosedOK:
                 return
+
+    def _resubscribe(self):
+        """Reconnect to get the missed changes replayed"""
+        self.websocket.close()
+        self.websocket = connect(self._stream_url())
+
+    def _stream_url(self) -> str:
+        if self.last_seq is None:
+            return self.url
+        url = f'{self.url}?since={self.last_seq}'
+        if self.epoch is not None:
+            url += f'&epoch={self.epoch}'
+        return url
@@ -0,0 +1,44 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class JobChange:
+    seq: int
+    job_id: str
+
+    def to_json(self) -> dict[str, Any]:
+        return {'seq': self.seq, 'job_id': self.job_id}
+
+
+class ReplayLog:
+    """
+    Bounded log of the most recent job changes numbered with a monotonically increasing sequence,
+    so that the clients reconnecting to the event stream can catch up with the changes they missed
+    """
+    def __init__(self, max_size: int):
+        self._changes: deque[JobChange] = deque(maxlen=max_size)
+        # sequence number preceding the oldest change available in the log
+        self.base_seq: int = 0
+        self.last_seq: int = 0
+
+    def append(self, job_id: str) -> JobChange:
+        self.last_seq += 1
+        if len(self._changes) == self._changes.maxlen:
+            self.base_seq = self._changes[0].seq
+        change = JobChange(seq=self.last_seq, job_id=job_id)
+        self._changes.append(change)
+        return change
+
+    def truncate(self):
+        """Forget the history, the clients have to start over with a full snapshot"""
+        self._changes.clear()
+        self.last_seq += 1
+        self.base_seq = self.last_seq
+
+    def changes_since(self, seq: int) -> list[JobChange] | None:
+        """Return the changes following the sequence number or None if they're no longer (or not yet) known"""
+        if seq < self.base_seq or seq > self.last_seq:
+            return None
+        return [change for change in self._changes if change.seq > seq]
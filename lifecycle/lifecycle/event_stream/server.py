@@ -1,6 +1,7 @@
 import asyncio
 import threading
-import time
+from typing import Any
+import uuid
 import warnings
 
 # Suppress Deprecation warning of falcon library: 'cgi' is deprecated and slated for removal in Python 3.13
@@ -14,32 +15,66 @@ from falcon import Request
 from falcon.asgi import WebSocket, App
 
 from lifecycle.config import Config
-from lifecycle.job.registry import list_job_registry
+from lifecycle.database.schema import tables
+from lifecycle.database.schema.dto_converter import job_record_to_dto
+from lifecycle.database.table_model import table_metadata
+from lifecycle.event_stream.broadcaster import Broadcaster, Subscriber
+from lifecycle.event_stream.replay import JobChange, ReplayLog
+from lifecycle.job import models_registry
+from lifecycle.server.cache import LifecycleCache
 from lifecycle.server.metrics import metric_event_stream_client_connected, metric_event_stream_client_disconnected
 from racetrack_client.log.logs import get_logger
 from racetrack_client.log.exception import log_exception
-from racetrack_commons.entities.dto import JobDto
 
 logger = get_logger(__name__)
 
 
 class EventStreamServer:
     def __init__(self, config: Config):
-        """Socket.IO server for streaming events to clients"""
+        """
+        WebSocket server for streaming events to clients.
+        Changes of the jobs are numbered, so that the clients can resume the stream
+        with "?since=<seq>&epoch=<epoch>" query parameters.
+        Sequence numbers are meaningful only within the epoch of this process,
+        clients coming from another epoch (e.g. before the restart or from other replica) receive a snapshot.
+        Stream is not authenticated, so the events tell only which jobs have changed.
+        Clients fetch the jobs they're permitted to read from the API.
+        """
         self.config = config
-        self.clients: list[WebSocket] = []
+        self.epoch: str = str(uuid.uuid4())
+        self.clients: dict[WebSocket, Subscriber] = {}
         self.watcher_thread: threading.Thread | None = None
+        self._wake_up = threading.Event()
+        # last known state of the jobs, as of the last sequence number in the replay log
+        self._jobs: dict[str, dict[str, Any]] | None = None
+        self._replay_log = ReplayLog(config.event_stream_replay_log_size)
+        self._lock = threading.Lock()  # guards the clients, the jobs state and the replay log
+        self._refresh_lock = threading.Lock()
+        self._broadcaster = Broadcaster(config.event_stream_client_queue_size, config.event_stream_slow_client_policy,
+                                        resync_event=self._locked_snapshot_event)
         server = self
 
         class WebSocketResource:
-            async def on_websocket(self, _: Request, ws: WebSocket):
+            async def on_websocket(self, req: Request, ws: WebSocket):
+                since: int | None = req.get_param_as_int('since')
+                epoch: str | None = req.get_param('epoch')
                 await ws.accept()
                 logger.debug(f'Client connected to Event Stream')
                 metric_event_stream_client_connected.inc()
-                server.clients.append(ws)
+                subscriber: Subscriber | None = None
 
                 try:
-                    if server.watcher_thread is None or not server.watcher_thread.is_alive():
+                    if since is not None and (server._jobs is None or not server._is_watching()):
+                        # catch up with the changes made while nobody was watching
+                        # or wait for the first refresh, if the watcher has just started it
+                        await asyncio.to_thread(server.refresh_jobs)
+                    with server._lock:
+                        # subsequent changes are broadcast, since the replay log is appended under the same lock
+                        initial_events = server._replay_events(since, epoch) if since is not None else []
+                        subscriber = server._broadcaster.subscribe(ws, initial_events)
+                        server.clients[ws] = subscriber
+
+                    if not server._is_watching():
                         server.watcher_thread = threading.Thread(target=server.watch_database_events, args=(), daemon=True)
                         server.watcher_thread.start()
 
@@ -50,36 +85,117 @@ class EventStreamServer:
                 finally:
                     logger.debug(f'Client disconnected from Event Stream')
                     metric_event_stream_client_disconnected.inc()
-                    server.clients.remove(ws)
+                    with server._lock:
+                        server.clients.pop(ws, None)
+                    if subscriber is not None:
+                        await server._broadcaster.unsubscribe(subscriber)
+                    server._wake_up.set()  # let the watcher stop when it was the last client
 
         self.asgi_app = App()
         self.asgi_app.add_route('/lifecycle/websocket/events', WebSocketResource())
 
-    async def notify_clients_async(self, event: dict):
-        logger.debug(f'Notifying all Event Stream clients: {len(self.clients)}')
-        for ws in self.clients.copy():
-            await ws.send_media(event)
-
-    def notify_clients(self, event: dict):
-        asyncio.run(self.notify_clients_async(event))
+    def notify_clients(self, event: dict, clients: list[Subscriber] | None = None):
+        """Queue the event to be sent to the clients. It's safe to be called from any thread"""
+        if clients is None:
+            with self._lock:
+                clients = list(self.clients.values())
+        logger.debug(f'Notifying all Event Stream clients: {len(clients)}')
+        self._broadcaster.publish(event, clients)
+
+    def _replay_events(self, since: int, epoch: str | None) -> list[dict[str, Any]]:
+        """
+        Events bringing the client up to date since the sequence number:
+        the missed changes or a snapshot of all jobs if they're no longer known
+        """
+        changes = self._replay_log.changes_since(since) if epoch == self.epoch else None
+        if changes is None:
+            return [self._snapshot_event()]
+        if changes:
+            return [self._job_changes_event(changes)]
+        return []
+
+    def _snapshot_event(self) -> dict[str, Any]:
+        return {
+            'event': 'job_models_snapshot',
+            'epoch': self.epoch,
+            'seq': self._replay_log.last_seq,
+            'job_ids': list(self._jobs.keys()),
+        }
+
+    def _locked_snapshot_event(self) -> dict[str, Any] | None:
+        with self._lock:
+            if self._jobs is None:  # no job changes have been broadcast yet
+                return None
+            return self._snapshot_event()
+
+    def _is_watching(self) -> bool:
+        return self.watcher_thread is not None and self.watcher_thread.is_alive()
+
+    def refresh_jobs(self):
+        """Compare the jobs with their last known state, record the changes and notify the clients about them"""
+        with self._refresh_lock:
+            current_jobs = self._load_jobs()
+            with self._lock:
+                if self._jobs is None:
+                    self._jobs = current_jobs
+                    self._replay_log.truncate()
+                    return
+                changes: list[JobChange] = []
+                for job_id in self._jobs.keys() - current_jobs.keys():
+                    changes.append(self._replay_log.append(job_id))
+                for job_id, job in current_jobs.items():
+                    if self._jobs.get(job_id) != job:
+                        changes.append(self._replay_log.append(job_id))
+                self._jobs = current_jobs
+                clients = list(self.clients.values())
+
+            if changes:
+                logger.debug(f'Detected change in job models')
+                self.notify_clients(self._job_changes_event(changes), clients)
 
     def watch_database_events(self):
+        """
+        Notify clients about the changes of jobs as soon as they're committed,
+        by this Lifecycle instance or any other process, and periodically double-check the jobs in case a notification was missed
+        """
         logger.debug('Starting watcher thread in Event Stream')
-        last_jobs: dict[str, JobDto] | None = None
-        try:
-            while len(self.clients) > 0:
+        notifier = LifecycleCache.record_mapper().change_notifier
+        jobs_table = table_metadata(tables.Job).table_name
+        notifier.watch_tables([jobs_table], LifecycleCache.config.database_changes_poll_interval)
 
-                jobs = list_job_registry(self.config)
-                current_jobs: dict[str, JobDto] = {job.id: job for job in jobs}
-                if last_jobs is not None and current_jobs != last_jobs:
-                    logger.debug(f'Detected change in job models')
-                    self.notify_clients({
-                        'event': 'job_models_changed',
-                    })
-                last_jobs = current_jobs
+        def _on_table_changed(table: str | None):
+            if table is None or table == jobs_table:
+                self._wake_up.set()
 
-                time.sleep(self.config.job_watcher_interval)
+        notifier.subscribe(_on_table_changed)
+        try:
+            # catch up with the changes made while nobody was watching
+            self.refresh_jobs()
+            while len(self.clients) > 0:
+                self._wake_up.wait(timeout=self.config.job_watcher_interval)
+                self._wake_up.clear()  # writes committed from now on will wake it up again
+                if len(self.clients) == 0:
+                    break
+                # comparing the jobs skips no-op writes and notifications received more than once
+                self.refresh_jobs()
         except BaseException as e:
             log_exception(e)
+        finally:
+            notifier.unsubscribe(_on_table_changed)
 
         logger.debug('Event Stream watcher thread stopped')
+
+    def _load_jobs(self) -> dict[str, dict[str, Any]]:
+        # jobs are read from the database, so that the periodic check doesn't depend on the change notifications
+        return {
+            job.id: job_record_to_dto(job, self.config).model_dump(mode='json')
+            for job in models_registry.list_job_models()
+        }
+
+    def _job_changes_event(self, changes: list[JobChange]) -> dict[str, Any]:
+        return {
+            'event': 'job_models_changed',
+            'epoch': self.epoch,
+            'seq': changes[-1].seq,
+            'changes': [change.to_json() for change in changes],
+        }
@@ -44,6 +44,11 @@ def list_infrastructure_targets(plugin_engine: PluginEngine) -> list[Infrastruct
     return list(infrastructures.values())
 
 
+def map_infrastructure_targets(plugin_engine: PluginEngine) -> dict[str, InfrastructureTarget]:
+    """Return infrastructure targets by their names"""
+    return _gather_infrastructure_targets(plugin_engine)
+
+
 def _gather_infrastructure_targets(plugin_engine: PluginEngine) -> dict[str, InfrastructureTarget]:
     all_infrastructures: dict[str, InfrastructureTarget] = {}
     for result in plugin_engine.invoke_plugin_hook(PluginCore.infrastructure_targets):
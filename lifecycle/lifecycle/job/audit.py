@@ -70,6 +70,6 @@ def read_audit_log_user_events(
     job_version_filter = QueryCondition(f'"job_version" = {placeholder}', job_version) if job_version else QueryCondition.empty()
     query_condition = QueryCondition.operator_and(username_filter, job_name_filter, job_version_filter)
     records = mapper.filter(
-        tables.AuditLogEvent, query_condition, order_by=['-timestamp'], limit=100,
+        tables.AuditLogEvent, query_condition, order_by=['-timestamp'], limit=100, read_only=True,
     )
     return [audit_log_event_record_to_dto(model) for model in records]
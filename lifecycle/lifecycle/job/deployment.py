@@ -49,7 +49,7 @@ def check_for_concurrent_deployments(manifest: Manifest):
         f'"status" = {placeholder} and "job_name" = {placeholder} and "job_version" = {placeholder} and "update_time" >= {placeholder}',
         DeploymentStatus.IN_PROGRESS.value, manifest.name, manifest.version, update_time_after
     )
-    ongoing_deployments = mapper.filter(tables.Deployment, condition=filter_condition)
+    ongoing_deployments = mapper.filter(tables.Deployment, condition=filter_condition, read_only=True)
 
     if ongoing_deployments:
         ongoing = ongoing_deployments[0]
@@ -76,7 +76,7 @@ def check_deployment_result(deploy_id: str, config: Config) -> DeploymentDto:
 
 def list_recent_deployments(limit: int) -> list[DeploymentDto]:
     mapper = LifecycleCache.record_mapper()
-    deployment_models = mapper.list_all(tables.Deployment, order_by=['-update_time'], limit=limit)
+    deployment_models = mapper.list_all(tables.Deployment, order_by=['-update_time'], limit=limit, read_only=True)
     return [deployment_record_to_dto(m) for m in deployment_models]
 
 
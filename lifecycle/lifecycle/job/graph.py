@@ -1,15 +1,14 @@
 from dataclasses import dataclass
 
 from lifecycle.auth.authorize import list_permitted_jobs
-from lifecycle.auth.subject import find_auth_subject_by_esc_id, find_auth_subject_by_job_family_name
 from lifecycle.config.config import Config
 from lifecycle.database.schema import tables
 from lifecycle.job.esc import list_escs
 from lifecycle.job.registry import list_job_registry
+from lifecycle.server.cache import LifecycleCache
 from racetrack_commons.auth.scope import AuthScope
 from racetrack_commons.entities.dto import EscDto, JobDto
 from racetrack_commons.urls import get_external_pub_url
-from racetrack_client.log.errors import EntityNotFound
 from racetrack_client.log.logs import get_logger
 
 logger = get_logger(__name__)
@@ -58,11 +57,18 @@ def build_job_dependencies_graph(config: Config, auth_subject: tables.AuthSubjec
         ))
 
     edges: list[JobGraphEdge] = []
+    # auth subjects are looked up all at once, not one by one for every node
+    mapper = LifecycleCache.record_mapper()
+    family_ids: dict[str, str] = {
+        row['name']: row['id'] for row in mapper.filter_dicts(tables.JobFamily, columns=['id', 'name'])
+    }
+    auth_subjects = mapper.list_all(tables.AuthSubject, read_only=True)
+    family_subjects = {subject.job_family_id: subject for subject in auth_subjects if subject.job_family_id}
+    esc_subjects = {subject.esc_id: subject for subject in auth_subjects if subject.esc_id}
 
     for family_name in family_names:
-        try:
-            auth_subject = find_auth_subject_by_job_family_name(family_name)
-        except EntityNotFound:
+        auth_subject = family_subjects.get(family_ids.get(family_name))
+        if auth_subject is None:
             logger.warning(f'Could not find auth subject for job family {family_name}')
             continue
         dest_jobs = list_permitted_jobs(auth_subject, AuthScope.CALL_JOB.value, jobs)
@@ -75,9 +81,8 @@ def build_job_dependencies_graph(config: Config, auth_subject: tables.AuthSubjec
             ))
 
     for esc in escs:
-        try:
-            auth_subject = find_auth_subject_by_esc_id(esc.id)
-        except EntityNotFound:
+        auth_subject = esc_subjects.get(esc.id)
+        if auth_subject is None:
             logger.warning(f'Could not find auth subject for ESC {esc.id}')
             continue
         dest_jobs = list_permitted_jobs(auth_subject, AuthScope.CALL_JOB.value, jobs)
@@ -20,6 +20,7 @@ def read_build_logs(job_name: str, job_version: str, tail: int) -> str:
     deployments = LifecycleCache.record_mapper().find_many(
         tables.Deployment,
         order_by=['-update_time'],
+        read_only=True,
         job_name=job_model.name,
         job_version=job_model.version,
     )
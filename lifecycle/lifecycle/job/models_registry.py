@@ -4,6 +4,7 @@ import time
 from lifecycle.database.base_engine import NoRowsAffected
 from lifecycle.database.condition_builder import QueryCondition
 from lifecycle.database.table_model import new_uuid
+from lifecycle.job.version_index import version_index_cache
 from lifecycle.server.cache import LifecycleCache
 import yaml
 
@@ -24,13 +25,13 @@ logger = get_logger(__name__)
 def list_job_models() -> list[tables.Job]:
     """List deployed jobs stored in registry database"""
     mapper = LifecycleCache.record_mapper()
-    return mapper.list_all(tables.Job, order_by=['-update_time', 'name'])
+    return mapper.list_all(tables.Job, order_by=['-update_time', 'name'], read_only=True)
 
 
 def list_job_family_models() -> list[tables.JobFamily]:
     """List deployed job families stored in registry database"""
     mapper = LifecycleCache.record_mapper()
-    return mapper.list_all(tables.JobFamily, order_by=['name'])
+    return mapper.list_all(tables.JobFamily, order_by=['name'], read_only=True)
 
 
 def read_job_model(job_name: str, job_version: str) -> tables.Job:
@@ -68,6 +69,15 @@ def resolve_job_model(job_name: str, job_version: str) -> tables.Job:
 
 
 def read_latest_job_model(job_name: str) -> tables.Job:
+    index = version_index_cache.get_index()
+    if index is not None:
+        if not index.has_job(job_name):
+            raise EntityNotFound(f'No job named {job_name}')
+        latest_version = index.latest(job_name)
+        if latest_version is None:
+            raise EntityNotFound("No stable version found")
+        return read_job_model(job_name, latest_version)
+
     mapper = LifecycleCache.record_mapper()
     placeholder: str = mapper.placeholder
     filter_condition = QueryCondition(
@@ -91,6 +101,15 @@ def read_latest_wildcard_job_model(job_name: str, version_wildcard: str) -> tabl
     """
     version_pattern = SemanticVersionPattern.from_x_pattern(version_wildcard)
 
+    index = version_index_cache.get_index()
+    if index is not None:
+        if not index.has_job(job_name):
+            raise EntityNotFound(f'No job named {job_name}')
+        latest_version = index.latest_wildcard(job_name, version_wildcard)
+        if latest_version is None:
+            raise EntityNotFound(f"Not found any stable version matching pattern: {version_wildcard}")
+        return read_job_model(job_name, latest_version)
+
     mapper = LifecycleCache.record_mapper()
     placeholder: str = mapper.placeholder
     filter_condition = QueryCondition(
@@ -157,6 +176,14 @@ def create_job_family_model(job_family_dto: JobFamilyDto) -> tables.JobFamily:
 
 
 def update_job_model(job: tables.Job, job_dto: JobDto):
+    _apply_job_dto(job, job_dto)
+    try:
+        LifecycleCache.record_mapper().update(job)
+    except NoRowsAffected:
+        raise EntityNotFound(f'Job model has gone before updating: {job}')
+
+
+def _apply_job_dto(job: tables.Job, job_dto: JobDto):
     job.status = job_dto.status
     job.update_time = timestamp_to_datetime(job_dto.update_time)
     job.manifest = job_dto.manifest_yaml
@@ -170,10 +197,6 @@ def update_job_model(job: tables.Job, job_dto: JobDto):
     job.replica_internal_names = ','.join(job_dto.replica_internal_names)
     job.job_type_version = job_dto.job_type_version
     job.infrastructure_stats = json.dumps(job_dto.infrastructure_stats)
-    try:
-        LifecycleCache.record_mapper().update(job)
-    except NoRowsAffected:
-        raise EntityNotFound(f'Job model has gone before updating: {job}')
 
 
 def update_job_manifest(job_name: str, job_version: str, manifest_yaml: str):
@@ -211,6 +234,26 @@ def update_job(job_dto: JobDto) -> tables.Job:
     return job_model
 
 
+def update_jobs(job_dtos: list[JobDto]):
+    """Update multiple existing jobs at once"""
+    if not job_dtos:
+        return
+    mapper = LifecycleCache.record_mapper()
+    placeholders = ', '.join([mapper.placeholder] * len(job_dtos))
+    condition = QueryCondition(f'id in ({placeholders})', *[job_dto.id for job_dto in job_dtos])
+    job_models: dict[str, tables.Job] = {job.id: job for job in mapper.filter(tables.Job, condition=condition)}
+
+    updated_jobs: list[tables.Job] = []
+    for job_dto in job_dtos:
+        job_model = job_models.get(job_dto.id or '')
+        if job_model is None:
+            logger.warning(f'Job model has gone before updating: {job_dto}')
+            continue
+        _apply_job_dto(job_model, job_dto)
+        updated_jobs.append(job_model)
+    mapper.update_many(updated_jobs)
+
+
 def create_job_family_if_not_exist(job_family: str) -> tables.JobFamily:
     try:
         return read_job_family_model(job_family)
@@ -1,6 +1,13 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+import threading
+import time
+
 from lifecycle.config import Config
 from lifecycle.deployer.redeploy import reprovision_job
 from lifecycle.job.registry import list_job_registry
+from racetrack_commons.deploy.resource import job_resource_name
 from racetrack_commons.plugin.engine import PluginEngine
 from racetrack_client.log.context_error import wrap_context, ContextError
 from racetrack_client.log.exception import log_exception
@@ -10,17 +17,87 @@ from racetrack_commons.entities.dto import JobDto, JobStatus
 logger = get_logger(__name__)
 
 
+@dataclass
+class RetryState:
+    failures: int
+    next_attempt_time: float
+
+
+class JobReconciler:
+    """
+    Re-provisions lost jobs concurrently, with a limited number of jobs at a time per infrastructure target.
+    Recently called jobs go first. Jobs failing to be restored are retried with exponentially growing delays,
+    remembered across the reconciliation runs.
+    """
+    def __init__(self):
+        self._retry_states: dict[str, RetryState] = {}
+        self._run_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+
+    def reconcile(self, config: Config, plugin_engine: PluginEngine):
+        if not self._run_lock.acquire(blocking=False):
+            logger.info('reconciliation is already in progress, skipping')
+            return
+        try:
+            self._reconcile(config, plugin_engine)
+        finally:
+            self._run_lock.release()
+
+    def _reconcile(self, config: Config, plugin_engine: PluginEngine):
+        started_at = time.time()
+        lost_jobs = [job for job in list_job_registry(config) if is_job_reconcile_eligible(job)]
+        with self._state_lock:
+            lost_job_ids = {job_resource_name(job.name, job.version) for job in lost_jobs}
+            self._retry_states = {job_id: state for job_id, state in self._retry_states.items() if job_id in lost_job_ids}
+            due_jobs = [job for job in lost_jobs if self._is_due(job, started_at)]
+        if not due_jobs:
+            return
+
+        due_jobs.sort(key=lambda job: job.last_call_time or 0, reverse=True)
+        infrastructure_jobs: dict[str, list[JobDto]] = defaultdict(list)
+        for job in due_jobs:
+            infrastructure_jobs[job.infrastructure_target or ''].append(job)
+        logger.info(f'reconciling {len(due_jobs)} lost jobs in {len(infrastructure_jobs)} infrastructures...')
+
+        executors: list[ThreadPoolExecutor] = []
+        futures = []
+        for jobs in infrastructure_jobs.values():
+            executor = ThreadPoolExecutor(max_workers=max(1, config.reconciliation_concurrency),
+                                          thread_name_prefix='reconcile_jobs')
+            executors.append(executor)
+            for job in jobs:  # the executor takes them in order of priority
+                futures.append(executor.submit(self._reconcile_job, job, started_at, config, plugin_engine))
+        wait(futures)
+        for executor in executors:
+            executor.shutdown()
+
+    def _reconcile_job(self, job: JobDto, started_at: float, config: Config, plugin_engine: PluginEngine):
+        job_id = job_resource_name(job.name, job.version)
+        try:
+            logger.info(f'reconciling lost job {job}...')
+            reprovision_job(job.name, job.version, config, plugin_engine, 'racetrack', None)
+            with self._state_lock:
+                self._retry_states.pop(job_id, None)
+
+        except BaseException as e:
+            with self._state_lock:
+                failures = self._retry_states[job_id].failures + 1 if job_id in self._retry_states else 1
+                delay = min(config.reconciliation_retry_delay * 2 ** (failures - 1), config.reconciliation_max_retry_delay)
+                self._retry_states[job_id] = RetryState(failures=failures, next_attempt_time=started_at + delay)
+            log_exception(ContextError(f'failed to reconcile job (attempt {failures}, next one in {delay:.0f}s)', e))
+
+    def _is_due(self, job: JobDto, now: float) -> bool:
+        state = self._retry_states.get(job_resource_name(job.name, job.version))
+        return state is None or state.next_attempt_time <= now
+
+
+job_reconciler = JobReconciler()
+
+
 def reconcile_jobs(config: Config, plugin_engine: PluginEngine):
     """Redeploy jobs missing in a cluster"""
     with wrap_context('reconciling jobs'):
-        for job in list_job_registry(config):
-            try:
-                if is_job_reconcile_eligible(job):
-                    logger.info(f'reconciling lost job {job}...')
-                    reprovision_job(job.name, job.version, config, plugin_engine, 'racetrack', None)
-
-            except BaseException as e:
-                log_exception(ContextError('failed to reconcile job', e))
+        job_reconciler.reconcile(config, plugin_engine)
 
 
 def is_job_reconcile_eligible(job: JobDto) -> bool:
@@ -7,6 +7,7 @@ from lifecycle.database.schema import tables
 from lifecycle.deployer.deployers import get_job_deployer
 from lifecycle.job import models_registry
 from lifecycle.job.audit import AuditLogger
+from lifecycle.job.registry_cache import job_registry_cache
 from lifecycle.database.schema.dto_converter import job_family_record_to_dto, job_record_to_dto
 from lifecycle.monitor.monitors import list_infrastructure_jobs
 from lifecycle.server.cache import LifecycleCache
@@ -24,11 +25,11 @@ logger = get_logger(__name__)
 
 
 def list_job_registry(config: Config, auth_subject: tables.AuthSubject | None = None) -> list[JobDto]:
-    """List jobs getting results from registry (Database)"""
+    """List jobs getting results from registry (Database), served from memory if no job has changed since"""
+    jobs = job_registry_cache.list_jobs(config)
     if auth_subject is None:
-        return [job_record_to_dto(job, config) for job in models_registry.list_job_models()]
+        return jobs
     else:
-        jobs = [job_record_to_dto(job, config) for job in models_registry.list_job_models()]
         return list_permitted_jobs(auth_subject, AuthScope.READ_JOB.value, jobs)
 
 
@@ -125,28 +126,35 @@ def sync_registry_jobs(config: Config, plugin_engine: PluginEngine):
     - it probes every job and updates its status to RUNNING or ERROR.
     - if the job is expected to be present, but was not found in an infrastructure, it gets LOST status.
     - if there are extra jobs found in the infrastructure, called "orphans", they are ignored, but the log warning is written.
+    Jobs of the infrastructures that couldn't be listed are left intact.
+    All the changes are saved in a single batch.
     """
     with wrap_context('synchronizing job'):
         available_job_types: set[str] = set(LifecycleCache.job_types.keys())
-        infrastructure_jobs_map: dict[str, JobDto] = _generate_job_map(list_infrastructure_jobs(config, plugin_engine))
+        infrastructure_jobs, failed_infrastructures = list_infrastructure_jobs(config, plugin_engine)
+        infrastructure_jobs_map: dict[str, JobDto] = _generate_job_map(infrastructure_jobs)
         registry_jobs_map: dict[str, JobDto] = _generate_job_map(list_job_registry(config))
         job_status_count: dict[str, int] = defaultdict(int)
+        changed_jobs: list[JobDto] = []
 
         for job_id, registry_job in registry_jobs_map.items():
             if registry_job.status != JobStatus.STARTING.value:
                 if job_id in infrastructure_jobs_map:
                     infrastructure_job = infrastructure_jobs_map[job_id]
                     infrastructure_job.notice = _apply_job_notice(registry_job, infrastructure_job, available_job_types)
-                    _sync_registry_job(registry_job, infrastructure_job)
-                else:
+                    if _sync_registry_job(registry_job, infrastructure_job):
+                        changed_jobs.append(registry_job)
+                elif not _is_infrastructure_unknown(registry_job, failed_infrastructures):
                     # job not present in Cluster
                     if registry_job.status != JobStatus.LOST.value:
                         logger.info(f'job is lost: {registry_job}')
                         registry_job.status = JobStatus.LOST.value
-                        models_registry.update_job(registry_job)
+                        changed_jobs.append(registry_job)
 
             job_status_count[registry_job.status] += 1
 
+        models_registry.update_jobs(changed_jobs)
+
         # Orphans - job missing in registry but present in infrastructure
         for job_id, infrastructure_job in infrastructure_jobs_map.items():
             if job_id not in registry_jobs_map:
@@ -161,10 +169,10 @@ def sync_registry_jobs(config: Config, plugin_engine: PluginEngine):
         metric_jobs_count_by_status.labels(status=status.value).set(job_status_count[status.value])
 
 
-def _sync_registry_job(registry_job: JobDto, infrastructure_job: JobDto):
+def _sync_registry_job(registry_job: JobDto, infrastructure_job: JobDto) -> bool:
     """
-    Update database job with data taken from infrastructure.
-    Do database "update" only when change is detected in order to avoid redundant database operations.
+    Update registry job with data taken from infrastructure.
+    Return whether a change is detected, so the database "update" can be avoided otherwise.
     """
     changed = False
 
@@ -196,8 +204,14 @@ def _sync_registry_job(registry_job: JobDto, infrastructure_job: JobDto):
             registry_job.last_call_time = infrastructure_job.last_call_time
             changed = True
 
-    if changed:
-        models_registry.update_job(registry_job)
+    return changed
+
+
+def _is_infrastructure_unknown(registry_job: JobDto, failed_infrastructures: set[str]) -> bool:
+    """Whether the job might be deployed to one of the infrastructures that couldn't be listed"""
+    if not failed_infrastructures:
+        return False
+    return registry_job.infrastructure_target is None or registry_job.infrastructure_target in failed_infrastructures
 
 
 def _generate_job_map(jobs: Iterable[JobDto]) -> dict[str, JobDto]:
@@ -0,0 +1,46 @@
+import threading
+
+from lifecycle.config import Config
+from lifecycle.database.schema import tables
+from lifecycle.database.schema.dto_converter import job_record_to_dto
+from lifecycle.database.table_model import table_metadata
+from lifecycle.job import models_registry
+from lifecycle.server.cache import LifecycleCache
+from lifecycle.server.metrics import metric_job_registry_cache_hits, metric_job_registry_cache_misses
+from racetrack_commons.entities.dto import JobDto
+
+
+class JobRegistryCache:
+    """
+    Process-local cache of the job registry, versioned by the generation of the jobs table.
+    It's served as long as no job has been written in the meantime, by this or any other Lifecycle instance.
+    """
+    def __init__(self):
+        self._jobs: list[JobDto] | None = None
+        self._generation: int = -1
+        self._lock = threading.Lock()
+
+    def list_jobs(self, config: Config) -> list[JobDto]:
+        """List all jobs, returning copies of the cached DTOs, so they can be modified by the caller"""
+        notifier = LifecycleCache.record_mapper().change_notifier
+        jobs_table = table_metadata(tables.Job).table_name
+        notifier.watch_tables([jobs_table], config.database_changes_poll_interval)
+        # generation is read before loading, so the changes made in the meantime invalidate the result
+        generation = notifier.generation(jobs_table)
+        synchronized = notifier.is_synchronized()
+        with self._lock:
+            if synchronized and self._jobs is not None and self._generation == generation:
+                metric_job_registry_cache_hits.inc()
+                return [job.model_copy() for job in self._jobs]
+
+        metric_job_registry_cache_misses.inc()
+        jobs = [job_record_to_dto(job, config) for job in models_registry.list_job_models()]
+        if synchronized:
+            with self._lock:
+                self._jobs = jobs
+                self._generation = generation
+            return [job.model_copy() for job in jobs]
+        return jobs
+
+
+job_registry_cache = JobRegistryCache()
@@ -0,0 +1,120 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+import threading
+from typing import Iterable
+
+from lifecycle.database.schema import tables
+from lifecycle.database.table_model import table_metadata
+from lifecycle.server.cache import LifecycleCache
+from racetrack_client.utils.semver import SemanticVersion, SemanticVersionPattern
+from racetrack_commons.entities.dto import JobStatus
+
+# statuses of the jobs taken into account when resolving version aliases
+RESOLVABLE_STATUSES = {JobStatus.RUNNING.value, JobStatus.ERROR.value, JobStatus.LOST.value}
+
+VersionKey = tuple[int, int, int]
+
+
+class VersionIndex:
+    """
+    Sorted stable versions of every job family, parsed once,
+    so that "latest" and wildcard versions ("1.x", "1.2.x") are resolved with a binary search
+    """
+    def __init__(self, jobs: Iterable[tuple[str, str]]):
+        """:param jobs: pairs of job name and version"""
+        family_versions: dict[str, list[tuple[VersionKey, str]]] = defaultdict(list)
+        self._job_names: set[str] = set()
+        for job_name, version in jobs:
+            self._job_names.add(job_name)
+            try:
+                semver = SemanticVersion(version)
+            except ValueError:
+                continue
+            if semver.is_stable:
+                family_versions[job_name].append(((semver.major, semver.minor, semver.patch), version))
+        self._versions: dict[str, list[str]] = {}
+        self._keys: dict[str, list[VersionKey]] = {}
+        for job_name, versions in family_versions.items():
+            versions.sort()
+            self._keys[job_name] = [key for key, _ in versions]
+            self._versions[job_name] = [version for _, version in versions]
+
+    def has_job(self, job_name: str) -> bool:
+        return job_name in self._job_names
+
+    def latest(self, job_name: str) -> str | None:
+        """Find the latest stable version of the job"""
+        versions = self._versions.get(job_name)
+        return versions[-1] if versions else None
+
+    def latest_wildcard(self, job_name: str, version_wildcard: str) -> str | None:
+        """
+        Find the latest stable version of the job matching the pattern
+        :param version_wildcard: version pattern containing "x" wildcards, e.g. "1.2.x", "2.x"
+        """
+        keys = self._keys.get(job_name)
+        if not keys:
+            return None
+        versions = self._versions[job_name]
+        prefix = _fixed_version_prefix(version_wildcard)
+        if prefix is None:
+            # wildcard is not only at the end, e.g. "x.2.x", check the versions one by one
+            pattern = SemanticVersionPattern.from_x_pattern(version_wildcard)
+            for version in reversed(versions):
+                if pattern.matches(SemanticVersion(version)):
+                    return version
+            return None
+
+        lower_key = prefix + (0,) * (3 - len(prefix))
+        upper_key = prefix + (float('inf'),) * (3 - len(prefix))
+        start = bisect_left(keys, lower_key)
+        end = bisect_right(keys, upper_key)
+        return versions[end - 1] if end > start else None
+
+
+def _fixed_version_prefix(version_wildcard: str) -> tuple[int, ...] | None:
+    """Return the numbers preceding the trailing "x" wildcards, e.g. (1, 2) for "1.2.x", or None if not applicable"""
+    parts = version_wildcard.split('.')
+    if len(parts) > 3:
+        return None
+    numbers: list[int] = []
+    for index, part in enumerate(parts):
+        if part == 'x':
+            if any(rest != 'x' for rest in parts[index:]):
+                return None
+            return tuple(numbers)
+        if part != str(int(part)):  # leading zeros never match a parsed version
+            return None
+        numbers.append(int(part))
+    return None
+
+
+class VersionIndexCache:
+    """Process-local version index, rebuilt whenever any job has been written, by this or any other Lifecycle instance"""
+    def __init__(self):
+        self._index: VersionIndex | None = None
+        self._generation: int = -1
+        self._lock = threading.Lock()
+
+    def get_index(self) -> VersionIndex | None:
+        """Return up-to-date version index or None if it can't be trusted at the moment"""
+        mapper = LifecycleCache.record_mapper()
+        notifier = mapper.change_notifier
+        jobs_table = table_metadata(tables.Job).table_name
+        notifier.watch_tables([jobs_table], LifecycleCache.config.database_changes_poll_interval)
+        generation = notifier.generation(jobs_table)
+        if not notifier.is_synchronized():
+            return None
+        with self._lock:
+            if self._index is not None and self._generation == generation:
+                return self._index
+
+        rows = mapper.filter_dicts(tables.Job, columns=['name', 'version', 'status'])
+        index = VersionIndex((row['name'], row['version']) for row in rows if row['status'] in RESOLVABLE_STATUSES)
+        with self._lock:
+            self._index = index
+            self._generation = generation
+        return index
+
+
+version_index_cache = VersionIndexCache()
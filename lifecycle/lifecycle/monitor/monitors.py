@@ -1,22 +1,103 @@
-from typing import Callable, Iterable
+from concurrent.futures import Future, wait
+import threading
+import time
+from typing import Callable
 
 from lifecycle.config import Config
-from lifecycle.infrastructure.infra_target import get_infrastructure_target, list_infrastructure_targets
+from lifecycle.infrastructure.infra_target import (
+    get_infrastructure_target,
+    list_infrastructure_targets,
+    map_infrastructure_targets,
+)
+from lifecycle.infrastructure.model import InfrastructureTarget
 from lifecycle.monitor.base import LogsStreamer
+from lifecycle.server.metrics import (
+    metric_infrastructure_jobs_listing_duration,
+    metric_infrastructure_jobs_listing_failures,
+)
 from racetrack_client.log.context_error import wrap_context, ContextError
 from racetrack_client.log.exception import log_exception
+from racetrack_client.log.logs import get_logger
 from racetrack_commons.entities.dto import JobDto
 from racetrack_commons.plugin.engine import PluginEngine
 
+logger = get_logger(__name__)
 
-def list_infrastructure_jobs(config: Config, plugin_engine: PluginEngine) -> Iterable[JobDto]:
-    """List jobs deployed in all infrastructures"""
-    infrastructures = list_infrastructure_targets(plugin_engine)
-    for infrastructure in infrastructures:
+# listings of the infrastructures that are still running (possibly hanging) by infrastructure name
+_running_listings: dict[str, Future[list[JobDto]]] = {}
+_running_listings_lock = threading.Lock()
+
+
+def list_infrastructure_jobs(config: Config, plugin_engine: PluginEngine) -> tuple[list[JobDto], set[str]]:
+    """
+    List jobs deployed in all infrastructures, querying them concurrently
+    :return: jobs found and names of the infrastructures that failed or didn't respond in time
+    """
+    infrastructures = map_infrastructure_targets(plugin_engine)
+    if not infrastructures:
+        return [], set()
+    futures: dict[str, Future[list[JobDto]]] = {}
+    stale_listings: set[str] = set()
+    for name, infrastructure in infrastructures.items():
+        futures[name], started = _start_listing(name, infrastructure, config)
+        if not started:
+            stale_listings.add(name)
+    wait([future for name, future in futures.items() if name not in stale_listings],
+         timeout=config.infrastructure_listing_timeout)
+
+    jobs: list[JobDto] = []
+    failed_infrastructures: set[str] = set()
+    for name, future in futures.items():
+        if name in stale_listings:
+            # result of the listing started in the previous runs may be older than the registry compared with it
+            failed_infrastructures.add(name)
+        elif not future.done():
+            logger.error(f'listing jobs from infrastructure {name} timed out after {config.infrastructure_listing_timeout}s')
+            metric_infrastructure_jobs_listing_failures.labels(infrastructure=name).inc()
+            failed_infrastructures.add(name)
+        elif future.exception() is not None:
+            failed_infrastructures.add(name)
+        else:
+            jobs.extend(future.result())
+    return jobs, failed_infrastructures
+
+
+def _start_listing(
+    name: str, infrastructure: InfrastructureTarget, config: Config,
+) -> tuple[Future[list[JobDto]], bool]:
+    """
+    Start listing the jobs of the infrastructure in a background thread,
+    unless the previous listing is still running, then don't pile up more threads.
+    Daemon threads are used, so that the hanging infrastructures don't block the shutdown.
+    :return: future result of the listing and whether it has been started now
+    """
+    with _running_listings_lock:
+        future = _running_listings.get(name)
+        if future is not None and not future.done():
+            logger.warning(f'previous listing of jobs from infrastructure {name} is still running')
+            return future, False
+        future = _running_listings[name] = Future()
+
+    def _run_listing():
         try:
-            yield from infrastructure.job_monitor.list_jobs(config)
+            future.set_result(_list_jobs_of_infrastructure(name, infrastructure, config))
         except BaseException as e:
-            log_exception(ContextError(f'failed to list jobs from {infrastructure}', e))
+            future.set_exception(e)
+
+    threading.Thread(target=_run_listing, name=f'list_infrastructure_jobs_{name}', daemon=True).start()
+    return future, True
+
+
+def _list_jobs_of_infrastructure(name: str, infrastructure: InfrastructureTarget, config: Config) -> list[JobDto]:
+    start_time = time.perf_counter()
+    try:
+        return list(infrastructure.job_monitor.list_jobs(config))
+    except BaseException as e:
+        log_exception(ContextError(f'failed to list jobs from {name} infrastructure', e))
+        metric_infrastructure_jobs_listing_failures.labels(infrastructure=name).inc()
+        raise
+    finally:
+        metric_infrastructure_jobs_listing_duration.labels(infrastructure=name).observe(time.perf_counter() - start_time)
 
 
 def check_job_condition(job: JobDto, on_job_alive: Callable):
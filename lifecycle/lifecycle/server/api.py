@@ -8,10 +8,13 @@ from fastapi import APIRouter
 from a2wsgi import WSGIMiddleware
 from starlette.types import ASGIApp
 
+from lifecycle.auth.hasher import password_hashing_pool
+from lifecycle.auth.token_usage import token_usage_buffer
 from lifecycle.config import Config
 from lifecycle.django.app.asgi import application as django_app
 from lifecycle.endpoints.audit import setup_audit_endpoints
 from lifecycle.endpoints.auth import setup_auth_endpoints
+from lifecycle.endpoints.database import setup_database_endpoints
 from lifecycle.endpoints.info import setup_info_endpoints
 from lifecycle.endpoints.plugin import setup_plugin_endpoints
 from lifecycle.endpoints.records import setup_records_endpoints
@@ -23,6 +26,8 @@ from lifecycle.endpoints.job import setup_job_endpoints
 from lifecycle.endpoints.user import setup_user_endpoints
 from lifecycle.server.metrics_collector import setup_lifecycle_metrics
 from lifecycle.server.socketio import SocketIOServer, RegistryJobRetriever
+from racetrack_client.log.context_error import ContextError
+from racetrack_client.log.exception import log_exception
 from racetrack_client.log.logs import get_logger
 from racetrack_commons.api.asgi.asgi_server import serve_asgi_app
 from racetrack_commons.api.asgi.dispatcher import AsgiDispatcher
@@ -41,6 +46,12 @@ def run_api_server(config: Config, plugin_engine: PluginEngine, service_name: st
     app = create_fastapi_app(config, plugin_engine, service_name)
 
     def _on_shutdown():
+        logger.debug('Saving buffered last use time of auth tokens')
+        try:
+            token_usage_buffer.flush()
+        except BaseException as e:
+            log_exception(ContextError('Saving last use time of auth tokens failed', e))
+        password_hashing_pool.shutdown()
         logger.debug('Closing database connections')
         connections.close_all()
 
@@ -115,8 +126,13 @@ def setup_api_endpoints(api: APIRouter, config: Config, plugin_engine: PluginEng
     setup_audit_endpoints(api)
     setup_auth_endpoints(api, config)
     setup_records_endpoints(api)
+    setup_database_endpoints(api)
 
 
 def setup_socket_io_server(config: Config) -> socketio.WSGIApp:
     """Configure Socket.IO server for streaming data to clients"""
-    return SocketIOServer(RegistryJobRetriever(config)).wsgi_app
+    return SocketIOServer(
+        RegistryJobRetriever(config),
+        batch_max_lines=config.logs_stream_batch_max_lines,
+        batch_max_delay=config.logs_stream_batch_max_delay,
+    ).wsgi_app
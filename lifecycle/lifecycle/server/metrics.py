@@ -24,6 +24,18 @@ metric_event_stream_client_disconnected = Gauge(
     "lifecycle_event_stream_client_disconnected",
     "Total number of disconnections from the event stream",
 )
+metric_event_stream_queue_depth = Gauge(
+    "lifecycle_event_stream_queue_depth",
+    "Number of events waiting to be sent to the event stream clients",
+)
+metric_event_stream_dropped_events = Counter(
+    "lifecycle_event_stream_dropped_events",
+    "Number of events not delivered to the event stream clients that couldn't keep up",
+)
+metric_event_stream_slow_clients_disconnected = Counter(
+    "lifecycle_event_stream_slow_clients_disconnected",
+    "Number of event stream clients disconnected for not keeping up with the events",
+)
 
 metric_database_connection_opened = Counter(
     'lifecycle_database_connection_opened',
@@ -41,6 +53,25 @@ metric_database_queries_executed = Counter(
     'lifecycle_database_queries_executed',
     'Number of times database cursor has been created',
 )
+metric_database_query_cache_hits = Counter(
+    'lifecycle_database_query_cache_hits',
+    'Number of SQL queries taken from the cache of compiled queries',
+)
+metric_database_query_cache_misses = Counter(
+    'lifecycle_database_query_cache_misses',
+    'Number of SQL queries that had to be composed, not found in the cache of compiled queries',
+)
+metric_database_query_duration = Histogram(
+    'lifecycle_database_query_duration',
+    'Duration of executing SQL queries in seconds',
+    labelnames=['table', 'operation'],
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1.0, 2.5, 5.0, 10.0, float("inf")),
+)
+metric_database_pool_wait_duration = Histogram(
+    'lifecycle_database_pool_wait_duration',
+    'Time spent waiting for a connection from the database connection pool in seconds',
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1.0, 2.5, 5.0, float("inf")),
+)
 
 metric_job_model_fetch_duration = Histogram(
     'lifecycle_job_model_fetch_duration',
@@ -48,3 +79,47 @@ metric_job_model_fetch_duration = Histogram(
     buckets=(.001, .0025, .005, .01, .025, .05, .075, .1, .25, .5, .75, 1.0, 2.5, 5.0, 7.5,
              10.0, 25.0, 50.0, 75.0, 100.0, 250.0, 500.0, 750.0, 1000.0, float("inf")),
 )
+metric_job_registry_cache_hits = Counter(
+    'lifecycle_job_registry_cache_hits',
+    'Number of times the job registry was served from memory',
+)
+metric_job_registry_cache_misses = Counter(
+    'lifecycle_job_registry_cache_misses',
+    'Number of times the job registry had to be loaded from a database',
+)
+metric_infrastructure_jobs_listing_duration = Histogram(
+    'lifecycle_infrastructure_jobs_listing_duration',
+    'Duration of listing jobs deployed in an infrastructure target in seconds',
+    ['infrastructure'],
+    buckets=(.01, .025, .05, .1, .25, .5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, float("inf")),
+)
+metric_infrastructure_jobs_listing_failures = Counter(
+    'lifecycle_infrastructure_jobs_listing_failures',
+    'Number of failed or timed out attempts to list jobs deployed in an infrastructure target',
+    ['infrastructure'],
+)
+metric_auth_token_cache_hits = Counter(
+    'lifecycle_auth_token_cache_hits',
+    'Number of times the auth token and its subject were resolved from memory',
+)
+metric_auth_token_cache_misses = Counter(
+    'lifecycle_auth_token_cache_misses',
+    'Number of times the auth token and its subject had to be loaded from a database',
+)
+metric_token_usage_buffer_size = Gauge(
+    'lifecycle_token_usage_buffer_size',
+    'Number of auth tokens waiting for their last use time to be saved in a database',
+)
+metric_token_usage_flush_duration = Histogram(
+    'lifecycle_token_usage_flush_duration',
+    'Duration of saving the buffered last use times of auth tokens in seconds',
+    buckets=(.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1.0, 2.5, 5.0, float("inf")),
+)
+metric_password_hashing_queue_depth = Gauge(
+    'lifecycle_password_hashing_queue_depth',
+    'Number of passwords waiting to be hashed or being hashed by the worker processes',
+)
+metric_login_attempts_rejected = Counter(
+    'lifecycle_login_attempts_rejected',
+    'Number of login attempts rejected due to exceeding the rate limit',
+)
@@ -1,6 +1,7 @@
 import contextlib
 import threading
 from abc import ABC
+from typing import Callable
 
 import socketio
 from werkzeug.serving import make_server
@@ -17,6 +18,62 @@ from racetrack_commons.entities.dto import JobDto
 logger = get_logger(__name__)
 
 
+class LogLinesBatcher:
+    """
+    Accumulates the log lines of a session and emits them together,
+    once the batch is full or its oldest line has waited long enough
+    """
+    def __init__(self, emit: Callable[[list[str]], None], max_lines: int, max_delay: float):
+        self.emit = emit
+        self.max_lines = max_lines
+        self.max_delay = max_delay
+        self._lines: list[str] = []
+        self._timer: threading.Timer | None = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._emit_lock = threading.Lock()  # keeps the batches in order
+
+    def add(self, line: str):
+        with self._lock:
+            if self._closed:
+                return
+            self._lines.append(line)
+            full = len(self._lines) >= self.max_lines
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.max_delay, self._flush_safely)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self._emit_lock:
+            with self._lock:
+                lines, self._lines = self._lines, []
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if self._closed:
+                    return
+            if lines:
+                self.emit(lines)
+
+    def close(self):
+        """Stop emitting, discarding the pending lines"""
+        with self._lock:
+            self._closed = True
+            self._lines = []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _flush_safely(self):
+        try:
+            self.flush()
+        except BaseException as e:
+            log_exception(e)
+
+
 class LogSessionDetails(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -26,6 +83,7 @@ class LogSessionDetails(BaseModel):
     session_id: str
     logs_streamer: LogsStreamer
     tail: int | None  # number of recent lines to show
+    batcher: LogLinesBatcher | None = None  # None if the client consumes the lines one by one
 
 
 class JobRetriever(ABC):
@@ -42,14 +100,18 @@ class RegistryJobRetriever(JobRetriever):
 
 
 class SocketIOServer:
-    def __init__(self, job_retriever: JobRetriever):
+    def __init__(self, job_retriever: JobRetriever, batch_max_lines: int = 100, batch_max_delay: float = 0.05):
         """
         Socket.IO server for streaming data to clients
+        :param batch_max_lines: maximum number of log lines sent in a single batch
+        :param batch_max_delay: maximum number of seconds the log lines are held back to be sent in a batch
         """
         self.sio = socketio.Server(async_mode='threading')
         self.log_sessions_by_client: dict[str, LogSessionDetails] = {}  # Map Client ID to session details
         self.log_sessions_by_id: dict[str, LogSessionDetails] = {}  # Map Session ID to session details
         self.job_retriever: JobRetriever = job_retriever
+        self.batch_max_lines: int = batch_max_lines
+        self.batch_max_delay: float = batch_max_delay
 
         @self.sio.event
         def connect(client_id: str, environ):
@@ -63,7 +125,9 @@ class SocketIOServer:
                     return self.log_sessions_by_client[client_id].session_id
                 else:
                     resource_properties = data.get('resource_properties', {})
-                    return self.open_logs_session(client_id, resource_properties)
+                    # clients supporting "logs_nextlines" event ask for the batches, others get the lines one by one
+                    batched = bool(data.get('batched', False))
+                    return self.open_logs_session(client_id, resource_properties, batched)
             except BaseException as e:
                 log_exception(e)
 
@@ -75,7 +139,7 @@ class SocketIOServer:
 
         self.wsgi_app = socketio.WSGIApp(self.sio, socketio_path='lifecycle/socket.io')
 
-    def open_logs_session(self, client_id: str, resource_properties: dict[str, str]) -> str:
+    def open_logs_session(self, client_id: str, resource_properties: dict[str, str], batched: bool = False) -> str:
         logger.info(f'Creating log session for client: {client_id}')
         job_name = resource_properties['job_name']
         job_version = resource_properties['job_version']
@@ -94,6 +158,12 @@ class SocketIOServer:
             logs_streamer=infrastructure.logs_streamer,
             tail=int(tail) if tail else None,
         )
+        if batched:
+            session.batcher = LogLinesBatcher(
+                emit=lambda lines: self.emit_logs_nextlines(client_id, lines),
+                max_lines=self.batch_max_lines,
+                max_delay=self.batch_max_delay,
+            )
         self.log_sessions_by_client[client_id] = session
         self.log_sessions_by_id[session_id] = session
 
@@ -106,6 +176,8 @@ class SocketIOServer:
 
     def close_logs_session(self, session: LogSessionDetails):
         session.logs_streamer.close_session(session.session_id)
+        if session.batcher is not None:
+            session.batcher.close()
         del self.log_sessions_by_client[session.client_id]
         del self.log_sessions_by_id[session.session_id]
         logger.info(f'Log session closed: {session.session_id}')
@@ -116,10 +188,18 @@ class SocketIOServer:
 
     def broadcast_logs_nextline(self, session_id: str, message: str):
         session = self.log_sessions_by_id[session_id]
+        if session.batcher is not None:
+            session.batcher.add(message)
+            return
         self.sio.call('logs_nextline', {
             'line': message,
         }, to=session.client_id)
 
+    def emit_logs_nextlines(self, client_id: str, lines: list[str]):
+        self.sio.call('logs_nextlines', {
+            'lines': lines,
+        }, to=client_id)
+
     def disconnect_all(self):
         for client_id in list(self.log_sessions_by_client.keys()):
             self.sio.disconnect(client_id, ignore_queue=True)
@@ -15,9 +15,8 @@ def clean_up_async_job_calls(config: Config):
 
     mapper = LifecycleCache.record_mapper()
     condition = QueryCondition(f'started_at < {mapper.placeholder}', older_than)
-    records = mapper.filter(tables.AsyncJobCall, condition=condition)
+    record_ids = [record.id for record in mapper.stream(tables.AsyncJobCall, condition=condition, read_only=True)]
     
-    if records:
-        for record in records:
-            mapper.delete_record(record)
-        logger.info(f'{len(records)} old Async job call models deleted')
+    if record_ids:
+        mapper.delete_many(tables.AsyncJobCall, record_ids)
+        logger.info(f'{len(record_ids)} old Async job call models deleted')
@@ -1,5 +1,13 @@
-from lifecycle.auth.hasher import make_password
-from lifecycle.auth.authenticate_password import check_password
+from datetime import datetime
+
+import pytest
+
+from lifecycle.auth.hasher import get_hasher, make_password
+from lifecycle.auth.authenticate_password import authenticate, check_password
+from lifecycle.auth.login_limiter import LoginRateLimiter
+from lifecycle.database.schema.tables import User
+from lifecycle.server.cache import LifecycleCache
+from racetrack_client.log.errors import TooManyRequests
 
 
 def test_password_verification():
@@ -23,3 +31,43 @@ def test_password_compatibility():
 
     assert check_password("admin", django_hash)
     assert not check_password("wrong_password", django_hash)
+
+
+def test_rehash_outdated_password_on_login():
+    mapper = LifecycleCache.record_mapper()
+    hasher = get_hasher()
+    outdated_hash = hasher.encode("secret_password", hasher.salt(), 1000)
+    user = mapper.create_from_dict(User, {
+        "username": "rehashed@example.com", "password": outdated_hash, "is_active": True,
+        "first_name": "", "last_name": "", "email": "", "is_staff": False, "is_superuser": False,
+        "date_joined": datetime.now(), "last_login": None,
+    })
+    try:
+        assert authenticate("rehashed@example.com", "wrong_password") is None
+        assert mapper.find_one(User, id=user['id']).password == outdated_hash
+
+        assert authenticate("rehashed@example.com", "secret_password") is not None
+        rehashed = mapper.find_one(User, id=user['id']).password
+        assert hasher.decode(rehashed)["iterations"] == hasher.iterations
+        assert check_password("secret_password", rehashed)
+    finally:
+        mapper.delete(User, id=user['id'])
+
+
+def test_login_rate_limit():
+    config = LifecycleCache.config
+    limiter = LoginRateLimiter()
+    original_limit = config.login_rate_limit
+    config.login_rate_limit = 2
+    try:
+        for _ in range(2):
+            limiter.check_attempt("limited@example.com")
+            limiter.record_failure("limited@example.com")
+        with pytest.raises(TooManyRequests):
+            limiter.check_attempt("limited@example.com")
+        limiter.check_attempt("another@example.com")
+
+        for _ in range(3):
+            limiter.check_attempt("successful@example.com")  # successful logins are not counted
+    finally:
+        config.login_rate_limit = original_limit
@@ -0,0 +1,147 @@
+import itertools
+import time
+
+from lifecycle.auth import authorize
+from lifecycle.auth.authorize import (
+    list_permitted_jobs,
+    list_permitted_resources,
+    query_endpoint_permission,
+    query_resource_permission,
+    query_scope_permission,
+)
+from lifecycle.auth.permission_index import PermissionIndexCache
+from lifecycle.database.schema.tables import AuthResourcePermission, AuthSubject, Job, JobFamily
+from lifecycle.database.table_model import new_uuid
+from lifecycle.server.cache import LifecycleCache
+from racetrack_client.utils.time import now
+from racetrack_commons.auth.scope import AuthScope
+from racetrack_commons.entities.dto import JobDto
+
+
+def test_permission_index_equivalent_to_sql():
+    mapper = LifecycleCache.record_mapper()
+    families = {name: JobFamily(id=new_uuid(), name=name) for name in ['acl-adder', 'acl-primer']}
+    mapper.create_many(list(families.values()))
+    jobs = {
+        (name, version): _new_job(families[name].id, name, version)
+        for name, version in itertools.product(families.keys(), ['1.0.0', '2.0.0'])
+    }
+    mapper.create_many(list(jobs.values()))
+    subjects = [AuthSubject(id=new_uuid(), user_id=None, esc_id=None, job_family_id=None) for _ in range(6)]
+    mapper.create_many(subjects)
+
+    def _permission(subject: AuthSubject, scope: AuthScope, family: str | None = None,
+                    job: tuple[str, str] | None = None, endpoint: str | None = None) -> AuthResourcePermission:
+        return AuthResourcePermission(
+            id=None, auth_subject_id=subject.id, scope=scope.value,
+            job_family_id=families[family].id if family else None,
+            job_id=jobs[job].id if job else None,
+            endpoint=endpoint,
+        )
+
+    mapper.create_many([
+        _permission(subjects[0], AuthScope.FULL_ACCESS),
+        _permission(subjects[1], AuthScope.READ_JOB),
+        _permission(subjects[1], AuthScope.CALL_JOB, family='acl-adder'),
+        _permission(subjects[2], AuthScope.CALL_JOB, job=('acl-adder', '1.0.0')),
+        _permission(subjects[2], AuthScope.DEPLOY_JOB, family='acl-primer', endpoint='/api/v1/perform'),
+        _permission(subjects[3], AuthScope.CALL_JOB, job=('acl-primer', '2.0.0'), endpoint='/api/v1/perform'),
+        _permission(subjects[3], AuthScope.FULL_ACCESS, family='acl-adder'),
+        _permission(subjects[4], AuthScope.CALL_JOB, family='acl-adder', job=('acl-primer', '1.0.0')),
+        _permission(subjects[4], AuthScope.READ_JOB, family='acl-primer', job=('acl-primer', '1.0.0')),
+    ])
+
+    try:
+        cache = PermissionIndexCache()
+        for _ in range(50):
+            if (index := cache.get_index()) is not None:
+                break
+            time.sleep(0.1)
+        assert index is not None, 'permission index should be available once changes are watched'
+
+        scopes = [AuthScope.READ_JOB.value, AuthScope.CALL_JOB.value, AuthScope.DEPLOY_JOB.value, AuthScope.CALL_ADMIN_API.value]
+        job_names = ['acl-adder', 'acl-primer', 'acl-missing']
+        versions = ['1.0.0', '2.0.0', '']
+        endpoints = ['/api/v1/perform', '/api/v1/other']
+        checks = 0
+        for subject, scope in itertools.product(subjects, scopes):
+            assert index.has_scope_permission(subject.id, scope) == query_scope_permission(subject, scope), \
+                f'scope permission mismatch for subject {subjects.index(subject)}, scope {scope}'
+            for job_name, version in itertools.product(job_names, versions):
+                assert index.has_resource_permission(subject.id, job_name, version, scope) \
+                    == query_resource_permission(subject, job_name, version, scope), \
+                    f'resource permission mismatch for subject {subjects.index(subject)}: {job_name} {version} {scope}'
+                for endpoint in endpoints:
+                    assert index.has_endpoint_permission(subject.id, job_name, version, endpoint, scope) \
+                        == query_endpoint_permission(subject, job_name, version, endpoint, scope), \
+                        f'endpoint permission mismatch for subject {subjects.index(subject)}: {job_name} {version} {endpoint} {scope}'
+                    checks += 1
+        assert checks == len(subjects) * len(scopes) * len(job_names) * len(versions) * len(endpoints)
+        assert index.has_endpoint_permission(subjects[2].id, 'acl-adder', '1.0.0', '/api/v1/other', AuthScope.CALL_JOB.value)
+        assert not index.has_resource_permission(subjects[2].id, 'acl-primer', '1.0.0', AuthScope.CALL_JOB.value), \
+            'permission to a job should not grant access to the same version of other jobs'
+
+        mapper.create(_permission(subjects[5], AuthScope.CALL_JOB, family='acl-primer'))
+        index = cache.get_index()
+        assert index is not None
+        assert index.has_resource_permission(subjects[5].id, 'acl-primer', '1.0.0', AuthScope.CALL_JOB.value), \
+            'new permission should rebuild the index'
+    finally:
+        for subject in subjects:
+            mapper.delete_record(subject)
+        for family in families.values():
+            mapper.delete_record(family)
+
+
+def test_list_permitted_resources(monkeypatch):
+    mapper = LifecycleCache.record_mapper()
+    mapper.create(family := JobFamily(id=new_uuid(), name='listed'))
+    mapper.create(job := _new_job(family.id, 'listed', '1.0.0'))
+    mapper.create(other_job := _new_job(family.id, 'listed', '2.0.0'))
+    subjects = [AuthSubject(id=new_uuid(), user_id=None, esc_id=None, job_family_id=None) for _ in range(3)]
+    mapper.create_many(subjects)
+    mapper.create_many([
+        AuthResourcePermission(id=None, auth_subject_id=subjects[0].id, scope=AuthScope.READ_JOB.value,
+                               job_family_id=family.id, job_id=None, endpoint=None),
+        AuthResourcePermission(id=None, auth_subject_id=subjects[1].id, scope=AuthScope.CALL_JOB.value,
+                               job_family_id=None, job_id=job.id, endpoint='/api/v1/perform'),
+        AuthResourcePermission(id=None, auth_subject_id=subjects[2].id, scope=AuthScope.FULL_ACCESS.value,
+                               job_family_id=None, job_id=None, endpoint=None),
+    ])
+    all_jobs = [
+        JobDto(id=job.id, name='listed', version='1.0.0', status='running', create_time=0, update_time=0),
+        JobDto(id=other_job.id, name='listed', version='2.0.0', status='running', create_time=0, update_time=0),
+        JobDto(id=new_uuid(), name='unlisted', version='1.0.0', status='running', create_time=0, update_time=0),
+    ]
+    try:
+        cache = PermissionIndexCache()
+        for _ in range(50):
+            if cache.get_index() is not None:
+                break
+            time.sleep(0.1)
+        monkeypatch.setattr(authorize, 'permission_index_cache', cache)
+        indexed = {scope: [list_permitted_resources(subject, scope) for subject in subjects]
+                   for scope in [AuthScope.READ_JOB.value, AuthScope.CALL_JOB.value]}
+        indexed_jobs = [list_permitted_jobs(subject, AuthScope.READ_JOB.value, all_jobs) for subject in subjects]
+
+        monkeypatch.setattr(cache, 'get_index', lambda: None)
+        queried = {scope: [list_permitted_resources(subject, scope) for subject in subjects]
+                   for scope in [AuthScope.READ_JOB.value, AuthScope.CALL_JOB.value]}
+        assert indexed == queried, 'index lookup should be equivalent to the database query'
+
+        assert [[j.version for j in jobs] for jobs in indexed_jobs] == [['1.0.0', '2.0.0'], [], ['1.0.0', '2.0.0', '1.0.0']], \
+            'family permission should grant access to all jobs of the family'
+        assert indexed[AuthScope.CALL_JOB.value][1].job_ids == {job.id}
+    finally:
+        for subject in subjects:
+            mapper.delete_record(subject)
+        mapper.delete_record(family)
+
+
+def _new_job(family_id: str, name: str, version: str) -> Job:
+    return Job(
+        id=new_uuid(), family_id=family_id, name=name, version=version, status='running',
+        create_time=now(), update_time=now(), manifest=None, internal_name=None, error=None, notice=None,
+        image_tag=None, deployed_by=None, last_call_time=None, infrastructure_target=None,
+        replica_internal_names=None, job_type_version='python3:1.0.0', infrastructure_stats=None,
+    )
@@ -0,0 +1,54 @@
+import time
+
+from lifecycle.auth.authenticate import find_auth_subject_by_token
+from lifecycle.auth.token_cache import AuthTokenCache
+from lifecycle.config import Config
+from lifecycle.database.change_notifier import ChangeNotifier
+from lifecycle.database.engine_factory import create_db_engine
+from lifecycle.database.schema.tables import AuthSubject, AuthToken
+from lifecycle.database.table_model import new_uuid
+from lifecycle.server.cache import LifecycleCache
+
+
+def test_auth_token_cache_invalidated_on_change():
+    engine = LifecycleCache.db_engine()
+    mapper = LifecycleCache.record_mapper()
+    mapper.create(auth_subject := AuthSubject(id=new_uuid(), user_id=None, esc_id=None, job_family_id=None))
+    mapper.create(auth_token := AuthToken(id=new_uuid(), auth_subject_id=auth_subject.id, token='cached-token',
+                                          expiry_time=None, active=True, last_use_time=None))
+    cache = AuthTokenCache()
+    cache.get('cached-token', find_auth_subject_by_token)
+    for _ in range(50):
+        if mapper.change_notifier.is_synchronized():
+            break
+        time.sleep(0.1)
+    assert mapper.change_notifier.is_synchronized()
+
+    cache.get('cached-token', find_auth_subject_by_token)
+    engine.last_query()
+    cached_subject, cached_token = cache.get('cached-token', find_auth_subject_by_token)
+    assert engine.last_query() is None, 'token should be resolved from memory'
+    assert cached_subject.id == auth_subject.id
+    assert cached_token.id == auth_token.id
+    cached_token.active = False
+    assert cache.get('cached-token', find_auth_subject_by_token)[1].active, 'cached token should not be modified by the caller'
+
+    auth_token.active = False
+    mapper.update(auth_token)
+    assert not cache.get('cached-token', find_auth_subject_by_token)[1].active, \
+        'deactivated token should not be served from the cache'
+    mapper.delete_record(auth_subject)
+
+
+def test_auth_token_change_published_by_process_not_using_cache():
+    config = Config()
+    writer = ChangeNotifier(create_db_engine(config))
+    reader = ChangeNotifier(create_db_engine(config))
+    # deliver the published changes like the database would do
+    writer.engine.publish_change = lambda channel, payload: reader._on_change(payload)
+    generation = reader.generation('registry_authtoken')
+
+    writer.table_changed('registry_authtoken')
+
+    assert reader.generation('registry_authtoken') > generation, \
+        'token revoked by a process that has never used the cache should invalidate the caches of others'
@@ -0,0 +1,40 @@
+from lifecycle.auth.token_usage import TokenUsageBuffer
+from lifecycle.database.schema.tables import AuthSubject, AuthToken
+from lifecycle.database.table_model import new_uuid
+from lifecycle.server.cache import LifecycleCache
+
+
+def test_token_usage_buffered_and_flushed():
+    mapper = LifecycleCache.record_mapper()
+    mapper.create(auth_subject := AuthSubject(id=new_uuid(), user_id=None, esc_id=None, job_family_id=None))
+    tokens = [
+        AuthToken(id=new_uuid(), auth_subject_id=auth_subject.id, token=f'used-token-{i}',
+                  expiry_time=None, active=True, last_use_time=None)
+        for i in range(3)
+    ]
+    try:
+        for auth_token in tokens:
+            mapper.create(auth_token)
+        buffer = TokenUsageBuffer()
+        buffer.record(tokens[0])
+        buffer.record(tokens[0])
+        buffer.record(tokens[1])
+        buffer.record(AuthToken(id=new_uuid(), auth_subject_id=auth_subject.id, token='deleted-token',
+                                expiry_time=None, active=True, last_use_time=None))
+        assert mapper.find_one(AuthToken, id=tokens[0].id).last_use_time is None, 'update should be deferred'
+
+        generation = mapper.change_notifier.generation('registry_authtoken')
+        buffer.flush()
+        assert mapper.change_notifier.generation('registry_authtoken') == generation, \
+            'saving last use time should not invalidate the token caches'
+        assert mapper.find_one(AuthToken, id=tokens[0].id).last_use_time is not None
+        assert mapper.find_one(AuthToken, id=tokens[1].id).last_use_time is not None
+        assert mapper.find_one(AuthToken, id=tokens[2].id).last_use_time is None
+
+        used_token = mapper.find_one(AuthToken, id=tokens[0].id)
+        buffer.record(used_token)
+        assert not buffer._last_uses, 'token used today should not be updated again'
+        buffer.record(tokens[1])
+        assert not buffer._last_uses, 'stale cached token used today should not be updated again'
+    finally:
+        mapper.delete_record(auth_subject)
@@ -1,4 +1,7 @@
+import time
+
 from lifecycle.config.config import Config
+from lifecycle.infrastructure.model import InfrastructureTarget
 from lifecycle.job.models_registry import (
     create_job_model,
     delete_job_model,
@@ -11,9 +14,16 @@ from lifecycle.job.models_registry import (
     read_latest_job_model,
     read_latest_wildcard_job_model,
     update_job,
+    update_jobs,
 )
-from lifecycle.job.registry import read_job
+from lifecycle.job.registry import list_job_registry, read_job, sync_registry_jobs
+from lifecycle.job.version_index import VersionIndex
+from lifecycle.monitor.base import JobMonitor
+from lifecycle.monitor.monitors import list_infrastructure_jobs
+from lifecycle.server.cache import LifecycleCache
+from racetrack_client.log.errors import EntityNotFound
 from racetrack_client.manifest.manifest import GitManifest, Manifest
+from racetrack_client.utils.semver import SemanticVersion, SemanticVersionPattern
 from racetrack_client.utils.time import datetime_to_timestamp, now
 from racetrack_commons.entities.dto import JobDto, JobStatus
 
@@ -77,3 +87,155 @@ def test_managing_job_models():
     job2.status = JobStatus.ERROR.value
     update_job(job2)
     assert read_job_model('tester', '2.0.0').status == JobStatus.ERROR.value
+
+    job2.id = job2_id
+    job2.status = JobStatus.LOST.value
+    update_jobs([job2])
+    assert read_job_model('tester', '2.0.0').status == JobStatus.LOST.value
+
+
+def test_job_registry_cache():
+    config = Config()
+    engine = LifecycleCache.db_engine()
+    notifier = LifecycleCache.record_mapper().change_notifier
+    jobs_count = len(list_job_registry(config))
+    for _ in range(50):
+        if notifier.is_synchronized():
+            break
+        time.sleep(0.1)
+    assert notifier.is_synchronized(), 'changes of SQLite database should be watched by polling'
+
+    list_job_registry(config)
+    engine.last_query()
+    jobs = list_job_registry(config)
+    assert engine.last_query() is None, 'job registry should be served from memory'
+    jobs[0].status = 'modified'
+    assert list_job_registry(config)[0].status != 'modified', 'cached jobs should not be modified by the caller'
+
+    job = JobDto(name='cached', version='1.0.0', status=JobStatus.RUNNING.value, create_time=0, update_time=0)
+    with LifecycleCache.record_mapper().transaction():
+        create_job_model(job)
+        assert len(list_job_registry(config)) == jobs_count + 1
+    assert len(list_job_registry(config)) == jobs_count + 1, 'written job should invalidate the cache'
+
+    list_job_registry(config)
+    engine.last_query()
+    notifier._on_change('other-instance:registry_job')
+    assert len(list_job_registry(config)) == jobs_count + 1
+    assert engine.last_query() is not None, 'change made by another instance should invalidate the cache'
+
+    assert read_latest_job_model('cached').version == '1.0.0', 'version index should be updated'
+    assert read_latest_wildcard_job_model('cached', '1.x').version == '1.0.0'
+
+    delete_job_model('cached', '1.0.0')
+    assert len(list_job_registry(config)) == jobs_count
+    try:
+        read_latest_job_model('cached')
+        assert False, 'it should raise EntityNotFound'
+    except EntityNotFound:
+        pass
+
+
+def test_change_notifier_subscription():
+    notifier = LifecycleCache.record_mapper().change_notifier
+    changed_tables: list[str | None] = []
+    notifier.subscribe(changed_tables.append)
+    try:
+        job = JobDto(name='subscribed', version='1.0.0', status=JobStatus.RUNNING.value, create_time=0, update_time=0)
+        with LifecycleCache.record_mapper().transaction():
+            create_job_model(job)
+            assert 'registry_job' not in changed_tables, 'subscribers should be notified after commit'
+        assert 'registry_job' in changed_tables
+
+        changed_tables.clear()
+        notifier._on_change(':registry_job')
+        assert changed_tables == ['registry_job'], 'change notified by a database trigger should be received'
+        changed_tables.clear()
+        notifier._on_change(f'{notifier.instance_id}:registry_job')
+        assert changed_tables == [], 'own change notified by a database trigger should be ignored'
+
+        published: list[str] = []
+        original_publish_change = notifier.engine.publish_change
+        notifier.engine.publish_change = lambda channel, payload: published.append(payload)
+        try:
+            delete_job_model('subscribed', '1.0.0')
+        finally:
+            notifier.engine.publish_change = original_publish_change
+        assert not [payload for payload in published if payload.endswith(':registry_job')], \
+            'jobs table changes should be published only by the database trigger'
+    finally:
+        notifier.unsubscribe(changed_tables.append)
+
+
+def test_sync_registry_jobs_with_unresponsive_infrastructure():
+    config = Config(infrastructure_listing_timeout=0.2)
+
+    class FakeJobMonitor(JobMonitor):
+        def __init__(self, list_jobs):
+            self._list_jobs = list_jobs
+
+        def list_jobs(self, config: Config):
+            return self._list_jobs()
+
+        def check_job_condition(self, job, deployment_timestamp=0, on_job_alive=None, logs_on_error=True):
+            pass
+
+        def read_recent_logs(self, job, tail=20):
+            return ''
+
+    hang_calls = []
+
+    def _hang():
+        hang_calls.append(1)
+        time.sleep(2)
+        return []
+
+    def _fail():
+        raise RuntimeError('infrastructure is down')
+
+    class FakePluginEngine:
+        def invoke_plugin_hook(self, _hook):
+            return [{
+                'fast': InfrastructureTarget(job_monitor=FakeJobMonitor(lambda: [
+                    JobDto(name='synced', version='1.0.0', status=JobStatus.ERROR.value, create_time=0, update_time=0,
+                           infrastructure_target='fast'),
+                ])),
+                'slow': InfrastructureTarget(job_monitor=FakeJobMonitor(_hang)),
+                'broken': InfrastructureTarget(job_monitor=FakeJobMonitor(_fail)),
+            }]
+
+    for version, infrastructure in [('1.0.0', 'fast'), ('2.0.0', 'fast'), ('3.0.0', 'slow'), ('4.0.0', 'broken')]:
+        create_job_model(JobDto(name='synced', version=version, status=JobStatus.RUNNING.value,
+                                create_time=0, update_time=0, infrastructure_target=infrastructure))
+
+    start_time = time.time()
+    sync_registry_jobs(config, FakePluginEngine())
+    assert time.time() - start_time < 1, 'hanging infrastructure should not block the synchronization'
+
+    assert read_job_model('synced', '1.0.0').status == JobStatus.ERROR.value
+    assert read_job_model('synced', '2.0.0').status == JobStatus.LOST.value
+    assert read_job_model('synced', '3.0.0').status == JobStatus.RUNNING.value, 'timed out infrastructure should be skipped'
+    assert read_job_model('synced', '4.0.0').status == JobStatus.RUNNING.value, 'failed infrastructure should be skipped'
+
+    sync_registry_jobs(config, FakePluginEngine())
+    assert len(hang_calls) == 1, 'hanging listing should not be started again until it finishes'
+
+    _, failed_infrastructures = list_infrastructure_jobs(Config(infrastructure_listing_timeout=5), FakePluginEngine())
+    assert 'slow' in failed_infrastructures, 'result of the listing started before should not be used'
+
+    for version in ['1.0.0', '2.0.0', '3.0.0', '4.0.0']:
+        delete_job_model('synced', version)
+
+
+def test_version_index_matches_semantic_version():
+    versions = ['0.0.1', '1.0.0', '1.2.0', '1.2.3', '1.2.10', '1.10.1', '1.3.0-dev', '2.0.0-alpha', '2.1.0', '10.0.0']
+    index = VersionIndex([('adder', version) for version in versions] + [('beta', '1.0.0-beta')])
+
+    assert index.latest('adder') == SemanticVersion.find_latest_stable(versions, key=lambda v: v) == '10.0.0'
+    patterns = ['x', '1.x', '1.x.x', '1.2.x', '1.3.x', 'x.2.x', 'x.x.1', '2.x', '3.x', '10.x', '01.x', '1.2.3.x']
+    for pattern in patterns:
+        expected = SemanticVersion.find_latest_wildcard(SemanticVersionPattern.from_x_pattern(pattern), versions, key=lambda v: v)
+        assert index.latest_wildcard('adder', pattern) == expected, f'pattern {pattern}'
+
+    assert index.has_job('beta') and index.latest('beta') is None
+    assert not index.has_job('nil') and index.latest_wildcard('nil', '1.x') is None
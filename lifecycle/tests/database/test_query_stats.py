@@ -0,0 +1,46 @@
+from lifecycle.config import Config
+from lifecycle.database.engine_factory import create_db_engine
+from lifecycle.database.query_stats import QueryStats, _parse_query_shape
+from lifecycle.database.record_mapper import RecordMapper
+from lifecycle.database.schema.tables import JobFamily
+from lifecycle.database.table_model import new_uuid
+
+
+def test_parse_query_shape():
+    shape = _parse_query_shape(b'select "id", "name" from "registry_jobfamily" where id in (%s, %s, %s)')
+    assert (shape.operation, shape.table) == ('select', 'registry_jobfamily')
+    assert shape.normalized == 'select "id", "name" from "registry_jobfamily" where id in (...)'
+
+    shape = _parse_query_shape('insert into registry_jobfamily (id, name) values (?, ?), (?, ?), (?, ?) returning id')
+    assert (shape.operation, shape.table) == ('insert', 'registry_jobfamily')
+    assert shape.normalized == 'insert into registry_jobfamily (id, name) values (...), ... returning id'
+
+    assert _parse_query_shape('update registry_job set status = ? where id = ?').table == 'registry_job'
+    assert _parse_query_shape('delete from registry_job where id = ?').operation == 'delete'
+    assert _parse_query_shape('begin').operation == 'begin'
+
+
+def test_slowest_queries():
+    stats = QueryStats(slow_query_threshold=0.1)
+    stats.observe('select id from registry_job where id = ?', ['1'], 0.05)
+    stats.observe('select id from registry_job where id = ?', ['1'], 0.2)
+    stats.observe('select id from registry_job where id = ?', ['2'], 0.3)
+    stats.observe('delete from registry_job where id in (?, ?)', ['1', '2'], 0.5)
+
+    slowest = stats.slowest_queries(limit=10)
+    assert [(shape.operation, shape.count) for shape in slowest] == [('delete', 1), ('select', 2)]
+    assert slowest[0].query == 'delete from registry_job where id in (...)'
+    assert slowest[0].params_shape == '[str, str]'
+    assert slowest[1].max_duration == 0.3
+    assert len(stats.slowest_queries(limit=1)) == 1
+
+
+def test_slow_query_log_finds_caller():
+    config = Config(database_slow_query_threshold=1e-9)
+    mapper = RecordMapper(create_db_engine(config))
+    mapper.create(JobFamily(id=new_uuid(), name='primer'))
+
+    slowest = mapper.query_wrapper.engine.query_stats.slowest_queries()
+    insert_shape = next(shape for shape in slowest if shape.operation == 'insert')
+    assert insert_shape.table == 'registry_jobfamily'
+    assert 'test_query_stats.py' in insert_shape.caller
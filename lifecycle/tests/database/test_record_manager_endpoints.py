@@ -6,7 +6,7 @@ from lifecycle.database.record_mapper import RecordMapper
 from lifecycle.endpoints.records import list_all_tables, create_record, RecordFieldsPayload, \
     count_table_records, CountRecordsRequest, list_table_records, FetchManyRecordsRequest, get_one_record, \
     update_record, delete_record, FetchManyRecordsResponse, enrich_record_names, ManyRecordsRequest, \
-    FetchManyNamesResponse
+    FetchManyNamesResponse, list_table_records_page
 from racetrack_client.log.errors import EntityNotFound
 
 
@@ -71,6 +71,45 @@ def test_endpoints_operations():
         pass
 
 
+def test_paginate_records_with_cursor():
+    mapper = RecordMapper(create_db_engine(Config()))
+    names = [f'family-{i:02}' for i in range(25)]
+    for name in names:
+        create_record(mapper, RecordFieldsPayload(fields={'name': name}), 'registry_jobfamily')
+
+    for order_by, expected_names in [('name', names), ('-name', names[::-1]), (None, None)]:
+        page_names: list[str] = []
+        cursor = None
+        pages = 0
+        while True:
+            page = list_table_records_page(mapper, 'registry_jobfamily', limit=10, cursor=cursor, order_by=order_by)
+            page_names += [record.fields['name'] for record in page.records]
+            pages += 1
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        assert pages == 3
+        if order_by is None:  # ordered by random IDs
+            assert sorted(page_names) == names
+        else:
+            assert page_names == expected_names
+
+    page = list_table_records_page(mapper, 'registry_jobfamily', limit=1_000_000_000, cursor=None, order_by='name')
+    assert len(page.records) == 25
+
+    try:
+        list_table_records_page(mapper, 'registry_job', limit=10, cursor=None, order_by='last_call_time')
+        assert False, 'Should have raised ValueError'
+    except ValueError:
+        pass
+
+    try:
+        list_table_records_page(mapper, 'registry_jobfamily', limit=10, cursor='invalid', order_by=None)
+        assert False, 'Should have raised ValueError'
+    except ValueError:
+        pass
+
+
 def test_enrich_foreign_user_name():
     mapper = RecordMapper(create_db_engine(Config()))
 
@@ -0,0 +1,64 @@
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from lifecycle.database.record_mapper import RecordMapper
+from lifecycle.database.schema.tables import AuthResourcePermission, AuthSubject, JobFamily
+from lifecycle.database.sqlite import engine as sqlite_engine
+from lifecycle.database.sqlite.engine import SQLiteEngine
+from lifecycle.database.table_model import new_uuid
+from racetrack_commons.auth.scope import AuthScope
+
+
+def test_wal_mode_reads_dont_wait_for_writer(tmp_path, monkeypatch):
+    db_path = tmp_path / 'db.sqlite3'
+    shutil.copy(sqlite_engine.DB_PATH, db_path)
+    monkeypatch.setattr(sqlite_engine, 'DB_PATH', str(db_path))
+    engine = SQLiteEngine(copy=False, log_queries=False, wal_mode=True, reader_pool_size=2)
+    mapper = RecordMapper(engine)
+    try:
+        assert engine.execute_sql_fetch_one('pragma journal_mode')['journal_mode'] == 'wal'
+        assert engine.database_status().pool_size == 3
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with mapper.transaction():
+                mapper.create(JobFamily(id=new_uuid(), name='primer'))
+                assert mapper.count(JobFamily) == 1, 'transaction should see its own changes'
+                concurrent_count = executor.submit(mapper.count, JobFamily).result(timeout=1)
+                assert concurrent_count == 0, 'reader should see the last committed snapshot without waiting'
+
+            assert executor.submit(mapper.count, JobFamily).result(timeout=1) == 1
+
+        mapper.create(auth_subject := AuthSubject(id=new_uuid(), user_id=None, esc_id=None, job_family_id=None))
+        mapper.create(permission := AuthResourcePermission(
+            id=None, auth_subject_id=auth_subject.id, scope=AuthScope.READ_JOB.value,
+            job_family_id=None, job_id=None, endpoint=None,
+        ))
+        assert permission.id is not None, 'insert returning generated key should go to the writer'
+        assert engine.database_status().pool_available == 2
+    finally:
+        engine.close()
+
+
+def test_wal_mode_shared_in_memory_copy():
+    engine = SQLiteEngine(copy=True, log_queries=False, wal_mode=True, reader_pool_size=2)
+    mapper = RecordMapper(engine)
+    try:
+        mapper.create(JobFamily(id=new_uuid(), name='primer'))
+        assert mapper.count(JobFamily) == 1, 'reader connections should share the in-memory database'
+
+        counted = threading.Event()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with mapper.transaction():
+                mapper.create(JobFamily(id=new_uuid(), name='adder'))
+                concurrent_count = executor.submit(lambda: (mapper.count(JobFamily), counted.set())[0])
+                time.sleep(0.1)
+                assert not counted.is_set(), 'shared-cache reader should wait for the table lock'
+            assert concurrent_count.result(timeout=5) == 2
+
+        assert mapper.count(JobFamily) == 2
+        other_mapper = RecordMapper(SQLiteEngine(copy=True, log_queries=False, wal_mode=True, reader_pool_size=1))
+        assert other_mapper.count(JobFamily) == 0, 'in-memory copies of different engines should be separate'
+    finally:
+        engine.close()
@@ -1,12 +1,14 @@
 import json
+from collections import Counter
 from datetime import timedelta
 
 from lifecycle.config import Config
+from lifecycle.database import table_model
 from lifecycle.database.base_engine import NoRowsAffected
 from lifecycle.database.condition_builder import QueryCondition
 from lifecycle.database.engine_factory import create_db_engine
 from lifecycle.database.record_mapper import RecordMapper
-from lifecycle.database.schema.tables import AuthResourcePermission, JobFamily, User, AuthSubject, Job
+from lifecycle.database.schema.tables import AuthResourcePermission, JobFamily, User, AuthSubject, AuthToken, Job
 from lifecycle.database.table_model import new_uuid, table_metadata
 from racetrack_client.log.errors import AlreadyExists
 from racetrack_client.utils.time import now, datetime_to_str
@@ -141,6 +143,16 @@ def test_update_only_changed_fields():
     assert db_engine.last_query() == 'update registry_jobfamily set id = ?, name = ? where id = ?'
     assert mapper.find_one(JobFamily, id=family_id).name == 'fresher'
 
+    db_engine.last_query()
+    job_family.name = 'fresher'
+    mapper.update(job_family, only_changed=True)
+    assert db_engine.last_query() is None
+
+    job_family = mapper.find_many(JobFamily, read_only=True, id=family_id)[0]
+    job_family.name = 'untracked'
+    mapper.update(job_family, only_changed=True)
+    assert db_engine.last_query() == 'update registry_jobfamily set id = ?, name = ? where id = ?'
+
 
 def test_delete_cascade():
     mapper = RecordMapper(create_db_engine(Config(database_log_queries=True)))
@@ -157,6 +169,82 @@ def test_delete_cascade():
     assert mapper.count(JobFamily) == 0
 
 
+def test_delete_cascade_dependency_graph():
+    mapper = RecordMapper(create_db_engine(Config()))
+    table_types = [JobFamily, Job, AuthSubject, AuthToken, AuthResourcePermission]
+    initial_counts = {table_type: mapper.count(table_type) for table_type in table_types}
+
+    job_families = [JobFamily(id=new_uuid(), name='primer'), JobFamily(id=new_uuid(), name='adder')]
+    for job_family in job_families:
+        mapper.create(job_family)
+        job = _create_test_job(job_family.name, job_family.id)
+        mapper.create(job)
+        auth_subject = AuthSubject(id=new_uuid(), user_id=None, esc_id=None, job_family_id=job_family.id)
+        mapper.create(auth_subject)
+        mapper.create(AuthToken(id=new_uuid(), auth_subject_id=auth_subject.id, token='jwt',
+                                expiry_time=None, active=True, last_use_time=None))
+        mapper.create(AuthResourcePermission(id=None, auth_subject_id=auth_subject.id, scope=AuthScope.READ_JOB.value,
+                                             job_family_id=None, job_id=job.id, endpoint=None))
+        mapper.create(AuthResourcePermission(id=None, auth_subject_id=auth_subject.id, scope=AuthScope.CALL_JOB.value,
+                                             job_family_id=job_family.id, job_id=None, endpoint=None))
+
+    mapper.delete_record(job_families[0])
+    for table_type, remaining in zip(table_types, [1, 1, 1, 1, 2]):
+        assert mapper.count(table_type) == initial_counts[table_type] + remaining, \
+            f'{table_type.__name__} should have {remaining} new records left'
+    assert mapper.find_one(Job, family_id=job_families[1].id).name == 'adder'
+
+
+def test_bulk_operations():
+    mapper = RecordMapper(create_db_engine(Config()))
+    initial_permissions = mapper.count(AuthResourcePermission)
+
+    families = [JobFamily(id='', name=f'family-{i}') for i in range(5)]
+    mapper.create_many(families)
+    assert all(family.id for family in families)
+    assert mapper.find_one(JobFamily, id=families[3].id).name == 'family-3'
+
+    auth_subject = AuthSubject(id=new_uuid(), user_id=None, esc_id=None, job_family_id=families[0].id)
+    mapper.create(auth_subject)
+    permissions = [
+        AuthResourcePermission(id=None, auth_subject_id=auth_subject.id, scope=scope.value,
+                               job_family_id=families[0].id, job_id=None, endpoint=None)
+        for scope in [AuthScope.READ_JOB, AuthScope.CALL_JOB, AuthScope.DEPLOY_JOB]
+    ]
+    mapper.create_many(permissions)
+    assert mapper.count(AuthResourcePermission) == initial_permissions + 3
+    for permission in permissions:
+        assert mapper.find_one(AuthResourcePermission, id=permission.id).scope == permission.scope
+
+    families[1].name = 'renamed-1'
+    families[2].name = 'renamed-2'
+    mapper.update_many(families)
+    assert mapper.find_one(JobFamily, id=families[2].id).name == 'renamed-2'
+    assert mapper.find_one(JobFamily, id=families[4].id).name == 'family-4'
+
+    families[0].name = 'upserted-0'
+    new_family = JobFamily(id=new_uuid(), name='upserted-new')
+    mapper.upsert_many([families[0], new_family])
+    assert mapper.find_one(JobFamily, id=families[0].id).name == 'upserted-0'
+    assert mapper.find_one(JobFamily, id=new_family.id).name == 'upserted-new'
+
+    mapper.delete_many(JobFamily, [families[0].id, new_family.id])
+    assert not mapper.exists(JobFamily, id=families[0].id)
+    assert not mapper.exists(JobFamily, id=new_family.id)
+    assert mapper.exists(JobFamily, id=families[1].id)
+    assert mapper.count(AuthResourcePermission) == initial_permissions
+
+
+def test_stream_records():
+    mapper = RecordMapper(create_db_engine(Config()))
+    for i in range(25):
+        mapper.create(JobFamily(id=new_uuid(), name=f'family-{i:02}'))
+
+    condition = QueryCondition(f'name like {mapper.placeholder}', 'family-%')
+    records = mapper.stream(JobFamily, condition=condition, order_by=['name'], batch_size=10)
+    assert [record.name for record in records] == [f'family-{i:02}' for i in range(25)]
+
+
 def test_json_column():
     mapper = RecordMapper(create_db_engine(Config(database_log_queries=True)))
 
@@ -262,6 +350,32 @@ def test_casting_datetime_type():
     assert datetime_to_str(mapper.find_one(Job, id=job.id).update_time) == datetime_to_str(tomorrow)
 
 
+def test_table_metadata_computed_once(monkeypatch):
+    monkeypatch.setattr(table_model, '_metadata_registry', {})
+    build_counts: Counter = Counter()
+    build_table_metadata = table_model._build_table_metadata
+
+    def _counting_build_table_metadata(cls):
+        build_counts[cls] += 1
+        return build_table_metadata(cls)
+
+    monkeypatch.setattr(table_model, '_build_table_metadata', _counting_build_table_metadata)
+
+    mapper = RecordMapper(create_db_engine(Config()))
+    job_family = JobFamily(id=new_uuid(), name='primer')
+    mapper.create(job_family)
+    for i in range(10):
+        job = _create_test_job('primer', job_family.id, version=f'0.0.{i}')
+        mapper.create(job)
+        job.status = JobStatus.LOST.value
+        mapper.update(job)
+        mapper.delete_record(job)
+    mapper.delete_record(job_family)
+
+    assert build_counts[Job] == 1
+    assert max(build_counts.values()) == 1
+
+
 def test_get_record_name():
     mapper = RecordMapper(create_db_engine(Config()))
     mapper.create(job_family := JobFamily(id='', name='primer'))
@@ -270,6 +384,51 @@ def test_get_record_name():
     assert mapper.get_record_name(AuthSubject, auth_subject.id) == 'Job Family: primer'
 
 
+def test_transaction_commit():
+    mapper = RecordMapper(create_db_engine(Config()))
+
+    with mapper.transaction():
+        mapper.create(job_family := JobFamily(id=new_uuid(), name='primer'))
+        mapper.create(_create_test_job('primer', job_family.id, version='1.0.0'))
+        with mapper.transaction():
+            mapper.create(_create_test_job('primer', job_family.id, version='2.0.0'))
+        assert mapper.count(Job) == 2, 'changes should be visible within the transaction'
+
+    assert mapper.count(JobFamily) == 1
+    assert mapper.count(Job) == 2
+
+
+def test_transaction_rollback():
+    mapper = RecordMapper(create_db_engine(Config()))
+
+    try:
+        with mapper.transaction():
+            mapper.create(job_family := JobFamily(id=new_uuid(), name='primer'))
+            mapper.create(_create_test_job('primer', job_family.id, version='1.0.0'))
+            mapper.create(job_family)
+        assert False, 'it should raise exception'
+    except AlreadyExists:
+        pass
+
+    assert mapper.count(JobFamily) == 0
+    assert mapper.count(Job) == 0
+
+
+def test_query_cache_reuses_compiled_queries():
+    mapper = RecordMapper(create_db_engine(Config()))
+    mapper.create(job_family := JobFamily(id=new_uuid(), name='primer'))
+
+    mapper.find_one(JobFamily, id=job_family.id)
+    cached_queries = len(mapper.query_wrapper.query_cache)
+    for _ in range(3):
+        mapper.find_one(JobFamily, id=job_family.id)
+        assert not mapper.exists(JobFamily, id='nil')
+    assert len(mapper.query_wrapper.query_cache) == cached_queries + 1, 'only one new query shape should be cached'
+
+    records = mapper.filter(JobFamily, condition=QueryCondition.empty())
+    assert len(records) == 1
+
+
 def _create_test_job(
     name: str,
     family_id: str,
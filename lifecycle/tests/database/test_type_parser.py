@@ -0,0 +1,48 @@
+from datetime import datetime, timezone
+
+from lifecycle.database.schema.tables import AuthResourcePermission, Job, User
+from lifecycle.database.type_parser import compile_dataclass_decoder, parse_typed_object
+
+
+def test_compiled_decoder_matches_generic_parser():
+    rows = [
+        (Job, {
+            'id': 'c6a5b4f0', 'family_id': 'f00', 'name': 'adder', 'version': '1.0.0', 'status': 'running',
+            'create_time': '2024-03-01T10:20:30Z', 'update_time': '2024-03-01 10:20:30.123456',
+            'manifest': 'name: adder', 'internal_name': None, 'error': None, 'notice': None,
+            'image_tag': None, 'deployed_by': 'admin', 'last_call_time': None,
+            'infrastructure_target': 'docker', 'replica_internal_names': '', 'job_type_version': 'python3:1.0.0',
+            'infrastructure_stats': '{}',
+        }),
+        (Job, {
+            'id': 'c6a5b4f0', 'family_id': 'f00', 'name': 'adder', 'version': '1.0.0', 'status': 'running',
+            'create_time': datetime(2024, 3, 1, 10, 20, 30, tzinfo=timezone.utc),
+            'update_time': 'Mar 1 2024 10:20:30', 'manifest': None, 'internal_name': None, 'error': None,
+            'notice': None, 'image_tag': None, 'deployed_by': None,
+            'last_call_time': '2024-03-01T10:20:30+02:00',
+            'infrastructure_target': None, 'replica_internal_names': None, 'job_type_version': 'python3:1.0.0',
+            'infrastructure_stats': None,
+        }),
+        (User, {
+            'id': '1', 'username': 'admin', 'email': '', 'first_name': '', 'last_name': '', 'password': '',
+            'date_joined': '2024-03-01T10:20:30Z', 'last_login': None,
+            'is_active': 1, 'is_staff': 0, 'is_superuser': True,
+        }),
+        (AuthResourcePermission, {
+            'id': None, 'auth_subject_id': 'a', 'scope': 'read_job', 'job_family_id': None, 'job_id': 'j', 'endpoint': None,
+        }),
+    ]
+    for table_type, row in rows:
+        decoded = compile_dataclass_decoder(table_type)(row)
+        assert decoded == parse_typed_object(row, table_type)
+
+    user = compile_dataclass_decoder(User)(rows[2][1])
+    assert user.id == 1
+    assert user.is_active is True and user.is_staff is False
+    assert user.date_joined == datetime(2024, 3, 1, 10, 20, 30, tzinfo=timezone.utc)
+
+    try:
+        compile_dataclass_decoder(User)({'nil': None})
+        assert False, 'it should raise KeyError'
+    except KeyError:
+        pass
@@ -0,0 +1,59 @@
+import asyncio
+
+from lifecycle.event_stream.broadcaster import CLOSE_CODE_TRY_AGAIN_LATER, SLOW_CLIENT_DISCONNECT, SLOW_CLIENT_DROP, Broadcaster
+
+
+class FakeWebSocket:
+    def __init__(self, blocked: bool = False):
+        self.sent: list[dict] = []
+        self.close_code: int | None = None
+        self.unblocked = asyncio.Event()
+        if not blocked:
+            self.unblocked.set()
+
+    async def send_media(self, event: dict):
+        await self.unblocked.wait()
+        self.sent.append(event)
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+
+
+def test_slow_client_events_dropped():
+    async def _test():
+        broadcaster = Broadcaster(queue_size=2, slow_client_policy=SLOW_CLIENT_DROP, resync_event=lambda: {'snapshot': True})
+        fast_ws, slow_ws = FakeWebSocket(), FakeWebSocket(blocked=True)
+        subscribers = [broadcaster.subscribe(fast_ws), broadcaster.subscribe(slow_ws)]
+        for i in range(5):
+            broadcaster.publish_nowait({'seq': i}, subscribers)
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        assert fast_ws.sent == [{'seq': i} for i in range(5)], 'slow client should not delay the others'
+
+        slow_ws.unblocked.set()
+        await asyncio.sleep(0.01)
+        assert slow_ws.sent == [{'seq': 0}, {'seq': 1}, {'seq': 2}, {'snapshot': True}], \
+            'events exceeding the queue should be dropped and followed by a resync event'
+        assert slow_ws.close_code is None
+        for subscriber in subscribers:
+            await broadcaster.unsubscribe(subscriber)
+
+    asyncio.run(_test())
+
+
+def test_slow_client_disconnected():
+    async def _test():
+        broadcaster = Broadcaster(queue_size=2, slow_client_policy=SLOW_CLIENT_DISCONNECT)
+        fast_ws, slow_ws = FakeWebSocket(), FakeWebSocket(blocked=True)
+        subscribers = [broadcaster.subscribe(fast_ws, [{'seq': -1}]), broadcaster.subscribe(slow_ws)]
+        for i in range(5):
+            broadcaster.publish_nowait({'seq': i}, subscribers)
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        assert fast_ws.sent == [{'seq': i} for i in range(-1, 5)], 'initial events should go first'
+        assert slow_ws.close_code == CLOSE_CODE_TRY_AGAIN_LATER
+        assert subscribers[1].closed
+        for subscriber in subscribers:
+            await broadcaster.unsubscribe(subscriber)
+
+    asyncio.run(_test())
@@ -0,0 +1,16 @@
+from lifecycle.event_stream.replay import ReplayLog
+
+
+def test_replay_log_truncation():
+    log = ReplayLog(max_size=3)
+    log.truncate()
+    assert log.changes_since(0) is None, 'history before the snapshot is unknown'
+    assert log.changes_since(1) == []
+
+    for i in range(5):
+        log.append(f'job-{i}')
+
+    assert [change.job_id for change in log.changes_since(3)] == ['job-2', 'job-3', 'job-4']
+    assert [change.seq for change in log.changes_since(5)] == [6]
+    assert log.changes_since(2) is None, 'evicted changes should require a snapshot'
+    assert log.changes_since(7) is None, 'sequence from the future should require a snapshot'
@@ -1,3 +1,5 @@
+import json
+
 import backoff
 import httpx
 import pytest
@@ -5,7 +7,7 @@ import pytest
 from lifecycle.config import Config
 from lifecycle.event_stream.client import EventStreamClient
 from lifecycle.event_stream.server import EventStreamServer
-from lifecycle.job.models_registry import create_job_model
+from lifecycle.job.models_registry import create_job_model, delete_job_model, update_job
 from lifecycle.server.api import create_fastapi_app
 from lifecycle.server.metrics_collector import unregister_metrics
 from racetrack_client.log.logs import configure_logs
@@ -63,13 +65,83 @@ def test_websocket_stream():
                 internal_name='tester-0.0.0-alpha',
                 infrastructure_target='docker',
             )
-            create_job_model(new_job)
+            job_id = create_job_model(new_job).id
 
-            _wait_until_equal(received_events, [{'event': 'job_models_changed'}], 'failed to receive job_models_changed event')
+            _wait_until(lambda: len(received_events) == 1, 'failed to receive job_models_changed event')
+            assert received_events[0]['event'] == 'job_models_changed'
+            change = received_events[0]['changes'][0]
+            assert change == {'seq': received_events[0]['seq'], 'job_id': job_id}, 'job data should not be streamed'
+            assert change['seq'] == received_events[0]['seq'] == socket_client.last_seq
+            assert received_events[0]['epoch'] == streamer.epoch == socket_client.epoch
 
         _wait_until(lambda: len(streamer.clients) == 0, 'all clients should be disconnected')
         _wait_until(lambda: not streamer.watcher_thread.is_alive(), 'watcher thread should be dead')
 
+        new_job.id = job_id
+        new_job.status = JobStatus.ERROR.value
+        update_job(new_job)
+
+        received_events.clear()
+        with socket_client.connect_async():
+            _wait_until(lambda: len(received_events) == 1, 'failed to receive missed changes on resume')
+            assert received_events[0]['changes'] == [{
+                'seq': socket_client.last_seq,
+                'job_id': job_id,
+            }], 'missed change should be replayed'
+
+        received_events.clear()
+        snapshot_client = EventStreamClient(f'ws://127.0.0.1:{port}/lifecycle/websocket/events',
+                                            on_event=lambda event: received_events.append(event), since=0)
+        with snapshot_client.connect_async():
+            _wait_until(lambda: len(received_events) == 1, 'failed to receive snapshot')
+            assert received_events[0]['event'] == 'job_models_snapshot'
+            assert job_id in received_events[0]['job_ids']
+            assert snapshot_client.last_seq == socket_client.last_seq
+
+        received_events.clear()
+        restarted_client = EventStreamClient(f'ws://127.0.0.1:{port}/lifecycle/websocket/events',
+                                             on_event=lambda event: received_events.append(event),
+                                             since=socket_client.last_seq - 1, epoch='previous-process')
+        with restarted_client.connect_async():
+            _wait_until(lambda: len(received_events) == 1, 'failed to receive snapshot')
+            assert received_events[0]['event'] == 'job_models_snapshot', \
+                'sequence from another epoch should require a snapshot'
+            assert restarted_client.epoch == streamer.epoch
+
+        delete_job_model('tester', '0.0.0-alpha')
+
+
+def test_client_resubscribes_on_missed_changes():
+    received_events = []
+    client = EventStreamClient('ws://127.0.0.1/lifecycle/websocket/events', since=5, epoch='e1',
+                               on_event=lambda event: received_events.append(event))
+    resubscribed_since = []
+
+    def _resubscribe():
+        resubscribed_since.append(client.last_seq)
+        client.should_exit = True
+
+    def _change(seq: int) -> dict:
+        return {'seq': seq, 'job_id': 'job'}
+
+    messages = iter([
+        {'event': 'job_models_changed', 'epoch': 'e1', 'seq': 5, 'changes': [_change(4), _change(5)]},
+        {'event': 'job_models_changed', 'epoch': 'e1', 'seq': 7, 'changes': [_change(5), _change(6), _change(7)]},
+        {'event': 'job_models_changed', 'epoch': 'e1', 'seq': 9, 'changes': [_change(9)]},
+    ])
+
+    class FakeWebSocket:
+        def recv(self) -> str:
+            return json.dumps(next(messages))
+
+    client.websocket = FakeWebSocket()
+    client._resubscribe = _resubscribe
+    client.receive_loop()
+
+    assert [event['seq'] for event in received_events] == [7], 'already known changes should be skipped'
+    assert [change['seq'] for change in received_events[0]['changes']] == [6, 7]
+    assert resubscribed_since == [7], 'client should resubscribe after the gap in the sequence'
+
 
 @backoff.on_exception(backoff.fibo, httpx.RequestError, max_time=5, jitter=None)
 def _wait_until_server_ready(port: int):
@@ -84,4 +156,4 @@ def _wait_until_equal(c1, c2, err_message: str):
 
 @backoff.on_exception(backoff.expo, AssertionError, factor=0.1, max_time=10, jitter=None)
 def _wait_until(condition, err_message: str):
-    assert condition, err_message
+    assert condition(), err_message
@@ -1,5 +1,6 @@
 
 
+from lifecycle.database.schema.dto_converter import parse_cached_manifest
 from racetrack_client.utils.datamodel import parse_dict_datamodels
 from racetrack_commons.entities.dto import JobDto
 
@@ -44,3 +45,15 @@ def test_convert_json_to_job_dto():
     assert job.manifest.resources.memory_max is None
     assert job.manifest.resources.cpu_min.plain_number == 1
     assert job.manifest.resources.cpu_max is None
+
+
+def test_parse_cached_manifest():
+    manifest_yaml = 'name: skynet\nowner_email: arnold@skynet.com\njobtype: python3\ngit:\n  remote: https://github.com\n'
+    manifest = parse_cached_manifest(manifest_yaml)
+    assert manifest is not None
+    assert manifest.name == 'skynet'
+    assert manifest.origin_yaml_ == manifest_yaml
+    assert parse_cached_manifest(''.join(manifest_yaml)) is manifest, 'manifest should be parsed once per content'
+    assert parse_cached_manifest(manifest_yaml.replace('skynet', 't800')).name == 't800'
+    assert parse_cached_manifest('name: [') is None
+    assert parse_cached_manifest(None) is None
@@ -0,0 +1,56 @@
+import threading
+import time
+
+from lifecycle.config import Config
+from lifecycle.job import reconcile
+from lifecycle.job.reconcile import JobReconciler
+from racetrack_commons.entities.dto import JobDto, JobStatus
+
+
+def test_reconcile_lost_jobs_concurrently(monkeypatch):
+    config = Config(reconciliation_concurrency=2, reconciliation_retry_delay=60)
+    jobs = [
+        JobDto(name=f'job-{index}', version='1.0.0', status=JobStatus.LOST.value, create_time=0, update_time=0,
+               last_call_time=index, infrastructure_target='docker' if index % 2 else 'kubernetes')
+        for index in range(8)
+    ] + [
+        JobDto(name='running', version='1.0.0', status=JobStatus.RUNNING.value, create_time=0, update_time=0),
+    ]
+    monkeypatch.setattr(reconcile, 'list_job_registry', lambda _config: jobs)
+
+    lock = threading.Lock()
+    running: dict[str, int] = {'docker': 0, 'kubernetes': 0}
+    max_running: dict[str, int] = {'docker': 0, 'kubernetes': 0}
+    order: list[str] = []
+
+    def _reprovision_job(job_name, job_version, *args):
+        job = next(job for job in jobs if job.name == job_name)
+        with lock:
+            order.append(job_name)
+            running[job.infrastructure_target] += 1
+            max_running[job.infrastructure_target] = max(max_running[job.infrastructure_target], running[job.infrastructure_target])
+        time.sleep(0.05)
+        with lock:
+            running[job.infrastructure_target] -= 1
+        if job_name == 'job-7':
+            raise RuntimeError('cluster is still down')
+
+    monkeypatch.setattr(reconcile, 'reprovision_job', _reprovision_job)
+    reconciler = JobReconciler()
+    reconciler.reconcile(config, None)
+
+    assert sorted(order) == [f'job-{index}' for index in range(8)], 'only lost jobs should be reprovisioned'
+    assert max_running == {'docker': 2, 'kubernetes': 2}, 'concurrency should be limited per infrastructure'
+    assert [name for name in order if name in {'job-7', 'job-5', 'job-3', 'job-1'}][:2] == ['job-7', 'job-5'], \
+        'recently called jobs should go first'
+    assert reconciler._retry_states['job-job-7-v-1-0-0'].failures == 1
+
+    order.clear()
+    reconciler.reconcile(config, None)
+    assert 'job-7' not in order, 'failed job should wait for its retry delay'
+
+    reconciler._retry_states['job-job-7-v-1-0-0'].next_attempt_time = 0
+    order.clear()
+    reconciler.reconcile(config, None)
+    assert 'job-7' in order
+    assert reconciler._retry_states['job-job-7-v-1-0-0'].failures == 2
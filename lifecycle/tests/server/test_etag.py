@@ -0,0 +1,30 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from racetrack_commons.api.response import etag_json_response
+
+
+def test_conditional_get_with_etag():
+    app = FastAPI()
+    jobs = [{'name': 'adder', 'version': '1.0.0'}]
+
+    @app.get('/job')
+    def _list_jobs(request: Request):
+        return etag_json_response(request, jobs)
+
+    client = TestClient(app)
+    response = client.get('/job')
+    assert response.status_code == 200
+    assert response.json() == jobs
+    etag = response.headers['etag']
+    assert etag.startswith('"')
+
+    response = client.get('/job', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.content == b''
+    assert response.headers['etag'] == etag
+
+    jobs.append({'name': 'adder', 'version': '1.0.1'})
+    response = client.get('/job', headers={'If-None-Match': etag})
+    assert response.status_code == 200, 'changed content should have a new ETag'
+    assert response.headers['etag'] != etag
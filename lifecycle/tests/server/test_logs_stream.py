@@ -1,10 +1,13 @@
+import time
 from threading import Thread
 from typing import Dict, Callable
 
+import socketio
+
 from lifecycle.infrastructure.model import InfrastructureTarget
 from lifecycle.monitor.base import LogsStreamer
 from lifecycle.server.cache import LifecycleCache
-from lifecycle.server.socketio import SocketIOServer, JobRetriever
+from lifecycle.server.socketio import LogLinesBatcher, SocketIOServer, JobRetriever
 from racetrack_client.client.socketio import LogsConsumer
 from racetrack_client.log.logs import get_logger
 from racetrack_commons.entities.dto import JobDto
@@ -34,6 +37,51 @@ def test_streaming_logs():
             wait_until_equal(fetched_logs, ['hello adder', 'more logs'], 'fetching logs failed')
 
 
+def test_streaming_logs_line_by_line():
+    LifecycleCache.infrastructure_targets = {
+        'dummy-infra': InfrastructureTarget(
+            logs_streamer=DummyLogsStreamer(),
+        ),
+    }
+
+    server = SocketIOServer(DummyJobRetriever())
+    port = free_tcp_port()
+    with server.run_async(port):
+        fetched_logs = []
+        sio = socketio.Client()
+
+        @sio.event
+        def logs_nextline(data):
+            fetched_logs.append(data.get('line'))
+            return True
+
+        sio.connect(f'http://127.0.0.1:{port}', socketio_path='lifecycle/socket.io', wait_timeout=10)
+        try:
+            # client not asking for batches
+            sio.call('subscribe_for_logs', {
+                'resource_properties': {'job_name': 'adder', 'job_version': 'latest'},
+            })
+            wait_until_equal(fetched_logs, ['hello adder', 'more logs'], 'fetching logs failed')
+        finally:
+            sio.disconnect()
+
+
+def test_log_lines_batcher():
+    batches = []
+    batcher = LogLinesBatcher(emit=lambda lines: batches.append(lines), max_lines=3, max_delay=0.1)
+
+    for i in range(7):
+        batcher.add(f'line {i}')
+    assert batches == [['line 0', 'line 1', 'line 2'], ['line 3', 'line 4', 'line 5']], 'full batches should be sent immediately'
+    wait_until_equal(batches, [['line 0', 'line 1', 'line 2'], ['line 3', 'line 4', 'line 5'], ['line 6']],
+                     'pending lines should be sent after a delay')
+
+    batcher.add('line 7')
+    batcher.close()
+    time.sleep(0.2)
+    assert len(batches) == 3, 'pending lines should be discarded on close'
+
+
 class DummyLogsStreamer(LogsStreamer):
     def create_session(self, session_id: str, resource_properties: Dict[str, str], on_next_line: Callable[[str, str], None]):
         job_name = resource_properties.get('job_name')
@@ -45,9 +45,17 @@ class LogsConsumer:
             on_next_line(data.get('line'))
             return True
 
+        @self.sio.event
+        def logs_nextlines(data):
+            """Event for retrieving a batch of new log lines"""
+            for line in data.get('lines', []):
+                on_next_line(line)
+            return True
+
     def _subscribe_for_logs(self):
         self.sio.call('subscribe_for_logs', {
             'resource_properties': self.resource_properties,
+            'batched': True,
         })
 
     @contextlib.contextmanager
@@ -8,3 +8,7 @@ class AlreadyExists(RuntimeError):
 
 class ValidationError(RuntimeError):
     pass
+
+
+class TooManyRequests(RuntimeError):
+    pass
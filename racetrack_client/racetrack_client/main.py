@@ -1,5 +1,6 @@
 import os
 import sys
+from pathlib import Path
 from typing import List, Optional, Dict
 
 import typer
@@ -22,6 +23,8 @@ from racetrack_client.log.logs import get_logger
 from racetrack_client.manifest.validate import validate_and_show_manifest
 from racetrack_client.utils.auth import AuthError
 from racetrack_client.utils.datamodel import datamodel_to_yaml_str
+from racetrack_client.utils.etag_cache import EtagCache
+from racetrack_client.utils.request import Requests
 
 logger = get_logger(__name__)
 
@@ -50,6 +53,7 @@ def _startup(
         configure_logs(log_level='error')
     else:
         configure_logs(log_level='debug' if verbose else 'info')
+    Requests.etag_cache = EtagCache(Path.home() / '.racetrack' / 'http-cache')
 
 @cli.callback(invoke_without_command=True)
 def default(ctx: typer.Context):
@@ -0,0 +1,65 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from racetrack_client.log.logs import get_logger
+
+logger = get_logger(__name__)
+
+
+class EtagCache:
+    """
+    Small on-disk cache of GET responses carrying an ETag,
+    so that the requests can be made conditional and unchanged content isn't transferred again.
+    Entries are keyed by URL and request headers (different users may see different content).
+    """
+    def __init__(self, cache_dir: Path, max_entries: int = 100):
+        self.cache_dir: Path = cache_dir
+        self.max_entries: int = max_entries
+
+    def load(self, url: str, headers: Optional[Dict[str, str]]) -> Optional[Tuple[str, bytes, str]]:
+        """Return ETag, content and content type of the cached response or None if not cached"""
+        entry_path = self._entry_path(url, headers)
+        try:
+            entry = json.loads(entry_path.read_text())
+            return entry['etag'], entry['content'].encode(), entry['content_type']
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug(f'ignoring corrupted HTTP cache entry {entry_path}: {e}')
+            return None
+
+    def save(self, url: str, headers: Optional[Dict[str, str]], etag: str, content: bytes, content_type: str):
+        try:
+            content_str = content.decode()
+        except UnicodeDecodeError:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            entry_path = self._entry_path(url, headers)
+            tmp_path = entry_path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps({
+                'etag': etag,
+                'content': content_str,
+                'content_type': content_type,
+            }))
+            tmp_path.chmod(0o600)
+            os.replace(tmp_path, entry_path)
+            self._evict_oldest()
+        except OSError as e:
+            logger.debug(f'failed to save HTTP cache entry: {e}')
+
+    def _entry_path(self, url: str, headers: Optional[Dict[str, str]]) -> Path:
+        key_headers = sorted((name.lower(), value) for name, value in (headers or {}).items() if value is not None)
+        key = hashlib.sha256(json.dumps([url, key_headers]).encode()).hexdigest()
+        return self.cache_dir / f'{key}.json'
+
+    def _evict_oldest(self):
+        entries = list(self.cache_dir.glob('*.json'))
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda path: path.stat().st_mtime)
+        for path in entries[:len(entries) - self.max_entries]:
+            path.unlink(missing_ok=True)
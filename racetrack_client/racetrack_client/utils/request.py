@@ -10,6 +10,7 @@ import urllib.parse as urlparse
 from urllib.parse import urlencode
 
 from racetrack_client.log.context_error import ContextError
+from racetrack_client.utils.etag_cache import EtagCache
 
 DEBUG_MODE = False  # print the actual bytes sent in requests and responses
 
@@ -100,6 +101,7 @@ class Response:
 class Requests:
 
     insecure: bool = True  # whether to verify SSL certificates
+    etag_cache: Optional[EtagCache] = None  # cache for making GET requests conditional with "If-None-Match"
 
     @classmethod
     def get(
@@ -209,6 +211,13 @@ class Requests:
         if timeout is not None:
             kwargs['timeout'] = timeout
 
+        cached_entry = None
+        etag_cache = cls.etag_cache if method == 'GET' else None
+        if etag_cache is not None and not req.has_header('If-none-match'):
+            cached_entry = etag_cache.load(url, headers)
+            if cached_entry is not None:
+                req.add_header('If-None-Match', cached_entry[0])
+
         if not req.has_header('User-Agent'):
             req.add_header('User-Agent', 'request')
 
@@ -225,14 +234,29 @@ class Requests:
 
         try:
             http_response: HTTPResponse = request.urlopen(req, **kwargs)
+            content = http_response.read()
+            etag = http_response.headers['ETag']
+            if etag_cache is not None and etag and http_response.status == 200:
+                etag_cache.save(url, headers, etag, content, http_response.headers['Content-Type'] or '')
             return Response(
                 url=url,
                 method=method,
                 status_code=http_response.status,
-                content=http_response.read(),
+                content=content,
                 headers=http_response.headers,
             )
         except HTTPError as e:
+            if e.code == 304 and cached_entry is not None:
+                _, cached_content, content_type = cached_entry
+                del e.headers['Content-Type']
+                e.headers['Content-Type'] = content_type
+                return Response(
+                    url=url,
+                    method=method,
+                    status_code=200,
+                    content=cached_content,
+                    headers=e.headers,
+                )
             return Response(
                 url=url,
                 method=method,
@@ -1,6 +1,7 @@
 import pytest
 import httpretty
 
+from racetrack_client.utils.etag_cache import EtagCache
 from racetrack_client.utils.request import Requests, build_url_with_params
 
 _url = 'http://localhost/blahblah'
@@ -129,3 +130,29 @@ def test_build_url_with_params():
     url = "http://example.com/search?q=question"
     params = {'lang': 'en', 'tag': 'this is a sentence?! &'}
     assert build_url_with_params(url, params) == "http://example.com/search?q=question&lang=en&tag=this+is+a+sentence%3F%21+%26"
+
+
+@pytest.mark.filterwarnings("ignore:datetime.datetime.utcnow()")
+@httpretty.activate(verbose=True, allow_net_connect=False)
+def test_conditional_get_from_etag_cache(tmp_path):
+    httpretty.register_uri(
+        httpretty.GET,
+        _url,
+        responses=[
+            httpretty.Response(body='[{"name": "adder"}]', status=200, content_type='application/json',
+                               adding_headers={'ETag': '"v1"'}),
+            httpretty.Response(body='', status=304, adding_headers={'ETag': '"v1"'}),
+        ],
+    )
+    Requests.etag_cache = EtagCache(tmp_path)
+    try:
+        assert Requests.get(_url).json() == [{'name': 'adder'}]
+        assert httpretty.last_request().headers.get('If-None-Match') is None
+
+        response = Requests.get(_url)
+        assert httpretty.last_request().headers.get('If-None-Match') == '"v1"'
+        assert response.status_code == 200
+        assert response.json() == [{'name': 'adder'}]
+        assert response.is_json
+    finally:
+        Requests.etag_cache = None
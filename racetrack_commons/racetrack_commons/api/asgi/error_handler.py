@@ -7,7 +7,7 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from starlette.types import ASGIApp, Receive, Scope, Send
 
-from racetrack_client.log.errors import EntityNotFound, AlreadyExists, ValidationError
+from racetrack_client.log.errors import EntityNotFound, AlreadyExists, TooManyRequests, ValidationError
 from racetrack_commons.api.metrics import metric_internal_server_errors
 from racetrack_commons.api.tracing import log_request_exception_with_tracing
 from racetrack_commons.auth.auth import UnauthorizedError
@@ -51,6 +51,15 @@ def register_error_handlers(api: FastAPI):
             status_code=409,
         )
 
+    @api.exception_handler(TooManyRequests)
+    def too_many_requests_error_handler(request: Request, error: TooManyRequests):
+        """Too Many Requests error"""
+        log_request_exception_with_tracing(request, error)
+        return JSONResponse(
+            content={'error': str(error), 'type': type(error).__name__},
+            status_code=429,
+        )
+
     @api.exception_handler(ValidationError)
     def validation_error_handler(request: Request, error: AlreadyExists):
         """Validation Error"""
@@ -1,10 +1,14 @@
 import dataclasses
+import hashlib
 import json
 from datetime import date, datetime
 from pathlib import PosixPath
+from typing import Any
 
+from fastapi import Request, Response
+from fastapi.encoders import ENCODERS_BY_TYPE, jsonable_encoder
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from fastapi.encoders import ENCODERS_BY_TYPE
 
 from racetrack_client.utils.datamodel import convert_to_json_serializable
 from racetrack_client.utils.quantity import Quantity
@@ -32,3 +36,23 @@ def register_response_json_encoder():
     ENCODERS_BY_TYPE[date] = lambda o: o.isoformat()
     ENCODERS_BY_TYPE[datetime] = lambda o: o.isoformat()
     ENCODERS_BY_TYPE[Quantity] = lambda o: getattr(o, '__to_json__')()
+
+
+def etag_json_response(request: Request, content: Any) -> Response:
+    """
+    Serialize content to a JSON response with a strong ETag computed from its body.
+    Return "304 Not Modified" without a body if the client already has the same version ("If-None-Match" header).
+    """
+    response = JSONResponse(jsonable_encoder(content))
+    etag = f'"{hashlib.sha256(response.body).hexdigest()}"'
+    if _etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers={'ETag': etag})
+    response.headers['ETag'] = etag
+    return response
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(',')]
+    return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
@@ -0,0 +1,493 @@
+"""
+Benchmarks of Lifecycle's database layer, running against a temporary copy of the local SQLite database.
+Usage: python database_benchmark.py <benchmark> [--records N]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+SRC_DB_PATH = Path(__file__).parent.parent.parent / 'lifecycle' / 'lifecycle' / 'django' / 'db.sqlite3'
+TMP_DB_PATH = Path(tempfile.mkdtemp()) / 'db.sqlite3'
+shutil.copy(SRC_DB_PATH, TMP_DB_PATH)
+os.environ['DB_PATH'] = str(TMP_DB_PATH)
+
+from lifecycle.database.record_mapper import RecordMapper  # noqa: E402
+from lifecycle.database.schema.tables import AuditLogEvent, AuthResourcePermission, AuthSubject, Job, JobFamily  # noqa: E402
+from lifecycle.database.sqlite.engine import SQLiteEngine  # noqa: E402
+from lifecycle.database.table_model import TableModel, get_primary_key_value, new_uuid, record_to_dict  # noqa: E402
+from lifecycle.database.type_parser import compile_dataclass_decoder, parse_typed_object  # noqa: E402
+from racetrack_client.utils.time import now  # noqa: E402
+from racetrack_commons.auth.scope import AuthScope  # noqa: E402
+from racetrack_commons.entities.dto import JobStatus  # noqa: E402
+
+benchmarks: dict[str, Callable[[int], None]] = {}
+
+
+def benchmark(func: Callable[[int], None]) -> Callable[[int], None]:
+    benchmarks[func.__name__.removeprefix('benchmark_')] = func
+    return func
+
+
+@benchmark
+def benchmark_transactions(records: int):
+    """Compare statements per second with autocommit against a single unit-of-work transaction"""
+    mapper = RecordMapper(SQLiteEngine(copy=False, log_queries=False))
+
+    def create_jobs(family_name: str):
+        mapper.create(family := JobFamily(id=new_uuid(), name=family_name))
+        for i in range(records):
+            mapper.create(_new_job(family.id, family_name, f'0.0.{i}'))
+
+    duration = _measure(lambda: create_jobs('autocommit'))
+    _report('autocommit', records + 1, duration)
+
+    def create_jobs_in_transaction():
+        with mapper.transaction():
+            create_jobs('transaction')
+
+    duration = _measure(create_jobs_in_transaction)
+    _report('transaction', records + 1, duration)
+
+
+@benchmark
+def benchmark_row_decoding(records: int):
+    """Compare decoding Job rows with the generic type parser against the compiled per-table decoder"""
+    rows = [{
+        'id': new_uuid(), 'family_id': new_uuid(), 'name': 'adder', 'version': f'0.0.{i}',
+        'status': 'running', 'create_time': '2024-03-01T10:20:30Z', 'update_time': '2024-03-01 10:20:30.123456',
+        'manifest': 'name: adder', 'internal_name': None, 'error': None, 'notice': None, 'image_tag': '1',
+        'deployed_by': 'admin', 'last_call_time': None, 'infrastructure_target': 'docker',
+        'replica_internal_names': '', 'job_type_version': 'python3:1.0.0', 'infrastructure_stats': '{}',
+    } for i in range(records)]
+
+    duration = _measure(lambda: [parse_typed_object(row, Job) for row in rows])
+    _report('generic parser', records, duration, 'rows')
+    decoder = compile_dataclass_decoder(Job)
+    duration = _measure(lambda: [decoder(row) for row in rows])
+    _report('compiled decoder', records, duration, 'rows')
+
+
+@benchmark
+def benchmark_job_listing(records: int):
+    """Compare listing the job registry with tracking changes of the records against the read-only mode"""
+    mapper = RecordMapper(SQLiteEngine(copy=False, log_queries=False))
+    manifest = 'name: adder\n' + 'secret_runtime_env: {}\n' * 1000
+    with mapper.transaction():
+        mapper.create(family := JobFamily(id=new_uuid(), name='listing'))
+        for i in range(records):
+            job = _new_job(family.id, 'listing', f'0.0.{i}')
+            job.manifest = manifest
+            mapper.create(job)
+
+    def list_jobs_with_snapshots():
+        # former way of tracking changes: copying original fields of every record
+        records = mapper.list_all(Job, read_only=True)
+        for record in records:
+            setattr(record, '_original_fields', record_to_dict(record))
+
+    listings = {
+        'snapshot': list_jobs_with_snapshots,
+        'tracked': lambda: mapper.list_all(Job),
+        'read-only': lambda: mapper.list_all(Job, read_only=True),
+    }
+    for name, list_jobs in listings.items():
+        tracemalloc.start()
+        duration = _measure(list_jobs)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        _report(name, records, duration, 'rows')
+        print(f'{name}: peak memory {peak_memory / 1024 / 1024:.2f} MiB')
+
+
+@benchmark
+def benchmark_cascade_delete(records: int):
+    """Compare deleting a job family with its jobs and 10 permissions per job row by row against set-based cascade"""
+    mapper = RecordMapper(SQLiteEngine(copy=False, log_queries=False))
+    auth_subject = AuthSubject(id=new_uuid(), user_id=None, esc_id=None, job_family_id=None)
+    mapper.create(auth_subject)
+
+    def create_job_family(family_name: str) -> JobFamily:
+        with mapper.transaction():
+            mapper.create(family := JobFamily(id=new_uuid(), name=family_name))
+            for i in range(records):
+                mapper.create(job := _new_job(family.id, family_name, f'0.0.{i}'))
+                for endpoint in range(10):
+                    mapper.create(AuthResourcePermission(
+                        id=None, auth_subject_id=auth_subject.id, scope=AuthScope.CALL_JOB.value,
+                        job_family_id=None, job_id=job.id, endpoint=f'/api/v1/perform/{endpoint}',
+                    ))
+        return family
+
+    def delete_row_by_row(record: TableModel):
+        # former way of cascade deletion: finding and deleting each dependant record recursively
+        for dep_table, dep_column in mapper._delete_cascade_dependants[type(record)]:
+            for dep_record in mapper.find_many(dep_table, **{dep_column: get_primary_key_value(record)}):
+                delete_row_by_row(dep_record)
+        mapper.delete_record(record, cascade=False)
+
+    family = create_job_family('row-by-row')
+    operations = 1 + records * 11
+    duration = _measure(lambda: delete_row_by_row(family))
+    _report('row by row', operations, duration, 'records')
+
+    family = create_job_family('set-based')
+    duration = _measure(lambda: mapper.delete_record(family))
+    _report('set-based', operations, duration, 'records')
+
+
+@benchmark
+def benchmark_bulk_writes(records: int):
+    """Compare single-row create, update and upsert loops against the bulk operations"""
+    mapper = RecordMapper(SQLiteEngine(copy=False, log_queries=False))
+    mapper.create(family := JobFamily(id=new_uuid(), name='bulk'))
+    single_jobs = [_new_job(family.id, 'bulk', f'1.0.{i}') for i in range(records)]
+    bulk_jobs = [_new_job(family.id, 'bulk', f'2.0.{i}') for i in range(records)]
+
+    def create_one_by_one():
+        with mapper.transaction():
+            for job in single_jobs:
+                mapper.create(job)
+
+    _report('create loop', records, _measure(create_one_by_one), 'records')
+    _report('create_many', records, _measure(lambda: mapper.create_many(bulk_jobs)), 'records')
+
+    for job in single_jobs + bulk_jobs:
+        job.status = JobStatus.LOST.value
+
+    def update_one_by_one():
+        with mapper.transaction():
+            for job in single_jobs:
+                mapper.update(job)
+
+    _report('update loop', records, _measure(update_one_by_one), 'records')
+    _report('update_many', records, _measure(lambda: mapper.update_many(bulk_jobs)), 'records')
+
+    for job in single_jobs + bulk_jobs:
+        job.status = JobStatus.RUNNING.value
+
+    def upsert_one_by_one():
+        with mapper.transaction():
+            for job in single_jobs:
+                mapper.create_or_update(job)
+
+    _report('upsert loop', records, _measure(upsert_one_by_one), 'records')
+    _report('upsert_many', records, _measure(lambda: mapper.upsert_many(bulk_jobs)), 'records')
+
+
+@benchmark
+def benchmark_audit_log_paging(records: int):
+    """Compare reading the audit log page by page with offset against keyset pagination, and loading it whole against streaming"""
+    mapper = RecordMapper(SQLiteEngine(copy=False, log_queries=False))
+    mapper.create_many([AuditLogEvent(
+        id=new_uuid(), version=1, timestamp=now(), event_type='job_deployed', properties='{"details": "' + 'x' * 500 + '"}',
+        username_executor='admin', username_subject=None, job_name='adder', job_version=f'0.0.{i}',
+    ) for i in range(records)])
+    page_size = 100
+
+    def read_with_offset():
+        for offset in range(0, records, page_size):
+            mapper.filter_dicts(AuditLogEvent, order_by=['id'], offset=offset, limit=page_size)
+
+    def read_with_cursor():
+        cursor = None
+        while True:
+            _, cursor = mapper.filter_dicts_page(AuditLogEvent, limit=page_size, cursor=cursor)
+            if cursor is None:
+                break
+
+    _report('offset pages', records, _measure(read_with_offset), 'rows')
+    _report('keyset pages', records, _measure(read_with_cursor), 'rows')
+
+    listings = {
+        'list all': lambda: sum(1 for _ in mapper.list_all(AuditLogEvent, read_only=True)),
+        'stream': lambda: sum(1 for _ in mapper.stream(AuditLogEvent, read_only=True)),
+    }
+    for name, count_records in listings.items():
+        tracemalloc.start()
+        duration = _measure(count_records)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        _report(name, records, duration, 'rows')
+        print(f'{name}: peak memory {peak_memory / 1024 / 1024:.2f} MiB')
+
+
+@benchmark
+def benchmark_concurrent_reads(records: int):
+    """Compare throughput of 8 reading threads and a writing thread, with a single connection against WAL mode"""
+    engines = {
+        'single connection': SQLiteEngine(copy=False, log_queries=False),
+        'wal mode': SQLiteEngine(copy=False, log_queries=False, wal_mode=True, reader_pool_size=8),
+    }
+    for name, engine in engines.items():
+        mapper = RecordMapper(engine)
+        mapper.create(family := JobFamily(id=new_uuid(), name=name))
+        writing = threading.Event()
+        writing.set()
+
+        def write_jobs():
+            i = 0
+            while writing.is_set():
+                with mapper.transaction():
+                    for _ in range(10):
+                        mapper.create(_new_job(family.id, name, f'0.0.{i}'))
+                        i += 1
+                    time.sleep(0.002)  # transaction doing some other work before commit
+
+        def read_jobs():
+            for _ in range(records // 8):
+                mapper.find_one(JobFamily, id=family.id)
+
+        writer = threading.Thread(target=write_jobs)
+        writer.start()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            duration = _measure(lambda: list(executor.map(lambda _: read_jobs(), range(8))))
+        writing.clear()
+        writer.join()
+        written = mapper.count(Job, family_id=family.id)
+        engine.close()
+        _report(f'{name} readers', records // 8 * 8, duration, 'reads')
+        _report(f'{name} writer', written, duration, 'writes')
+
+
+@benchmark
+def benchmark_job_registry(records: int):
+    """Compare listing the job registry loaded from the database every time against the in-memory registry cache"""
+    from lifecycle.config import Config
+    from lifecycle.database.schema.dto_converter import job_record_to_dto
+    from lifecycle.job import models_registry
+    from lifecycle.job.registry import list_job_registry
+    from lifecycle.server.cache import LifecycleCache
+
+    config = Config()
+    LifecycleCache._db_engine = SQLiteEngine(copy=False, log_queries=False)
+    LifecycleCache._record_mapper = mapper = RecordMapper(LifecycleCache._db_engine)
+    mapper.create(family := JobFamily(id=new_uuid(), name='registry'))
+    jobs = [_new_job(family.id, 'registry', f'0.0.{i}') for i in range(records)]
+    for job in jobs:
+        job.manifest = 'name: registry\nowner_email: test@example.com\njobtype: python3:latest\ngit:\n  remote: github.com\n'
+    mapper.create_many(jobs)
+    list_job_registry(config)
+    while not mapper.change_notifier.is_synchronized():
+        time.sleep(0.1)
+    list_job_registry(config)  # warm up the cache
+    listings = 20
+
+    def list_from_database():
+        for _ in range(listings):
+            [job_record_to_dto(job, config) for job in models_registry.list_job_models()]
+
+    def list_from_cache():
+        for _ in range(listings):
+            list_job_registry(config)
+
+    _report('database', listings * records, _measure(list_from_database), 'jobs')
+    _report('registry cache', listings * records, _measure(list_from_cache), 'jobs')
+
+
+@benchmark
+def benchmark_manifest_parsing(records: int):
+    """Compare converting job records to DTOs with parsing every manifest against memoized manifests"""
+    from lifecycle.config import Config
+    from lifecycle.database.schema.dto_converter import job_record_to_dto, parse_cached_manifest
+
+    config = Config()
+    jobs = [_new_job(new_uuid(), 'manifest', f'0.0.{i}') for i in range(records)]
+    for i, job in enumerate(jobs):
+        # manifests of different versions differ only slightly
+        job.manifest = f'name: manifest\nowner_email: test@example.com\njobtype: python3:latest\n' \
+                       f'git:\n  remote: github.com\nlabels:\n  version: "{i % 100}"\n'
+
+    def convert_without_cache():
+        for job in jobs:
+            parse_cached_manifest.cache_clear()
+            job_record_to_dto(job, config)
+
+    def convert_with_cache():
+        for job in jobs:
+            job_record_to_dto(job, config)
+
+    _report('parsing every manifest', records, _measure(convert_without_cache), 'jobs')
+    _report('memoized manifests', records, _measure(convert_with_cache), 'jobs')
+
+
+@benchmark
+def benchmark_version_resolution(records: int):
+    """Compare resolving "latest" and wildcard versions of a job family by filtering its jobs against the version index"""
+    from lifecycle.job.models_registry import read_latest_job_model, read_latest_wildcard_job_model
+    from lifecycle.server.cache import LifecycleCache
+    from racetrack_client.utils.semver import SemanticVersion, SemanticVersionPattern
+
+    LifecycleCache._db_engine = SQLiteEngine(copy=False, log_queries=False)
+    LifecycleCache._record_mapper = mapper = RecordMapper(LifecycleCache._db_engine)
+    mapper.create(family := JobFamily(id=new_uuid(), name='resolved'))
+    mapper.create_many([_new_job(family.id, 'resolved', f'{i // 100}.{i % 100}.0') for i in range(records)])
+    read_latest_job_model('resolved')
+    while not mapper.change_notifier.is_synchronized():
+        time.sleep(0.1)
+    read_latest_job_model('resolved')  # warm up the index
+    lookups = 200
+    pattern = SemanticVersionPattern.from_x_pattern('1.x')
+
+    def resolve_by_filtering():
+        for _ in range(lookups):
+            jobs = mapper.find_many(Job, name='resolved')
+            SemanticVersion.find_latest_stable(jobs, key=lambda j: j.version)
+            SemanticVersion.find_latest_wildcard(pattern, jobs, key=lambda j: j.version)
+
+    def resolve_with_index():
+        for _ in range(lookups):
+            read_latest_job_model('resolved')
+            read_latest_wildcard_job_model('resolved', '1.x')
+
+    _report('filtering', lookups * 2, _measure(resolve_by_filtering), 'lookups')
+    _report('version index', lookups * 2, _measure(resolve_with_index), 'lookups')
+
+
+@benchmark
+def benchmark_authenticated_requests(records: int):
+    """Compare requests per second of authenticated "GET /job" resolving the token from the database against the token cache"""
+    os.environ.setdefault('AUTH_KEY', 'benchmark')
+    os.environ.setdefault('DJANGO_DB_TYPE', 'sqlite')
+    import httpx
+    from fastapi import Request
+    from lifecycle.auth.authenticate import authenticate_token
+    from lifecycle.auth.subject import create_auth_token, get_auth_subject_by_esc
+    from lifecycle.database.schema.tables import Esc
+    from lifecycle.server.api import create_fastapi_app
+    from lifecycle.server.cache import LifecycleCache
+    from racetrack_client.log.logs import configure_logs
+    from racetrack_client.utils.auth import RT_AUTH_HEADER
+    from racetrack_commons.plugin.engine import PluginEngine
+
+    LifecycleCache._db_engine = SQLiteEngine(copy=False, log_queries=False)
+    LifecycleCache._record_mapper = mapper = RecordMapper(LifecycleCache._db_engine)
+    mapper.create(family := JobFamily(id=new_uuid(), name='authenticated'))
+    mapper.create(esc := Esc(id=new_uuid(), name='benchmark'))
+    auth_subject = get_auth_subject_by_esc(esc)
+    mapper.create(AuthResourcePermission(
+        id=None, auth_subject_id=auth_subject.id, scope=AuthScope.READ_JOB.value,
+        job_family_id=family.id, job_id=None, endpoint=None,
+    ))
+    auth_token = create_auth_token(auth_subject)
+    app = create_fastapi_app(LifecycleCache.config, PluginEngine(), 'lifecycle')
+    configure_logs(log_level='error')  # no access logs
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+    headers = {RT_AUTH_HEADER: auth_token.token}
+
+    async def send_async_requests(count: int):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://lifecycle') as client:
+            for _ in range(count):
+                response = await client.get('/lifecycle/api/v1/job', headers=headers)
+                assert response.status_code == 200, response.text
+
+    asyncio.run(send_async_requests(1))
+    while not mapper.change_notifier.is_synchronized():
+        time.sleep(0.1)
+
+    def send_requests():
+        asyncio.run(send_async_requests(records))
+
+    request = Request({'type': 'http', 'headers': [(RT_AUTH_HEADER.lower().encode(), auth_token.token.encode())]})
+
+    def authenticate():
+        for _ in range(records):
+            authenticate_token(request)
+
+    for name, ttl in [('token from database', 0), ('token cache', 60)]:
+        LifecycleCache.config.auth_token_cache_ttl = ttl
+        _report(f'{name}, GET /job', records, _measure(send_requests), 'requests')
+        _report(f'{name}, authentication only', records, _measure(authenticate), 'requests')
+
+
+@benchmark
+def benchmark_concurrent_logins(records: int):
+    """
+    Compare logins per second of concurrent users hashing passwords in the request threads against the process pool.
+    Hashing releases the GIL, so the pool isn't meant to be faster, only to bound the hashing queue.
+    """
+    os.environ.setdefault('AUTH_KEY', 'benchmark')
+    from lifecycle.auth.authenticate_password import authenticate
+    from lifecycle.auth.hasher import make_password, password_hashing_pool
+    from lifecycle.database.schema.tables import User
+    from lifecycle.server.cache import LifecycleCache
+
+    LifecycleCache._db_engine = SQLiteEngine(copy=False, log_queries=False)
+    LifecycleCache._record_mapper = mapper = RecordMapper(LifecycleCache._db_engine)
+    LifecycleCache.config.login_rate_limit = 0
+    LifecycleCache.config.password_hashing_max_queue = records
+    password = 'benchmark_password'
+    usernames = [f'benchmark-{i}@example.com' for i in range(16)]
+    encoded_password = make_password(password)
+    for username in usernames:
+        mapper.create_from_dict(User, {
+            'username': username, 'password': encoded_password, 'is_active': True,
+            'first_name': '', 'last_name': '', 'email': '', 'is_staff': False, 'is_superuser': False,
+            'date_joined': now(), 'last_login': None,
+        })
+
+    def login(index: int):
+        assert authenticate(usernames[index % len(usernames)], password) is not None
+
+    def login_concurrently():
+        with ThreadPoolExecutor(max_workers=len(usernames)) as executor:
+            list(executor.map(login, range(records)))
+
+    for name, workers in [('hashing in request threads', 0), (f'process pool of {os.cpu_count()}', os.cpu_count())]:
+        LifecycleCache.config.password_hashing_workers = workers
+        login(0)  # warm up worker processes
+        _report(name, records, _measure(login_concurrently), 'logins')
+    password_hashing_pool.shutdown()
+
+
+def _new_job(family_id: str, name: str, version: str) -> Job:
+    return Job(
+        id=new_uuid(),
+        family_id=family_id,
+        name=name,
+        version=version,
+        status=JobStatus.RUNNING.value,
+        create_time=now(),
+        update_time=now(),
+        manifest=None,
+        internal_name=None,
+        error=None,
+        notice=None,
+        image_tag=None,
+        deployed_by=None,
+        last_call_time=None,
+        infrastructure_target=None,
+        replica_internal_names=None,
+        job_type_version='python3:1.0.0',
+        infrastructure_stats=None,
+    )
+
+
+def _measure(func: Callable[[], None]) -> float:
+    start_time = time.perf_counter()
+    func()
+    return time.perf_counter() - start_time
+
+
+def _report(name: str, operations: int, duration: float, unit: str = 'statements'):
+    print(f'{name}: {operations} {unit} in {duration*1000:.2f} ms, {operations / duration:.0f} {unit}/s')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('benchmark', choices=sorted(benchmarks.keys()))
+    parser.add_argument('--records', type=int, default=1000, help='number of records to operate on')
+    args = parser.parse_args()
+    try:
+        benchmarks[args.benchmark](args.records)
+    finally:
+        shutil.rmtree(TMP_DB_PATH.parent)
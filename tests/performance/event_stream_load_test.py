@@ -0,0 +1,119 @@
+"""
+Load test of Lifecycle's Event Stream, broadcasting events to many local websocket subscribers,
+some of which don't read anything. Runs against a temporary copy of the local SQLite database.
+Usage: python event_stream_load_test.py [--subscribers N] [--slow-subscribers N] [--events N] [--rate N] [--queue-size N]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import shutil
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+SRC_DB_PATH = Path(__file__).parent.parent.parent / 'lifecycle' / 'lifecycle' / 'django' / 'db.sqlite3'
+TMP_DB_PATH = Path(tempfile.mkdtemp()) / 'db.sqlite3'
+shutil.copy(SRC_DB_PATH, TMP_DB_PATH)
+os.environ['DB_PATH'] = str(TMP_DB_PATH)
+
+import websockets  # noqa: E402
+from prometheus_client import REGISTRY  # noqa: E402
+
+from lifecycle.config import Config  # noqa: E402
+from lifecycle.database.record_mapper import RecordMapper  # noqa: E402
+from lifecycle.database.sqlite.engine import SQLiteEngine  # noqa: E402
+from lifecycle.event_stream.server import EventStreamServer  # noqa: E402
+from lifecycle.server.cache import LifecycleCache  # noqa: E402
+from racetrack_commons.api.asgi.asgi_server import serve_asgi_in_background  # noqa: E402
+from racetrack_commons.socket import free_tcp_port  # noqa: E402
+
+
+async def run_load_test(
+    streamer: EventStreamServer, port: int, subscribers: int, slow_subscribers: int, events: int, rate: float, payload: int,
+):
+    url = f'ws://127.0.0.1:{port}/lifecycle/websocket/events'
+    latencies: list[float] = []
+    received_all = asyncio.Event()
+    pending_subscribers = subscribers
+
+    async def subscribe():
+        nonlocal pending_subscribers
+        async with websockets.connect(url, max_size=None) as ws:
+            received = 0
+            async for message in ws:
+                latencies.append(time.perf_counter() - json.loads(message)['sent'])
+                received += 1
+                if received == events:
+                    pending_subscribers -= 1
+                    if pending_subscribers == 0:
+                        received_all.set()
+                    await ws.wait_closed()
+
+    async def subscribe_slowly():
+        # client stops reading from the socket once its tiny queue and receive buffer are full.
+        # It's disconnected after the socket buffers of the server are filled up as well, which takes a few MB on loopback.
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1024)
+        sock.connect(('127.0.0.1', port))
+        async with websockets.connect(url, sock=sock, max_queue=1, max_size=None) as ws:
+            await ws.wait_closed()
+
+    tasks = [asyncio.create_task(subscribe()) for _ in range(subscribers)]
+    tasks += [asyncio.create_task(subscribe_slowly()) for _ in range(slow_subscribers)]
+    while len(streamer.clients) < subscribers + slow_subscribers:
+        await asyncio.sleep(0.1)
+    print(f'{len(streamer.clients)} subscribers connected')
+
+    def publish_events():
+        for seq in range(events):
+            streamer.notify_clients({'event': 'load_test', 'sent': time.perf_counter(), 'seq': seq, 'payload': 'x' * payload})
+            time.sleep(1 / rate)
+
+    start_time = time.perf_counter()
+    threading.Thread(target=publish_events, daemon=True).start()
+    await asyncio.wait_for(received_all.wait(), timeout=events / rate + 60)
+    duration = time.perf_counter() - start_time
+
+    deliveries = subscribers * events
+    print(f'delivered {deliveries} events at {rate:.0f} events/s to {subscribers} subscribers in {duration*1000:.2f} ms, '
+          f'{deliveries / duration:.0f} deliveries/s')
+    print(f'latency: median {statistics.median(latencies)*1000:.2f} ms, '
+          f'p99 {statistics.quantiles(latencies, n=100)[98]*1000:.2f} ms, max {max(latencies)*1000:.2f} ms')
+    print(f'slow subscribers disconnected: {_metric_value("lifecycle_event_stream_slow_clients_disconnected_total"):.0f}, '
+          f'dropped events: {_metric_value("lifecycle_event_stream_dropped_events_total"):.0f}')
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _metric_value(name: str) -> float:
+    return REGISTRY.get_sample_value(name) or 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--subscribers', type=int, default=1000, help='number of clients reading the events')
+    parser.add_argument('--slow-subscribers', type=int, default=10, help='number of clients not reading anything')
+    parser.add_argument('--events', type=int, default=100, help='number of events to broadcast')
+    parser.add_argument('--rate', type=float, default=10, help='number of events broadcast per second')
+    parser.add_argument('--payload', type=int, default=1000, help='size of the event payload in bytes')
+    parser.add_argument('--queue-size', type=int, default=100, help='maximum number of events queued per subscriber')
+    args = parser.parse_args()
+    LifecycleCache._db_engine = SQLiteEngine(copy=False, log_queries=False)
+    LifecycleCache._record_mapper = RecordMapper(LifecycleCache._db_engine)
+    try:
+        port = free_tcp_port()
+        streamer = EventStreamServer(Config(event_stream_client_queue_size=args.queue_size))
+        with serve_asgi_in_background(streamer.asgi_app, port, http_addr='127.0.0.1'):
+            logging.getLogger('uvicorn.error').setLevel(logging.WARNING)
+            logging.getLogger('racetrack').setLevel(logging.WARNING)
+            time.sleep(1)
+            asyncio.run(run_load_test(streamer, port, args.subscribers, args.slow_subscribers,
+                                      args.events, args.rate, args.payload))
+    finally:
+        shutil.rmtree(TMP_DB_PATH.parent)